@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_utils import check_baseline
+
+BIN_DIR = Path(__file__).resolve().parent.parent / "bin"
+
+SCRIPTS = [
+    "fastq_size_manifest.py",
+    "parse_qc_metrics.py",
+    "prepare_dragen_demux.py",
+    "query_database.py",
+    "qc_gate.py",
+    "qc_warehouse.py",
+    "read_spreadsheet.py",
+    "cgs-tools",
+]
+
+RUN_PARAMETERS = """<?xml version="1.0"?>
+<RunParameters>
+  <RunId>20240105_A00123_0001_AHXXXXXXXX</RunId>
+  <Read1NumberOfCycles>151</Read1NumberOfCycles>
+  <Read2NumberOfCycles>151</Read2NumberOfCycles>
+  <IndexRead1NumberOfCycles>19</IndexRead1NumberOfCycles>
+  <IndexRead2NumberOfCycles>10</IndexRead2NumberOfCycles>
+  <RfidsInfo><FlowCellSerialBarcode>HXXXXXXXX</FlowCellSerialBarcode></RfidsInfo>
+</RunParameters>
+"""
+
+SAMPLESHEET = """Lane,Content_Desc,Index
+1,G01-1001,ACGTACGTAC-TTGGCCAATT
+1,G01-1002,TGCATGCATG-AACCGGTTAA
+2,G01-1003,GATCGATCGA-CCAATTGGCC
+2,G01-1004,CTAGCTAGCT-GGTTAACCGG
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of the scripts in bin/.")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=10, help="Runs per command; the median is reported. Default: 10."
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("-b", "--baseline", type=Path, help="Compare results against this JSON baseline.")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown relative to the baseline. Default: 0.25 (25%%).",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.02,
+        help="Ignore timing regressions smaller than this many seconds. Default: 0.02.",
+    )
+
+    return parser.parse_args()
+
+
+def time_command(cmd: list[str], repeat: int, cwd: Path) -> float:
+    """
+    Run a command in fresh interpreters and return its median wall time.
+
+    Args:
+        cmd: Command to run.
+        repeat: Number of runs.
+        cwd: Working directory of the command.
+
+    Returns:
+        Median wall time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def benchmark(repeat: int) -> dict[str, float]:
+    """
+    Time '--help' of every script, an empty interpreter for reference and a 4-row demultiplexing samplesheet.
+
+    Args:
+        repeat: Runs per command.
+
+    Returns:
+        Dictionary that maps command name to its median wall time.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        rundir = workdir / "run"
+        rundir.mkdir()
+        (rundir / "RunParameters.xml").write_text(RUN_PARAMETERS)
+        (workdir / "samplesheet.csv").write_text(SAMPLESHEET)
+
+        commands = {"python": [sys.executable, "-c", "pass"]}
+        for script in SCRIPTS:
+            commands[f"{script} --help"] = [sys.executable, str(BIN_DIR / script), "--help"]
+        commands["prepare_dragen_demux.py 4 samples"] = [
+            sys.executable,
+            str(BIN_DIR / "prepare_dragen_demux.py"),
+            "--rundir",
+            str(rundir),
+            "--samplesheet",
+            str(workdir / "samplesheet.csv"),
+        ]
+
+        results = {}
+        for name, cmd in commands.items():
+            results[name] = round(time_command(cmd, repeat, workdir), 4)
+            print(f"  {name:<40} {results[name]:>8.3f}s", file=sys.stderr)
+
+    return results
+
+
+def main() -> None:
+    """
+    Benchmark the startup time of the scripts in bin/ and optionally compare it against a baseline.
+    """
+    args = parse_args()
+
+    results = benchmark(args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        check_baseline(results, baseline, args.tolerance, args.min_seconds, kind="Startup time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent / "bin"))
+
+from benchmark_utils import check_baseline, peak_rss_mb, run_one  # noqa: E402
+from generate_dragen_metrics import generate_metrics_tree  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the stages of parse_qc_metrics.py on synthetic data.")
+    parser.add_argument(
+        "-n",
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10, 1000, 100000],
+        help="Numbers of samples to benchmark. Default: 10 1000 100000.",
+    )
+    parser.add_argument(
+        "-d",
+        "--datadir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "parse_qc_metrics_benchmark",
+        help="Directory for generated metrics trees. Trees are reused between runs.",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Workers passed to parse_qc_metrics.py.")
+    parser.add_argument("--backend", choices=["thread", "process"], default="thread", help="Worker pool backend.")
+    parser.add_argument(
+        "-f",
+        "--output-formats",
+        nargs="+",
+        default=["xlsx"],
+        help="Output formats to benchmark the writers of. Default: xlsx.",
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("-b", "--baseline", type=Path, help="Compare results against this JSON baseline.")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth relative to the baseline. Default: 0.25 (25%%).",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="Ignore timing regressions smaller than this many seconds. Default: 0.05.",
+    )
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+
+    return parser.parse_args()
+
+
+def run_stage(results: dict[str, dict[str, float]], name: str, func: Callable[[], Any]) -> Any:
+    """
+    Time a benchmark stage and record the peak RSS reached by the end of it.
+
+    Args:
+        results: Dictionary to add the stage result to.
+        name: Stage name.
+        func: Stage to run.
+
+    Returns:
+        Return value of func.
+    """
+    start = time.perf_counter()
+    value = func()
+    results[name] = {"seconds": round(time.perf_counter() - start, 4), "peak_rss_mb": round(peak_rss_mb(), 1)}
+    print(f"  {name:<32} {results[name]['seconds']:>10.3f}s {results[name]['peak_rss_mb']:>10.1f} MB", file=sys.stderr)
+    return value
+
+
+def benchmark_size(args: argparse.Namespace, samples: int) -> dict[str, dict[str, float]]:
+    """
+    Benchmark every stage of parse_qc_metrics.py for one metrics tree.
+
+    Args:
+        args: Parsed command line arguments.
+        samples: Number of samples in the tree.
+
+    Returns:
+        Dictionary that maps stage name to its time and peak RSS.
+    """
+    import parse_qc_metrics as pqm
+
+    tree = args.datadir / f"{samples}_samples"
+    results: dict[str, dict[str, float]] = {}
+
+    mgi_worksheet = run_stage(
+        results, "read_worksheet", lambda: pqm.read_file_to_dataframe(str(tree / "mgi_worksheet.csv"))
+    )
+    inputdirs = [str(tree / "joint_sample_metrics"), str(tree / "single_sample_metrics")]
+    files_by_type = run_stage(results, "discovery", lambda: pqm.discover_metric_files(inputdirs))
+    qc_dfs = run_stage(results, "parsing", lambda: pqm.parse_metrics(files_by_type, args.workers, args.backend))
+
+    mapping_df = qc_dfs["mapping"]
+    if "Total bases" in mapping_df.columns:
+        mapping_df.insert(3, "Total giga bases", (mapping_df["Total bases"] / 1e9).round(2))
+
+    wide = run_stage(results, "merging", lambda: pqm.build_wide_table(mgi_worksheet, qc_dfs))
+    tables = {
+        "MGI_QC": ("MGI QC metrics", pqm.build_mgi_metrics(wide, mgi_worksheet, qc_dfs)),
+        "Genoox": ("QC Metrics - qPCR", pqm.build_genoox_metrics(wide, mgi_worksheet, qc_dfs["mapping"])),
+        "All_QC": ("QC metrics", pqm.build_all_metrics(wide, mgi_worksheet)),
+    }
+
+    with tempfile.TemporaryDirectory() as outdir:
+        for output_format in args.output_formats:
+            extension, writer = pqm.OUTPUT_WRITERS[output_format]
+            for name, (sheet_name, df) in tables.items():
+                path = os.path.join(outdir, f"benchmark_{name}{extension}")
+                run_stage(results, f"write:{output_format}:{name}", lambda: writer(df, path, sheet_name))
+
+    return results
+
+
+def stage_results(results: dict[str, dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    """Key the stage results of every size by '<size> samples, <stage>'."""
+    return {
+        f"{samples} samples, {stage}": result for samples, stages in results.items() for stage, result in stages.items()
+    }
+
+
+def main() -> None:
+    """
+    Generate synthetic metrics trees and benchmark parse_qc_metrics.py on each of them.
+    """
+    args = parse_args()
+
+    # Child mode: benchmark one size, started by run_one in a fresh interpreter
+    if args.run_one is not None:
+        json.dump(benchmark_size(args, args.run_one), sys.stdout)
+        return
+
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for samples in args.sizes:
+        tree = args.datadir / f"{samples}_samples"
+        if not (tree / "mgi_worksheet.csv").exists():
+            print(f"Generating {samples} samples in {tree}", file=sys.stderr)
+            generate_metrics_tree(tree, samples)
+
+        print(f"Benchmarking {samples} samples", file=sys.stderr)
+        options = [str(samples), "--datadir", str(args.datadir)]
+        options += ["--workers", str(args.workers), "--backend", args.backend, "--output-formats", *args.output_formats]
+        results[str(samples)] = run_one(__file__, options)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        check_baseline(stage_results(results), stage_results(baseline), args.tolerance, args.min_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent / "bin"))
+
+from benchmark_utils import check_baseline, peak_rss_mb, run_one  # noqa: E402
+from generate_franklin_orders import spc_num  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark query_database.py on a synthetic FranklinOrder table in SQLite."
+    )
+    parser.add_argument(
+        "-n", "--rows", type=int, default=1000000, help="Rows of the FranklinOrder table. Default: 1000000."
+    )
+    parser.add_argument(
+        "-v",
+        "--filter-sizes",
+        nargs="+",
+        type=int,
+        default=[0, 100, 1000, 10000],
+        help="Numbers of SpcNum filter values to benchmark; 0 exports the whole table. Default: 0 100 1000 10000.",
+    )
+    parser.add_argument(
+        "-c",
+        "--projections",
+        nargs="+",
+        default=["Sex", "all"],
+        help="Column projections to benchmark: 'all' or comma-separated columns. Default: Sex all.",
+    )
+    parser.add_argument(
+        "-d",
+        "--datadir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "query_database_benchmark",
+        help="Directory for generated databases. Databases are reused between runs.",
+    )
+    parser.add_argument("--connections", type=int, default=4, help="Connections passed to the query. Default: 4.")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Filter values per query. Default: 1000.")
+    parser.add_argument("--arraysize", type=int, default=5000, help="Rows fetched per round trip. Default: 5000.")
+    parser.add_argument("-o", "--output", type=Path, help="Write results to this JSON file.")
+    parser.add_argument("-b", "--baseline", type=Path, help="Compare results against this JSON baseline.")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth relative to the baseline. Default: 0.25 (25%%).",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="Ignore timing regressions smaller than this many seconds. Default: 0.05.",
+    )
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+
+    return parser.parse_args()
+
+
+def database_path(args: argparse.Namespace) -> Path:
+    """Return the SQLite file holding a table of args.rows orders."""
+    return args.datadir / f"franklin_orders_{args.rows}.sqlite"
+
+
+def benchmark_scenario(args: argparse.Namespace, filter_size: int, projection: str) -> dict[str, float]:
+    """
+    Time build_query and execute_and_stream_to_csv for one filter list size and column projection.
+
+    execute_and_stream_to_csv is run as its two halves, fetch_results and write_results, so the time to the first
+    row can be recorded between them.
+
+    Args:
+        args: Parsed command line arguments.
+        filter_size: Number of SpcNum filter values. 0 exports the whole table.
+        projection: 'all' or comma-separated columns.
+
+    Returns:
+        Total, query building and first row times, rows written, throughput and peak RSS.
+    """
+    import query_database as qd
+
+    rng = random.Random(filter_size)
+    filter_values = [spc_num(idx) for idx in rng.sample(range(args.rows), min(filter_size, args.rows))]
+    query_args = argparse.Namespace(
+        table="FranklinOrder",
+        columns=None if projection == "all" else projection.split(","),
+        filter_col="SpcNum",
+        filter_values=filter_values or None,
+        where=None,
+    )
+    conn_string = qd.build_connection_string(database=str(database_path(args)), backend="sqlite")
+
+    start = time.perf_counter()
+    if filter_values:
+        chunks = qd.chunk_values(filter_values, args.chunk_size)
+        queries = [qd.build_query(query_args, chunk) for chunk in chunks]
+    else:
+        queries = [qd.build_query(query_args)]
+    build_seconds = time.perf_counter() - start
+
+    first_row: list[float] = []
+
+    def record_first_row(batches: Iterable[list[Any]]) -> Iterator[list[Any]]:
+        for batch in batches:
+            if not first_row:
+                first_row.append(time.perf_counter())
+            yield batch
+
+    def timed(results: Iterable[tuple[list[str], Iterable[list[Any]]]]) -> Iterator[tuple[list[str], Any]]:
+        for columns, batches in results:
+            yield columns, record_first_row(batches)
+
+    with tempfile.TemporaryDirectory() as outdir:
+        results = qd.fetch_results(conn_string, queries, args.connections, args.arraysize)
+        rows, _ = qd.write_results(timed(results), f"{outdir}/results.csv", "csv", query_args.filter_col)
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": round(seconds, 4),
+        "build_seconds": round(build_seconds, 4),
+        "first_row_seconds": round((first_row[0] if first_row else time.perf_counter()) - start, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds) if seconds else 0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    """
+    Generate a synthetic FranklinOrder table and benchmark query_database.py against it.
+    """
+    args = parse_args()
+
+    # Child mode: benchmark one scenario, started by run_one in a fresh interpreter
+    if args.run_one is not None:
+        filter_size, projection = args.run_one.split(":", 1)
+        json.dump(benchmark_scenario(args, int(filter_size), projection), sys.stdout)
+        return
+
+    database = database_path(args)
+    if not database.exists():
+        # Generated in a child process too, as a large parent would raise the peak RSS reported by every scenario
+        print(f"Generating {args.rows} orders in {database}", file=sys.stderr)
+        generator = BENCHMARK_DIR / "generate_franklin_orders.py"
+        subprocess.run(
+            [sys.executable, str(generator), "--output", str(database), "--rows", str(args.rows)], check=True
+        )
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"  {'scenario':<32} {'seconds':>9} {'first row':>10} {'rows/s':>11} {'peak RSS':>11}", file=sys.stderr)
+    for filter_size in args.filter_sizes:
+        for projection in args.projections:
+            options = [f"{filter_size}:{projection}", "--datadir", str(args.datadir)]
+            options += ["--rows", str(args.rows), "--connections", str(args.connections)]
+            options += ["--chunk-size", str(args.chunk_size), "--arraysize", str(args.arraysize)]
+
+            name = f"{filter_size} values, {projection}"
+            result = results[name] = run_one(__file__, options)
+            print(
+                f"  {name:<32} {result['seconds']:>8.3f}s {result['first_row_seconds']:>9.3f}s "
+                f"{result['rows_per_second']:>11,} {result['peak_rss_mb']:>8.1f} MB",
+                file=sys.stderr,
+            )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        check_baseline(
+            results,
+            json.loads(args.baseline.read_text()),
+            args.tolerance,
+            args.min_seconds,
+            timing_keys=("seconds", "first_row_seconds"),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import json
+import resource
+import subprocess
+import sys
+from typing import Any, Union
+
+# A benchmark result is either a wall time in seconds or a dictionary of timings and the peak RSS in MB
+Result = Union[float, dict[str, float]]
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(script: str, args: list[str]) -> Any:
+    """
+    Run one benchmark of a script in a fresh interpreter, so the peak RSS it reports belongs to that run alone.
+
+    The script is called with '--run-one' and must write its result to stdout as JSON.
+
+    Args:
+        script: Benchmark script.
+        args: Value of '--run-one' followed by any other arguments of the script.
+
+    Returns:
+        Result written by the script.
+    """
+    child = subprocess.run([sys.executable, script, "--run-one", *args], check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(child.stdout)
+
+
+def compare_to_baseline(
+    results: dict[str, Result],
+    baseline: dict[str, Result],
+    tolerance: float,
+    min_seconds: float,
+    timing_keys: tuple[str, ...] = ("seconds",),
+) -> list[str]:
+    """
+    Find results that got slower or used more memory than the baseline allows.
+
+    Args:
+        results: Benchmark results keyed by name.
+        baseline: Baseline results in the same layout.
+        tolerance: Allowed relative growth.
+        min_seconds: Timing differences below this are ignored as noise.
+        timing_keys: Keys of the timings to compare in dictionary results.
+
+    Returns:
+        Human-readable description of every regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if not isinstance(result, dict):
+            result, base = {"seconds": result}, {"seconds": base}
+
+        for key in timing_keys:
+            seconds, base_seconds = result[key], base[key]
+            if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds > min_seconds:
+                label = name if key == "seconds" else f"{name}, {key}"
+                regressions.append(f"{label}: {seconds:.3f}s vs baseline {base_seconds:.3f}s")
+
+        if "peak_rss_mb" in result:
+            rss, base_rss = result["peak_rss_mb"], base["peak_rss_mb"]
+            if rss > base_rss * (1 + tolerance):
+                regressions.append(f"{name}: {rss:.1f} MB vs baseline {base_rss:.1f} MB")
+
+    return regressions
+
+
+def check_baseline(
+    results: dict[str, Result],
+    baseline: dict[str, Result],
+    tolerance: float,
+    min_seconds: float,
+    timing_keys: tuple[str, ...] = ("seconds",),
+    kind: str = "Performance",
+) -> None:
+    """
+    Compare results against a baseline and exit with status 1 if any of them regressed.
+
+    Args:
+        results: Benchmark results keyed by name.
+        baseline: Baseline results in the same layout.
+        tolerance: Allowed relative growth.
+        min_seconds: Timing differences below this are ignored as noise.
+        timing_keys: Keys of the timings to compare in dictionary results.
+        kind: What is measured, for the report, e.g. 'Startup time'.
+    """
+    regressions = compare_to_baseline(results, baseline, tolerance, min_seconds, timing_keys)
+    if regressions:
+        print(f"{kind} regressions against baseline:\n  " + "\n  ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+    print(f"No {kind.lower()} regressions against baseline.", file=sys.stderr)
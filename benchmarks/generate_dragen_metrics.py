@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import random
+from pathlib import Path
+
+# Lines in the order DRAGEN writes them: (metric name, has percentage column)
+MAPPING_SUMMARY_METRICS = [
+    ("Total input reads", False),
+    ("Number of duplicate marked reads", True),
+    ("Number of duplicate marked and mate reads removed", False),
+    ("Number of unique reads (excl. duplicate marked reads)", True),
+    ("Reads with mate sequenced", True),
+    ("Reads without mate sequenced", True),
+    ("QC-failed reads", True),
+    ("Mapped reads", True),
+    ("Mapped reads adjusted for filtered mapping", True),
+    ("Mapped reads R1", True),
+    ("Mapped reads R2", True),
+    ("Number of unique & mapped reads (excl. duplicate marked reads)", True),
+    ("Unmapped reads", True),
+    ("Unmapped reads adjusted for filtered mapping", True),
+    ("Singleton reads (itself mapped; mate unmapped)", True),
+    ("Paired reads (itself & mate mapped)", True),
+    ("Properly paired reads", True),
+    ("Not properly paired reads (discordant)", True),
+    ("Paired reads mapped to different chromosomes", True),
+    ("Paired reads mapped to different chromosomes (MAPQ>=10)", True),
+    ("Reads with MAPQ [40:inf)", True),
+    ("Reads with MAPQ [30:40)", True),
+    ("Reads with MAPQ [20:30)", True),
+    ("Reads with MAPQ [10:20)", True),
+    ("Reads with MAPQ [ 0:10)", True),
+    ("Reads with MAPQ NA (Unmapped reads)", True),
+    ("Reads with indel R1", True),
+    ("Reads with indel R2", True),
+    ("Total bases", False),
+    ("Total bases R1", False),
+    ("Total bases R2", False),
+    ("Mapped bases", False),
+    ("Mapped bases R1", False),
+    ("Mapped bases R2", False),
+    ("Soft-clipped bases", True),
+    ("Soft-clipped bases R1", True),
+    ("Soft-clipped bases R2", True),
+    ("Hard-clipped bases", True),
+    ("Mismatched bases R1", True),
+    ("Mismatched bases R2", True),
+    ("Mismatched bases R1 (excl. indels)", True),
+    ("Mismatched bases R2 (excl. indels)", True),
+    ("Q30 bases", True),
+    ("Q30 bases R1", True),
+    ("Q30 bases R2", True),
+    ("Q30 bases (excl. dups & clipped bases)", False),
+    ("Total alignments", False),
+    ("Secondary alignments", False),
+    ("Supplementary (chimeric) alignments", False),
+    ("Estimated read length", False),
+    ("Bases in reference genome", False),
+    ("Average sequenced coverage over genome", False),
+    ("Insert length: mean", False),
+    ("Insert length: median", False),
+    ("Insert length: standard deviation", False),
+    ("Provided sex chromosome ploidy", False),
+    ("Estimated sample contamination", False),
+    ("DRAGEN mapping rate [mil. reads/second]", False),
+]
+
+COVERAGE_THRESHOLDS = [100, 50, 20, 15, 10, 3, 1, 0]
+
+VC_METRICS = [
+    "Total",
+    "Biallelic",
+    "Multiallelic",
+    "SNPs",
+    "Insertions (Hom)",
+    "Insertions (Het)",
+    "Deletions (Hom)",
+    "Deletions (Het)",
+    "Indels (Het)",
+    "Chr X number of SNPs over genome",
+    "Chr Y number of SNPs over genome",
+    "(Chr X SNPs)/(chr Y SNPs) ratio over genome",
+    "SNP Transitions",
+    "SNP Transversions",
+    "Ti/Tv ratio",
+    "Heterozygous",
+    "Homozygous",
+    "Het/Hom ratio",
+    "In dbSNP",
+    "Not in dbSNP",
+    "Percent Callability",
+    "Percent Autosome Callability",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Write a synthetic tree of DRAGEN metrics files for benchmarking.")
+    parser.add_argument("-o", "--outdir", required=True, type=Path, help="Directory to write the metrics tree to.")
+    parser.add_argument("-n", "--samples", type=int, default=10, help="Number of samples. Default: 10.")
+    parser.add_argument("-l", "--lanes", type=int, default=2, help="Read groups (lanes) per sample. Default: 2.")
+    parser.add_argument(
+        "-j",
+        "--joint-fraction",
+        type=float,
+        default=0.5,
+        help="Fraction of samples that also get joint-called vc metrics. Default: 0.5.",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=1, help="Random seed. Default: 1.")
+
+    return parser.parse_args()
+
+
+def sample_name(idx: int) -> str:
+    """Return a clinical-looking sample ID for Genoox samples and a control-like ID otherwise."""
+    return f"G{idx % 100:02d}-{100000 + idx}" if idx % 8 else f"H_CTRL-{idx}"
+
+
+def _count_line(section: str, name: str, count: int, total: int, with_pct: bool, rg: str = "") -> str:
+    """Format a DRAGEN count line with an optional percentage column."""
+    if with_pct:
+        return f"{section},{rg},{name},{count},{100 * count / max(total, 1):.2f}\n"
+    return f"{section},{rg},{name},{count}\n"
+
+
+def write_mapping_metrics(path: Path, rng: random.Random, lanes: int) -> None:
+    """Write a '*.mapping_metrics.csv' file with a summary section and one section per read group."""
+    total_reads = rng.randint(600_000_000, 1_000_000_000)
+    lines = []
+    for rg in [""] + [f"RG{lane}" for lane in range(1, lanes + 1)]:
+        section = "MAPPING/ALIGNING SUMMARY" if not rg else "MAPPING/ALIGNING PER RG"
+        reads = total_reads if not rg else total_reads // lanes
+        for name, with_pct in MAPPING_SUMMARY_METRICS:
+            if name.startswith("Insert length"):
+                lines.append(f"{section},{rg},{name},{rng.uniform(350, 450):.2f}\n")
+            elif name == "Estimated sample contamination":
+                lines.append(f"{section},{rg},{name},{rng.uniform(0, 0.02):.4f}\n")
+            elif name == "Provided sex chromosome ploidy":
+                lines.append(f"{section},{rg},{name},NA\n")
+            elif name.startswith("DRAGEN mapping rate") or name.startswith("Average sequenced"):
+                lines.append(f"{section},{rg},{name},{rng.uniform(10, 40):.2f}\n")
+            elif "bases" in name or name.startswith("Bases"):
+                lines.append(_count_line(section, name, reads * 150, reads * 150, with_pct, rg))
+            else:
+                lines.append(_count_line(section, name, rng.randint(0, reads), reads, with_pct, rg))
+    path.write_text("".join(lines))
+
+
+def write_coverage_metrics(path: Path, rng: random.Random, region: str) -> None:
+    """Write a '*coverage_metrics.csv' file for the genome or a QC coverage region."""
+    section = "COVERAGE SUMMARY"
+    aligned_reads = rng.randint(600_000_000, 1_000_000_000)
+    lines = [
+        f"{section},,Aligned bases,{aligned_reads * 150}\n",
+        f"{section},,Aligned bases in {region},{aligned_reads * 148},{rng.uniform(97, 99.9):.2f}\n",
+        f"{section},,Average alignment coverage over {region},{rng.uniform(25, 45):.2f}\n",
+        f"{section},,Uniformity of coverage (PCT > 0.2*mean) over {region},{rng.uniform(90, 99):.2f}\n",
+        f"{section},,Uniformity of coverage (PCT > 0.4*mean) over {region},{rng.uniform(85, 97):.2f}\n",
+        f"{section},,Mean/Median autosomal coverage ratio over {region},{rng.uniform(0.95, 1.1):.2f}\n",
+    ]
+    lines += [
+        f"{section},,PCT of {region} with coverage [{x:4d}x: inf),{rng.uniform(0, 100):.2f}\n"
+        for x in COVERAGE_THRESHOLDS
+    ]
+    lines += [
+        f"{section},,PCT of {region} with coverage [{lo:4d}x:{hi:4d}x),{rng.uniform(0, 30):.2f}\n"
+        for hi, lo in zip(COVERAGE_THRESHOLDS, COVERAGE_THRESHOLDS[1:])
+    ]
+    lines += [
+        f"{section},,Average chr X coverage over {region},{rng.uniform(15, 40):.2f}\n",
+        f"{section},,Average chr Y coverage over {region},{rng.uniform(0, 20):.2f}\n",
+        f"{section},,Average mitochondrial coverage over {region},{rng.uniform(1000, 5000):.2f}\n",
+        f"{section},,Average autosomal coverage over {region},{rng.uniform(25, 45):.2f}\n",
+        f"{section},,Median autosomal coverage over {region},{rng.uniform(25, 45):.2f}\n",
+        f"{section},,Aligned reads,{aligned_reads}\n",
+        f"{section},,Aligned reads in {region},{aligned_reads},{rng.uniform(97, 99.9):.2f}\n",
+    ]
+    path.write_text("".join(lines))
+
+
+def write_vc_metrics(path: Path, rng: random.Random, sample: str, caller: str) -> None:
+    """Write a '*.vc_metrics.csv' file with prefilter and postfilter sections."""
+    lines = [f"{caller} CALLER SUMMARY,,Number of samples,1\n", f"{caller} CALLER SUMMARY,,Reads Processed,1\n"]
+    for stage in ["PREFILTER", "POSTFILTER"]:
+        for name in VC_METRICS:
+            if "ratio" in name:
+                lines.append(f"{caller} CALLER {stage},{sample},{name},{rng.uniform(1, 3):.2f}\n")
+            elif name.startswith("Percent"):
+                lines.append(f"{caller} CALLER {stage},{sample},{name},{rng.uniform(95, 100):.2f}\n")
+            else:
+                lines.append(f"{caller} CALLER {stage},{sample},{name},{rng.randint(0, 5_000_000)},0.00\n")
+    path.write_text("".join(lines))
+
+
+def write_cnv_metrics(path: Path, rng: random.Random, sample: str) -> None:
+    """Write a '*.cnv_metrics.csv' file."""
+    lines = [
+        f"SEX GENOTYPER,,{sample},{rng.choice(['XX', 'XY'])},{rng.uniform(0.95, 1):.4f}\n",
+        "CNV SUMMARY,,Bases in reference genome,3209286105\n",
+        f"CNV SUMMARY,,Average alignment coverage over genome,{rng.uniform(25, 45):.2f}\n",
+        f"CNV SUMMARY,,Number of alignment records,{rng.randint(600_000_000, 1_000_000_000)}\n",
+        f"CNV SUMMARY,,Coverage uniformity,{rng.uniform(0.1, 0.4):.2f}\n",
+        f"CNV SUMMARY,,Number of target intervals,{rng.randint(2_000_000, 3_000_000)}\n",
+        f"CNV SUMMARY,,Number of amplifications,{rng.randint(0, 100)}\n",
+        f"CNV SUMMARY,,Number of deletions,{rng.randint(0, 100)}\n",
+    ]
+    path.write_text("".join(lines))
+
+
+def generate_metrics_tree(
+    outdir: Path, samples: int, lanes: int = 2, joint_fraction: float = 0.5, seed: int = 1
+) -> None:
+    """
+    Write a tree laid out like the PARSE_QC_METRICS work directory.
+
+    Every sample gets mapping, wgs, qc_region, vc, cnv and (ignored) sv metrics under 'single_sample_metrics/'.
+    A fraction of samples also get joint-called vc metrics under 'joint_sample_metrics/'. A matching
+    'mgi_worksheet.csv' is written to outdir.
+
+    Args:
+        outdir: Directory to write the tree to.
+        samples: Number of samples.
+        lanes: Read groups per sample in the mapping metrics.
+        joint_fraction: Fraction of samples with joint-called vc metrics.
+        seed: Random seed.
+    """
+    rng = random.Random(seed)
+    single_dir = outdir / "single_sample_metrics"
+    joint_dir = outdir / "joint_sample_metrics"
+    os.makedirs(single_dir, exist_ok=True)
+    os.makedirs(joint_dir, exist_ok=True)
+
+    worksheet = ["ACCESSION NUMBER,RUN ID,SAMPLE ID,Total DNA yield (ng),260/280,Library Input (ng),Notes\n"]
+    for idx in range(samples):
+        sample = sample_name(idx)
+        write_mapping_metrics(single_dir / f"{sample}.mapping_metrics.csv", rng, lanes)
+        write_coverage_metrics(single_dir / f"{sample}.wgs_coverage_metrics.csv", rng, "genome")
+        write_coverage_metrics(
+            single_dir / f"{sample}.qc-coverage-region-1_coverage_metrics.csv", rng, "QC coverage region"
+        )
+        write_vc_metrics(single_dir / f"{sample}.vc_metrics.csv", rng, sample, "VARIANT")
+        write_cnv_metrics(single_dir / f"{sample}.cnv_metrics.csv", rng, sample)
+        (single_dir / f"{sample}.sv_metrics.csv").write_text("SV SUMMARY,,Number of deletions,12\n")
+        if rng.random() < joint_fraction:
+            write_vc_metrics(joint_dir / f"{sample}.vc_metrics.csv", rng, sample, "JOINT")
+
+        worksheet.append(
+            f"ACC{idx:06d},RUN{idx // 96:04d},{sample},{rng.uniform(100, 1000):.1f},"
+            f"{rng.uniform(1.7, 2.0):.2f},{rng.uniform(50, 200):.1f},\n"
+        )
+
+    (outdir / "mgi_worksheet.csv").write_text("".join(worksheet))
+
+
+def main() -> None:
+    """
+    Write a synthetic DRAGEN metrics tree.
+    """
+    args = parse_args()
+    generate_metrics_tree(args.outdir, args.samples, args.lanes, args.joint_fraction, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+# Columns of the synthetic FranklinOrder table: (name, SQLite type)
+COLUMNS = [
+    ("OrderId", "INTEGER PRIMARY KEY"),
+    ("SpcNum", "TEXT NOT NULL"),
+    ("MRN", "TEXT"),
+    ("LastName", "TEXT"),
+    ("FirstName", "TEXT"),
+    ("DOB", "TEXT"),
+    ("Sex", "TEXT"),
+    ("OrderDate", "TEXT"),
+    ("OrderStatus", "TEXT"),
+    ("TestCode", "TEXT"),
+    ("OrderingPhysician", "TEXT"),
+    ("Facility", "TEXT"),
+]
+
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth"]
+ORDER_STATUSES = ["Ordered", "Received", "In Process", "Resulted", "Signed Out", "Cancelled"]
+TEST_CODES = ["CGS", "CGS-RA", "WGS", "WGS-TRIO", "EXOME"]
+FACILITIES = ["BJH", "SLCH", "MBMC", "OUTREACH"]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Write a synthetic FranklinOrder table to SQLite for benchmarking.")
+    parser.add_argument("-o", "--output", required=True, type=Path, help="SQLite file to write.")
+    parser.add_argument("-n", "--rows", type=int, default=1000000, help="Number of orders. Default: 1000000.")
+    parser.add_argument("-s", "--seed", type=int, default=1, help="Random seed. Default: 1.")
+
+    return parser.parse_args()
+
+
+def spc_num(idx: int) -> str:
+    """Return the specimen number of an order, shaped like 'G01-100000'."""
+    return f"G{idx % 100:02d}-{100000 + idx}"
+
+
+def generate_rows(rows: int, rng: random.Random) -> Iterator[tuple]:
+    """
+    Generate FranklinOrder rows.
+
+    Args:
+        rows: Number of rows.
+        rng: Random number generator.
+
+    Yields:
+        One row per order, in the order of COLUMNS.
+    """
+    first_order = date(2020, 1, 1)
+    for idx in range(rows):
+        dob = date(1940, 1, 1) + timedelta(days=rng.randrange(30000))
+        yield (
+            idx + 1,
+            spc_num(idx),
+            f"MRN{rng.randrange(10**8):08d}",
+            rng.choice(LAST_NAMES),
+            rng.choice(FIRST_NAMES),
+            dob.isoformat(),
+            rng.choice(["M", "F", "Male", "Female", "U"]),
+            (first_order + timedelta(days=idx * 2000 // max(rows, 1))).isoformat(),
+            rng.choice(ORDER_STATUSES),
+            rng.choice(TEST_CODES),
+            f"Dr. {rng.choice(LAST_NAMES)}",
+            rng.choice(FACILITIES),
+        )
+
+
+def generate_franklin_orders(path: Path, rows: int, seed: int = 1, batch_size: int = 100000) -> None:
+    """
+    Write a SQLite database with a FranklinOrder table, indexed on SpcNum like the production table.
+
+    The database is written to a temporary file and renamed, so an interrupted run never leaves a partial table.
+
+    Args:
+        path: SQLite file to write.
+        rows: Number of orders.
+        seed: Random seed.
+        batch_size: Rows inserted per statement batch.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path.parent, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"CREATE TABLE FranklinOrder ({', '.join(f'{name} {type_}' for name, type_ in COLUMNS)})")
+        insert = f"INSERT INTO FranklinOrder VALUES ({', '.join('?' * len(COLUMNS))})"
+        batch = []
+        for row in generate_rows(rows, rng):
+            batch.append(row)
+            if len(batch) == batch_size:
+                conn.executemany(insert, batch)
+                batch = []
+        conn.executemany(insert, batch)
+        conn.execute("CREATE INDEX FranklinOrder_SpcNum ON FranklinOrder (SpcNum)")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+def main() -> None:
+    """
+    Write a synthetic FranklinOrder table.
+    """
+    args = parse_args()
+    generate_franklin_orders(args.output, args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
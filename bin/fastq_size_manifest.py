@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ["RGID", "RGSM", "RGLB", "Lane", "Read1File", "Read2File"]
+
+# Optional FastQ list columns with the size of each file in bytes, for files this script cannot stat itself
+SIZE_COLUMNS = {"Read1File": "Read1Size", "Read2File": "Read2Size"}
+
+MANIFEST_COLUMNS = ["RGSM", "lanes", "fastq_bytes", "rank"]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check the FastQ files in FastQ lists and write the size of each sample, largest first."
+    )
+    parser.add_argument(
+        "-i",
+        "--fastq-list",
+        nargs="+",
+        required=True,
+        help="FastQ lists (csv or tsv). Files without Read1Size and Read2Size columns (in bytes) must be local.",
+    )
+    parser.add_argument("-o", "--output", default="fastq_sizes.csv", help="Output manifest. Default: fastq_sizes.csv.")
+    parser.add_argument(
+        "-m",
+        "--min-size",
+        type=float,
+        default=0,
+        help="Minimum size of each FastQ file in MB. Default: 0 (no minimum).",
+    )
+
+    return parser.parse_args()
+
+
+def read_fastq_lists(paths: List[str]) -> List[Dict[str, str]]:
+    """
+    Read the rows of FastQ lists.
+
+    Args:
+        paths: FastQ lists; files ending in .tsv are tab-separated.
+
+    Returns:
+        Rows of all FastQ lists.
+
+    Raises:
+        ValueError: If a FastQ list is missing required columns.
+    """
+    rows: List[Dict[str, str]] = []
+    for path in paths:
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f, delimiter="\t" if path.lower().endswith(".tsv") else ",")
+            missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"Missing required columns in FastQ list {path}: {', '.join(missing)}")
+            rows.extend(reader)
+
+    return rows
+
+
+def fastq_size(path: str, size: Optional[str] = None) -> Optional[int]:
+    """
+    Get the size of a FastQ file.
+
+    Args:
+        path: FastQ file.
+        size: Size in bytes from the FastQ list. The local file is checked when not given.
+
+    Returns:
+        Size in bytes, or None if no size was given and the file does not exist.
+    """
+    if size:
+        return int(size)
+
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def build_manifest(rows: List[Dict[str, str]], min_bytes: int) -> Tuple[List[Dict[str, object]], List[str]]:
+    """
+    Check the FastQ files of all rows and total them per sample.
+
+    Args:
+        rows: FastQ list rows, with the file sizes in Read1Size and Read2Size if given.
+        min_bytes: Minimum size of each FastQ file in bytes.
+
+    Returns:
+        Manifest rows sorted largest sample first, and a description of each missing or too small FastQ file.
+    """
+    sizes: Dict[str, Optional[int]] = {}
+    for row in rows:
+        for file_column, size_column in SIZE_COLUMNS.items():
+            if row[file_column] not in sizes:
+                sizes[row[file_column]] = fastq_size(row[file_column], row.get(size_column))
+
+    errors = []
+    for path, size in sizes.items():
+        if size is None:
+            errors.append(f"FastQ file '{path}' does not exist!")
+        elif size < min_bytes:
+            errors.append(
+                f"FastQ file '{os.path.basename(path)}' is {size} bytes, less than {min_bytes} bytes minimum!"
+            )
+
+    samples: Dict[str, Dict[str, object]] = {}
+    lanes: Dict[str, set] = {}
+    for row in rows:
+        sample = samples.setdefault(row["RGSM"], {"RGSM": row["RGSM"], "fastq_bytes": 0})
+        lanes.setdefault(row["RGSM"], set()).add(row["Lane"])
+        sample["fastq_bytes"] += sum(sizes[row[file_column]] or 0 for file_column in SIZE_COLUMNS)
+
+    manifest = sorted(samples.values(), key=lambda s: (-s["fastq_bytes"], s["RGSM"]))
+    for rank, sample in enumerate(manifest, start=1):
+        sample["lanes"] = len(lanes[sample["RGSM"]])
+        sample["rank"] = rank
+
+    return manifest, errors
+
+
+def main() -> None:
+    """
+    Check the FastQ files of FastQ lists and write a per-sample size manifest.
+    """
+    args = parse_args()
+
+    try:
+        rows = read_fastq_lists(args.fastq_list)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+
+    min_bytes = int(args.min_size * 1024 * 1024)
+    manifest, errors = build_manifest(rows, min_bytes)
+    if errors:
+        sys.exit(f"Error: {len(errors)} FastQ files failed the size check:\n" + "\n".join(errors))
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(manifest)
+
+    total = sum(int(sample["fastq_bytes"]) for sample in manifest)
+    logger.info("Checked %d FastQ files of %d samples (%.1f GB)", 2 * len(rows), len(manifest), total / 1e9)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first attribute access instead of now.
+
+    Heavy modules such as pandas take several hundred milliseconds to import, which every script would otherwise pay
+    even for '--help', '--version' or inputs that never need them.
+
+    Args:
+        name: Module name, e.g. 'pandas'.
+
+    Returns:
+        Module that finishes importing when one of its attributes is first used.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
@@ -1,76 +1,112 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import argparse
 import datetime as dt
-import glob
+import hashlib
+import json
+import logging
+import mmap
 import os
-from functools import reduce
-from typing import Optional
+import sqlite3
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+from lazy_import import lazy_import
+from read_spreadsheet import read_spreadsheet
 
-import pandas as pd
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Each metric maps to (column index of its value, dtype the value is stored as)
 METRIC_CONFIGS = {
     "mapping": {
         "suffix": ".mapping_metrics.csv",
         "header": "MAPPING/ALIGNING SUMMARY",
         "metrics": {
-            "Total input reads": 3,
-            "Total bases": 3,
-            "Mapped reads": 3,
-            "PCT Mapped reads": 4,
-            "Number of unique reads (excl. duplicate marked reads)": 3,
-            "PCT Number of unique reads (excl. duplicate marked reads)": 4,
-            "Number of duplicate marked reads": 3,
-            "PCT Number of duplicate marked reads": 4,
-            "Paired reads (itself & mate mapped)": 4,
-            "Not properly paired reads (discordant)": 4,
-            "PCT Mismatched bases R1": 4,
-            "PCT Mismatched bases R2": 4,
-            "Q30 bases R1": 4,
-            "PCT Q30 bases R1": 4,
-            "Q30 bases R2": 4,
-            "PCT Q30 bases R2": 4,
-            "Insert length: median": 3,
-            "Insert length: mean": 3,
-            "Estimated sample contamination": 3,
+            "Total input reads": (3, "int64"),
+            "Total bases": (3, "int64"),
+            "Mapped reads": (3, "int64"),
+            "PCT Mapped reads": (4, "float64"),
+            "Number of unique reads (excl. duplicate marked reads)": (3, "int64"),
+            "PCT Number of unique reads (excl. duplicate marked reads)": (4, "float64"),
+            "Number of duplicate marked reads": (3, "int64"),
+            "PCT Number of duplicate marked reads": (4, "float64"),
+            "Paired reads (itself & mate mapped)": (4, "float64"),
+            "Not properly paired reads (discordant)": (4, "float64"),
+            "PCT Mismatched bases R1": (4, "float64"),
+            "PCT Mismatched bases R2": (4, "float64"),
+            "Q30 bases R1": (4, "float64"),
+            "PCT Q30 bases R1": (4, "float64"),
+            "Q30 bases R2": (4, "float64"),
+            "PCT Q30 bases R2": (4, "float64"),
+            "Insert length: median": (3, "float64"),
+            "Insert length: mean": (3, "float64"),
+            "Estimated sample contamination": (3, "float64"),
         },
     },
     "wgs": {
         "suffix": ".wgs_coverage_metrics.csv",
         "header": "COVERAGE SUMMARY",
         "metrics": {
-            "Average alignment coverage over genome": 3,
-            "Average autosomal coverage over genome": 3,
-            "PCT of genome with coverage [  20x: inf)": 3,
-            "PCT of genome with coverage [  10x: inf)": 3,
-            "PCT Aligned reads in genome": 4,
-            "Uniformity of coverage (PCT > 0.2*mean) over genome": 3,
+            "Average alignment coverage over genome": (3, "float64"),
+            "Average autosomal coverage over genome": (3, "float64"),
+            "PCT of genome with coverage [  20x: inf)": (3, "float64"),
+            "PCT of genome with coverage [  10x: inf)": (3, "float64"),
+            "PCT Aligned reads in genome": (4, "float64"),
+            "Uniformity of coverage (PCT > 0.2*mean) over genome": (3, "float64"),
         },
     },
     "qc_region": {
         "suffix": ".qc-coverage-region-1_coverage_metrics.csv",
         "header": "COVERAGE SUMMARY",
         "metrics": {
-            "Average alignment coverage over QC coverage region": 3,
-            "Average autosomal coverage over QC coverage region": 3,
-            "PCT of QC coverage region with coverage [  20x: inf)": 3,
-            "PCT of QC coverage region with coverage [  10x: inf)": 3,
-            "Uniformity of coverage (PCT > 0.2*mean) over QC coverage region": 3,
+            "Average alignment coverage over QC coverage region": (3, "float64"),
+            "Average autosomal coverage over QC coverage region": (3, "float64"),
+            "PCT of QC coverage region with coverage [  20x: inf)": (3, "float64"),
+            "PCT of QC coverage region with coverage [  10x: inf)": (3, "float64"),
+            "Uniformity of coverage (PCT > 0.2*mean) over QC coverage region": (3, "float64"),
         },
     },
     "vc": {
         "suffix": ".vc_metrics.csv",
         "header": "CALLER POSTFILTER",
         "metrics": {
-            "Het/Hom ratio": 3,
-            "Ti/Tv ratio": 3,
-            "Percent Autosome Callability": 3,
+            "Het/Hom ratio": (3, "float64"),
+            "Ti/Tv ratio": (3, "float64"),
+            "Percent Autosome Callability": (3, "float64"),
         },
     },
     "cnv": {
         "suffix": ".cnv_metrics.csv",
         "header": "",
-        "metrics": {"SEX GENOTYPER": 3, "Coverage uniformity": 3},
+        "metrics": {
+            "SEX GENOTYPER": (3, "category"),
+            "Coverage uniformity": (3, "float64"),
+        },
+    },
+}
+
+
+SUFFIX_TO_TYPE = {config["suffix"]: key for key, config in METRIC_CONFIGS.items()}
+
+# SQLite type of each numeric column of the all metrics table in the QC warehouse, so that it does not depend on the
+# dtype the column happens to have in the first batch that contains it
+WAREHOUSE_COLUMN_TYPES = {
+    "Total DNA yield (ng)": "REAL",
+    "260/280": "REAL",
+    "Library Input (ng)": "REAL",
+    "Total giga bases": "REAL",
+    **{
+        metric: {"int64": "INTEGER", "category": "TEXT"}.get(dtype, "REAL")
+        for config in METRIC_CONFIGS.values()
+        for metric, (_, dtype) in config["metrics"].items()
     },
 }
 
@@ -94,80 +130,815 @@ def parseArgs() -> argparse.Namespace:
     parser.add_argument(
         "-i",
         "--inputdir",
-        help="Directory to search for QC metric files.",
+        nargs="+",
+        help="Directories to search for QC metric files, highest precedence first. A metrics file is ignored "
+        "if a file with the same name was found in an earlier directory.",
         required=True,
     )
     parser.add_argument("-o", "--outdir", help="Directory to save summary QC metric files.")
     parser.add_argument("-p", "--prefix", help="Filename prefix to append to output files.")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of workers used to parse metric files. Default: 1 (serial).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["thread", "process"],
+        default="thread",
+        help="Worker pool used when '--workers' > 1: 'thread' for I/O-bound network filesystems, "
+        "'process' for CPU-bound parsing. Default: thread.",
+    )
+    parser.add_argument(
+        "-f",
+        "--output-formats",
+        nargs="+",
+        choices=list(OUTPUT_WRITERS),
+        default=["xlsx"],
+        help="Formats to write each summary table in. Default: xlsx.",
+    )
+    parser.add_argument(
+        "--cache",
+        default=os.environ.get("PARSE_QC_METRICS_CACHE"),
+        help="SQLite file used to cache parsed metrics across reruns. Default: $PARSE_QC_METRICS_CACHE.",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Parse every metrics file, ignoring '--cache'.")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256,
+        help="Maximum size of cached metrics in MB. Least recently used entries are evicted. Default: 256.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rewrite the summary files whenever metrics files are added or changed.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30,
+        help="Seconds between scans of the input directories in '--watch' mode. Default: 30.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=10,
+        help="Seconds without changes to wait before rewriting the summary files in '--watch' mode. Default: 10.",
+    )
+    parser.add_argument(
+        "--idle-exit",
+        type=float,
+        help="Stop '--watch' mode after this many seconds without changes. Default: run until interrupted.",
+    )
+    parser.add_argument(
+        "--warehouse",
+        default=os.environ.get("PARSE_QC_METRICS_WAREHOUSE"),
+        help="SQLite QC warehouse to append the merged QC table of this batch to. Query it with qc_warehouse.py. "
+        "Default: $PARSE_QC_METRICS_WAREHOUSE.",
+    )
+    parser.add_argument(
+        "--batch-date",
+        default=dt.date.today().isoformat(),
+        help="Date the batch is stored under in '--warehouse' (YYYY-MM-DD). Default: today.",
+    )
 
     return parser.parse_args()
 
 
-def parse_metrics(files: list[str], metric_dict: dict, line_startswith: str) -> pd.DataFrame:
+def classify_metric_file(name: str) -> Optional[str]:
+    """
+    Find the METRIC_CONFIGS key for a metrics filename.
+
+    Each dot-delimited compound suffix of the name is looked up in SUFFIX_TO_TYPE, so the cost does not
+    depend on the number of configured metric types.
+
+    Args:
+        name: Filename, e.g. 'SAMPLE.qc-coverage-region-1_coverage_metrics.csv'.
+
+    Returns:
+        METRIC_CONFIGS key, or None if the file is not a configured metrics file.
+    """
+    if not name.endswith("metrics.csv"):
+        return None
+
+    idx = name.find(".")
+    while idx != -1:
+        key = SUFFIX_TO_TYPE.get(name[idx:])
+        if key is not None:
+            return key
+        idx = name.find(".", idx + 1)
+
+    return None
+
+
+def discover_metric_files(inputdirs: list[str]) -> dict[str, list[str]]:
     """
-    Parse list of files for items in dictionary.
+    Walk ranked directory trees once and group metrics files by METRIC_CONFIGS key.
+
+    Directories are given in order of precedence: a metrics file whose name was already found in an
+    earlier directory is ignored, e.g. single sample metrics shadowed by joint called metrics.
+    Files with the same name in different subdirectories of one directory are all kept, with a warning, so the
+    duplicate SAMPLE ID check of the merge reports them instead of one silently replacing the other.
+    Symlinked directories are followed, each directory is visited once, and hidden entries are skipped.
 
     Args:
-        files: List of files to search through for metrics.
-        metric_dict: Dictionary that maps a value and index of substring to find.
-        line_startswith: Only search for metric strings in lines that start with this substring.
+        inputdirs: Directories to search for QC metric files, highest precedence first.
 
     Returns:
-        DataFrame that contains specified metrics in metric_dict for all specified files.
+        Dictionary that maps a METRIC_CONFIGS key to a sorted list of files of that type.
     """
-    data_list = []
+    start = time.perf_counter()
+    files_by_type: dict[str, list[str]] = {key: [] for key in METRIC_CONFIGS}
+    seen_names: set[str] = set()
+    shadowed = 0
+    visited = set()
+
+    for inputdir in inputdirs:
+        if not os.path.isdir(inputdir):
+            logger.info("Skipping missing input directory %s", inputdir)
+            continue
 
-    search_map = {}
-    for key, idx in metric_dict.items():
-        if key.startswith("PCT "):
-            search_map.setdefault(key[4:], []).append((key, idx))
-        else:
-            search_map.setdefault(key, []).append((key, idx))
+        found: dict[str, dict[str, list[str]]] = {key: {} for key in METRIC_CONFIGS}
+        stack = [inputdir]
+        while stack:
+            directory = stack.pop()
+            try:
+                st = os.stat(directory)
+                if (st.st_dev, st.st_ino) in visited:
+                    continue
+                visited.add((st.st_dev, st.st_ino))
+
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+
+                        key = classify_metric_file(entry.name)
+                        if key is not None:
+                            found[key].setdefault(entry.name, []).append(entry.path)
+                        elif entry.is_dir():
+                            stack.append(entry.path)
+            except OSError as e:
+                logger.warning("Unable to search directory %s: %s", directory, e)
+
+        # Resolve precedence against files found in higher ranked directories
+        for key, paths_by_name in found.items():
+            names = paths_by_name.keys()
+            kept = names - seen_names
+            shadowed += len(names) - len(kept)
+            for name in sorted(kept):
+                if len(paths_by_name[name]) > 1:
+                    logger.warning(
+                        "Found %s %d times in %s: %s",
+                        name,
+                        len(paths_by_name[name]),
+                        inputdir,
+                        ", ".join(sorted(paths_by_name[name])),
+                    )
+                files_by_type[key].extend(paths_by_name[name])
+            seen_names |= names
+
+    for files in files_by_type.values():
+        files.sort()
+
+    logger.info(
+        "Found %d metric files in %.3fs (%s); %d shadowed by higher ranked directories",
+        sum(len(files) for files in files_by_type.values()),
+        time.perf_counter() - start,
+        ", ".join(f"{key}: {len(files)}" for key, files in files_by_type.items()),
+        shadowed,
+    )
 
+    return files_by_type
+
+
+def compile_metric_parser(config: dict) -> dict:
+    """
+    Build a lookup index for a single METRIC_CONFIGS entry.
+
+    Args:
+        config: METRIC_CONFIGS entry containing the section header and metrics to find.
+
+    Returns:
+        Dictionary with the section header, the metric names and dtypes in slot order, and a lookup that
+        maps every metric-name column value (with and without the 'PCT ' prefix) to (slot, column index) pairs.
+    """
+    lookup: dict[str, list[tuple[int, int]]] = {}
+    names, dtypes = [], []
+    for slot, (key, (idx, dtype)) in enumerate(config["metrics"].items()):
+        names.append(key)
+        dtypes.append(dtype)
+        search_key = key[4:] if key.startswith("PCT ") else key
+        entries = lookup.setdefault(search_key, [])
+        entries.append((slot, idx))
+        lookup[f"PCT {search_key}"] = entries
+
+    return {"header": config["header"], "lookup": lookup, "names": names, "dtypes": dtypes}
+
+
+METRIC_PARSERS = {key: compile_metric_parser(config) for key, config in METRIC_CONFIGS.items()}
+
+
+# Files larger than this are memory-mapped instead of read into a buffer
+MMAP_MIN_BYTES = 1 << 20
+
+# Number of bytes of a metrics file decoded at a time
+READ_BLOCK_BYTES = 1 << 16
+
+# Bumped when parse_metric_lines changes the values it returns, so cached results are parsed again
+PARSER_VERSION = 2
+
+
+def find_section(data: Union[bytes, mmap.mmap], header: bytes, start: int = 0) -> int:
+    """
+    Find the offset of the first line whose first CSV field is the section header.
+
+    The first field matches when it equals the header or ends with ' ' + header, e.g. 'CALLER POSTFILTER'
+    matches 'VARIANT CALLER POSTFILTER' and 'JOINT CALLER POSTFILTER'.
+
+    Args:
+        data: File contents.
+        header: Section header.
+        start: Offset of the line to start searching from.
+
+    Returns:
+        Offset of the start of the first section line, or -1 if the section is not in the file.
+    """
+    pos = data.find(header + b",", start)
+    while pos != -1:
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        prefix = data[line_start:pos]
+        if not prefix or (prefix.endswith(b" ") and b"," not in prefix):
+            return line_start
+        pos = data.find(header + b",", pos + 1)
+
+    return -1
+
+
+def parse_metric_lines(
+    data: Union[bytes, mmap.mmap], parser: dict, order: Optional[list[int]] = None
+) -> list[Optional[str]]:
+    """
+    Parse the configured section of a metrics file.
+
+    Only the section is decoded, in blocks of READ_BLOCK_BYTES, and reading skips ahead to the next occurrence of the
+    section once it ends. A metric reported more than once keeps its last value. A parser without a section header
+    searches every line.
+
+    Args:
+        data: File contents.
+        parser: Compiled parser from METRIC_PARSERS.
+        order: If given, the slot of every metric is appended to it when the metric is first found.
+
+    Returns:
+        Raw metric values in the parser's slot order, None where a metric was not found.
+    """
+    values: list[Optional[str]] = [None] * len(parser["names"])
+    header = parser["header"].encode()
+    lookup = parser["lookup"]
+
+    pos = find_section(data, header) if header else 0
+    if pos == -1:
+        return values
+
+    # Every line of a section starts with the same first field, e.g. b'VARIANT CALLER POSTFILTER,'
+    section_prefix = bytes(data[pos : data.find(b",", pos) + 1]) if header else b""
+
+    # Decode blocks of whole lines so large files are only read where the section is
+    end = len(data)
+    while pos < end:
+        block_end = end if end - pos <= READ_BLOCK_BYTES else data.rfind(b"\n", pos, pos + READ_BLOCK_BYTES) + 1
+        if block_end <= pos:
+            block_end = end
+        line_start, pos = pos, block_end
+
+        for raw_line in data[line_start:block_end].split(b"\n"):
+            # The first line outside of the section ends it, so continue from the next occurrence of the section
+            if not raw_line.startswith(section_prefix):
+                pos = find_section(data, header, line_start)
+                if pos == -1:
+                    return values
+                break
+            line_start += len(raw_line) + 1
+
+            parts = raw_line.decode(errors="replace").strip().split(",")
+            for part in parts:
+                metrics = lookup.get(part.strip())
+                if metrics is None:
+                    continue
+
+                for slot, col_idx in metrics:
+                    if col_idx < len(parts):
+                        if order is not None and values[slot] is None:
+                            order.append(slot)
+                        values[slot] = parts[col_idx].strip()
+                break
+
+    return values
+
+
+def parse_metric_file(file: str, parser: dict, order: Optional[list[int]] = None) -> Optional[list[Optional[str]]]:
+    """
+    Parse a single metrics file using a compiled metric parser.
+
+    Small files are read in one call; files of MMAP_MIN_BYTES or more are memory-mapped so that only the
+    pages up to the end of the configured section are read.
+
+    Args:
+        file: Metrics file to search through.
+        parser: Compiled parser from METRIC_PARSERS.
+        order: If given, the slot of every metric is appended to it when the metric is first found.
+
+    Returns:
+        Raw metric values in the parser's slot order (None where a metric was not found),
+        or None if the file could not be read.
+    """
+    try:
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+                return parse_metric_lines(f.read(), parser, order)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse_metric_lines(data, parser, order)
+    except (OSError, ValueError) as e:
+        logger.warning("Unable to read metrics file %s: %s", file, e)
+        return None
+
+
+def convert_metric_values(
+    values: list[Optional[str]], dtype: str
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """
+    Convert raw metric values into a preallocated array of the metric's declared dtype.
+
+    Args:
+        values: Raw metric values, None or empty where missing.
+        dtype: 'int64', 'category' or a NumPy float dtype such as 'float64' or 'float32'.
+
+    Returns:
+        Nullable integer array, categorical, or float array with NaN for missing or unparsable values.
+        Integer metrics that turn out to have fractional values are returned as float64.
+    """
+    n = len(values)
+
+    if dtype == "category":
+        categories: dict[str, int] = {}
+        codes = np.full(n, -1, dtype=np.int32)
+        for i, value in enumerate(values):
+            if value:
+                codes[i] = categories.setdefault(value, len(categories))
+        return pd.Categorical.from_codes(codes, categories=list(categories))
+
+    if dtype == "int64":
+        data = np.zeros(n, dtype=np.int64)
+        mask = np.ones(n, dtype=bool)
+        for i, value in enumerate(values):
+            if not value:
+                continue
+            try:
+                data[i] = int(value)
+            except ValueError:
+                try:
+                    number = float(value)
+                except ValueError:
+                    continue
+                if not number.is_integer():
+                    return convert_metric_values(values, "float64")
+                data[i] = int(number)
+            mask[i] = False
+        return pd.arrays.IntegerArray(data, mask)
+
+    data = np.full(n, np.nan, dtype=dtype)
+    for i, value in enumerate(values):
+        if value:
+            try:
+                data[i] = float(value)
+            except ValueError:
+                pass
+    return data
+
+
+def metric_column_order(parser: dict, files: list[str], rows: list[list[Optional[str]]]) -> list[int]:
+    """
+    Order the found metrics of one metric type by where they first appear in the files.
+
+    Files are read again in input order until every found metric has been placed, which is normally after the first
+    file since DRAGEN writes every metric of a type in the same order.
+
+    Args:
+        parser: Compiled parser from METRIC_PARSERS.
+        files: Parsed files of the metric type, in input order.
+        rows: Raw metric values of each file in the parser's slot order.
+
+    Returns:
+        Slots of the metrics found in at least one file, in order of first appearance.
+    """
+    found = {slot for row in rows for slot, value in enumerate(row) if value is not None}
+    order: list[int] = []
     for file in files:
-        data_dict = {}
-        data_dict["SAMPLE ID"] = os.path.basename(file).split(".")[0]
+        if found.issubset(order):
+            break
+        file_order: list[int] = []
+        parse_metric_file(file, parser, file_order)
+        order.extend(slot for slot in file_order if slot not in order)
+
+    # Metrics placed by neither file, e.g. when a file changed since it was parsed, follow in slot order
+    return [slot for slot in order if slot in found] + sorted(found.difference(order))
+
+
+def build_metric_frame(
+    parser: dict, sample_ids: list[str], rows: list[list[Optional[str]]], order: Optional[list[int]] = None
+) -> pd.DataFrame:
+    """
+    Build a typed DataFrame from the raw values of every parsed file of one metric type.
+
+    Only metrics found in at least one file become columns.
+
+    Args:
+        parser: Compiled parser from METRIC_PARSERS.
+        sample_ids: SAMPLE ID of each parsed file.
+        rows: Raw metric values of each parsed file in the parser's slot order.
+        order: Slots of the metric columns in output order. Defaults to the parser's slot order.
+
+    Returns:
+        DataFrame with a SAMPLE ID column and one typed column per found metric.
+    """
+    columns: dict[str, Any] = {"SAMPLE ID": np.array(sample_ids, dtype=object)}
+    for slot in range(len(parser["names"])) if order is None else order:
+        values = [row[slot] for row in rows]
+        if any(value is not None for value in values):
+            columns[parser["names"][slot]] = convert_metric_values(values, parser["dtypes"][slot])
+
+    return pd.DataFrame(columns)
+
+
+def file_digest(file: str) -> str:
+    """
+    Hash the contents of a file.
+
+    Args:
+        file: File to hash.
+
+    Returns:
+        Hex digest of the file contents.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_parse_cache(cache_path: str) -> Optional[sqlite3.Connection]:
+    """
+    Open (and create if needed) the on-disk cache of parsed metrics.
+
+    The cache is emptied when METRIC_CONFIGS or PARSER_VERSION has changed since the entries were written.
+
+    Args:
+        cache_path: Path to SQLite cache file.
+
+    Returns:
+        Open cache connection, or None if the cache could not be opened.
+    """
+    config = json.dumps([PARSER_VERSION, METRIC_CONFIGS], sort_keys=True).encode()
+    config_hash = hashlib.blake2b(config, digest_size=16).hexdigest()
+    try:
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        conn = sqlite3.connect(cache_path, timeout=60)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS parsed_metrics (
+                path TEXT PRIMARY KEY,
+                metric_type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                data TEXT NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS parsed_metrics_last_used ON parsed_metrics (last_used);
+            """)
+        row = conn.execute("SELECT value FROM cache_info WHERE key = 'config_hash'").fetchone()
+        if row is None or row[0] != config_hash:
+            conn.execute("DELETE FROM parsed_metrics")
+            conn.execute("INSERT OR REPLACE INTO cache_info VALUES ('config_hash', ?)", (config_hash,))
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Unable to open parse cache %s, parsing without it: %s", cache_path, e)
+        return None
+
+    return conn
+
 
+def lookup_cached_metrics(conn: sqlite3.Connection, key: str, file: str) -> Optional[list[Optional[str]]]:
+    """
+    Return cached metrics for a file if it has not changed since it was cached.
+
+    Entries are keyed on the resolved path. A size and mtime match is trusted; if only the mtime differs,
+    the content hash decides.
+
+    Args:
+        conn: Open cache connection.
+        key: METRIC_PARSERS key of the file.
+        file: Metrics file.
+
+    Returns:
+        Cached raw metric values, or None on a cache miss.
+    """
+    try:
+        st = os.stat(file)
+    except OSError:
+        return None
+
+    path = os.path.realpath(file)
+    row = conn.execute(
+        "SELECT size, mtime_ns, digest, data FROM parsed_metrics WHERE path = ? AND metric_type = ?",
+        (path, key),
+    ).fetchone()
+    if row is None or row[0] != st.st_size:
+        return None
+
+    size, mtime_ns, digest, data = row
+    if mtime_ns != st.st_mtime_ns:
         try:
-            with open(file, "r") as f:
-                for line in f:
-                    if line_startswith and not line.startswith(line_startswith) and line_startswith not in line:
-                        continue
-
-                    parts = line.strip().split(",")
-                    for search_key, metrics in search_map.items():
-                        if any(part.strip() == search_key or part.strip() == f"PCT {search_key}" for part in parts):
-                            for metric_name, col_idx in metrics:
-                                if col_idx < len(parts):
-                                    data_dict[metric_name] = parts[col_idx].strip()
-                            break
-        except (OSError, IOError):
-            continue
+            if file_digest(file) != digest:
+                return None
+        except OSError:
+            return None
 
-        data_list.append(data_dict)
+    conn.execute(
+        "UPDATE parsed_metrics SET mtime_ns = ?, last_used = ? WHERE path = ?",
+        (st.st_mtime_ns, time.time(), path),
+    )
 
-    return pd.DataFrame(data_list) if data_list else pd.DataFrame(columns=["SAMPLE ID"])
+    return json.loads(data)
 
 
-def save_mgi_metrics(
-    mgi_worksheet: pd.DataFrame,
-    qc_dfs: dict[str, pd.DataFrame],
-    filename_prefix: str,
-    outdir: str,
+def store_cached_metrics(
+    conn: sqlite3.Connection, key: str, file: str, values: list[Optional[str]], digest: str
 ) -> None:
     """
-    Save required QC metrics for MGI.
+    Add or replace the cached metrics for a file.
 
     Args:
+        conn: Open cache connection.
+        key: METRIC_PARSERS key of the file.
+        file: Metrics file.
+        values: Raw metric values parsed from the file.
+        digest: Hash of the file contents when it was parsed.
+    """
+    try:
+        st = os.stat(file)
+    except OSError:
+        return
+
+    conn.execute(
+        "INSERT OR REPLACE INTO parsed_metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (os.path.realpath(file), key, st.st_size, st.st_mtime_ns, digest, json.dumps(values), time.time()),
+    )
+
+
+def evict_parse_cache(conn: sqlite3.Connection, max_bytes: int) -> None:
+    """
+    Evict least recently used cache entries until the cached data fits in max_bytes.
+
+    Args:
+        conn: Open cache connection.
+        max_bytes: Maximum total size of cached paths and data.
+    """
+    conn.execute(
+        """
+        DELETE FROM parsed_metrics WHERE path IN (
+            SELECT path FROM (
+                SELECT path, SUM(LENGTH(path) + LENGTH(data)) OVER (ORDER BY last_used DESC, path) AS used
+                FROM parsed_metrics
+            ) WHERE used > ?
+        )
+        """,
+        (max_bytes,),
+    )
+
+
+def file_signature(file: str) -> Optional[tuple[int, int]]:
+    """
+    Get the size and modification time of a file, used to tell whether it changed.
+
+    Args:
+        file: File to check.
+
+    Returns:
+        Tuple of size and mtime in nanoseconds, or None if the file cannot be accessed.
+    """
+    try:
+        st = os.stat(file)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def make_pool(workers: int, backend: str) -> Executor:
+    """
+    Create a worker pool.
+
+    Args:
+        workers: Maximum number of workers.
+        backend: Either 'thread' or 'process'.
+
+    Returns:
+        Thread or process pool executor.
+    """
+    if backend == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def _parse_metric_task(task: tuple[str, str, bool]) -> tuple[Optional[list[Optional[str]]], Optional[str]]:
+    """
+    Parse a (metric type, file) pair. Defined at module level so it can be sent to a process pool.
+
+    Args:
+        task: Tuple of METRIC_PARSERS key, metrics file, and whether to hash the file contents.
+
+    Returns:
+        Tuple of the raw metric values (None if the file could not be read) and the content hash.
+    """
+    key, file, with_digest = task
+    values = parse_metric_file(file, METRIC_PARSERS[key])
+    digest = None
+    if with_digest and values is not None:
+        try:
+            digest = file_digest(file)
+        except OSError:
+            digest = None
+    return values, digest
+
+
+def parse_metrics(
+    files_by_type: dict[str, list[str]],
+    workers: int = 1,
+    backend: str = "thread",
+    cache: Optional[sqlite3.Connection] = None,
+    cache_max_bytes: int = 256 * 1024 * 1024,
+    parsed_files: Optional[dict[tuple[str, str], tuple[tuple[int, int], list[Optional[str]]]]] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Parse metric files of every type, optionally in parallel and through the on-disk cache.
+
+    Results are merged in input order, so the output is identical to the serial, uncached path.
+
+    Args:
+        files_by_type: Dictionary that maps a METRIC_PARSERS key to the files of that type.
+        workers: Number of workers. Values <= 1 parse the files serially.
+        backend: Either 'thread' or 'process'.
+        cache: Open parse cache. Only new or changed files are parsed when provided.
+        cache_max_bytes: Size limit applied to the cache after new entries are stored.
+        parsed_files: In-memory results of earlier calls, keyed on (METRIC_PARSERS key, file), holding the file's
+            (size, mtime_ns) and raw values. Unchanged files are not parsed again and new results are added.
+
+    Returns:
+        Dictionary that maps a METRIC_PARSERS key to a DataFrame of metrics for all files of that type.
+    """
+    tasks = [(key, file) for key in METRIC_PARSERS for file in files_by_type.get(key, [])]
+    results: list[Optional[list[Optional[str]]]] = [None] * len(tasks)
+
+    pending = list(range(len(tasks)))
+    signatures: dict[int, Optional[tuple[int, int]]] = {}
+    if parsed_files is not None:
+        unchanged = pending
+        pending = []
+        for i in unchanged:
+            signatures[i] = file_signature(tasks[i][1])
+            entry = parsed_files.get(tasks[i])
+            if entry is not None and signatures[i] is not None and entry[0] == signatures[i]:
+                results[i] = entry[1]
+            else:
+                pending.append(i)
+
+    if cache is not None:
+        misses = []
+        for i in pending:
+            key, file = tasks[i]
+            results[i] = lookup_cached_metrics(cache, key, file)
+            if results[i] is None:
+                misses.append(i)
+        logger.info("Parse cache: %d hits, %d misses", len(pending) - len(misses), len(misses))
+        pending = misses
+
+    pending_tasks = [(*tasks[i], cache is not None) for i in pending]
+    if workers > 1 and len(pending_tasks) > 1:
+        chunksize = max(1, len(pending_tasks) // (workers * 4)) if backend == "process" else 1
+        with make_pool(workers, backend) as pool:
+            parsed = list(pool.map(_parse_metric_task, pending_tasks, chunksize=chunksize))
+    else:
+        parsed = [_parse_metric_task(task) for task in pending_tasks]
+
+    for i, (values, digest) in zip(pending, parsed):
+        results[i] = values
+        if cache is not None and values is not None and digest is not None:
+            store_cached_metrics(cache, tasks[i][0], tasks[i][1], values, digest)
+
+    if cache is not None:
+        evict_parse_cache(cache, cache_max_bytes)
+        cache.commit()
+
+    if parsed_files is not None:
+        for i, values in enumerate(results):
+            if values is not None and signatures[i] is not None:
+                parsed_files[tasks[i]] = (signatures[i], values)
+
+    unreadable = [file for (key, file), values in zip(tasks, results) if values is None]
+    if unreadable:
+        logger.warning(
+            "Unable to read %d of %d metric files, they are left out of the summary", len(unreadable), len(tasks)
+        )
+
+    sample_ids: dict[str, list[str]] = {key: [] for key in METRIC_PARSERS}
+    files: dict[str, list[str]] = {key: [] for key in METRIC_PARSERS}
+    rows: dict[str, list[list[Optional[str]]]] = {key: [] for key in METRIC_PARSERS}
+    for (key, file), values in zip(tasks, results):
+        if values is not None:
+            sample_ids[key].append(os.path.basename(file).split(".")[0])
+            files[key].append(file)
+            rows[key].append(values)
+
+    # Columns follow the order of the metrics in the files, not the order of METRIC_CONFIGS
+    return {
+        key: (
+            build_metric_frame(parser, sample_ids[key], rows[key], metric_column_order(parser, files[key], rows[key]))
+            if rows[key]
+            else pd.DataFrame(columns=["SAMPLE ID"])
+        )
+        for key, parser in METRIC_PARSERS.items()
+    }
+
+
+def sample_id_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Find rows with a non-blank SAMPLE ID.
+
+    Args:
+        df: DataFrame with a SAMPLE ID column.
+
+    Returns:
+        Boolean Series that is True for rows with a SAMPLE ID.
+    """
+    return df["SAMPLE ID"].notna() & df["SAMPLE ID"].astype(str).str.strip().ne("")
+
+
+def build_wide_table(mgi_worksheet: pd.DataFrame, qc_dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Join the MGI worksheet and every parsed QC DataFrame into one table indexed on SAMPLE ID.
+
+    Each input is indexed on SAMPLE ID once and all of them are aligned in a single outer concat.
+    Worksheet rows without a SAMPLE ID are dropped since they cannot be joined.
+
+    Args:
+        mgi_worksheet: QC metrics sheet from the MGI worksheet input.
+        qc_dfs: Dictionary containing parsed QC DataFrames.
+
+    Returns:
+        DataFrame indexed on SAMPLE ID with the worksheet columns followed by the metrics of each type.
+
+    Raises:
+        ValueError: If a SAMPLE ID occurs more than once in the worksheet or in a metric type.
+    """
+    frames = {"MGI worksheet": mgi_worksheet[sample_id_mask(mgi_worksheet)]}
+    frames.update({f"{key} metrics": df for key, df in qc_dfs.items() if not df.empty})
+
+    indexed = []
+    for name, df in frames.items():
+        duplicated = df["SAMPLE ID"][df["SAMPLE ID"].duplicated()]
+        if not duplicated.empty:
+            raise ValueError(f"Duplicate SAMPLE ID values in {name}: {', '.join(sorted(set(duplicated.astype(str))))}")
+        indexed.append(df.set_index("SAMPLE ID"))
+
+    wide = pd.concat(indexed, axis=1, join="outer").sort_index(kind="stable")
+    wide.index.name = "SAMPLE ID"
+
+    return wide
+
+
+def build_mgi_metrics(wide: pd.DataFrame, mgi_worksheet: pd.DataFrame, qc_dfs: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Build the table of required QC metrics for MGI.
+
+    Args:
+        wide: Joined table from build_wide_table.
         mgi_worksheet: QC metrics sheet.
         qc_dfs: Dictionary containing parsed QC DataFrames.
-        filename_prefix: Prefix for output filenames.
-        outdir: Output directory to save file.
+
+    Returns:
+        DataFrame of MGI QC metrics for samples in the worksheet, mapping, wgs or qc_region metrics.
     """
-    df = mgi_worksheet.copy()
+    sample_ids = set(mgi_worksheet.loc[sample_id_mask(mgi_worksheet), "SAMPLE ID"])
     for key in ["mapping", "wgs", "qc_region"]:
-        if not qc_dfs[key].empty:
-            df = pd.merge(df, qc_dfs[key], on="SAMPLE ID", how="outer")
+        sample_ids.update(qc_dfs[key]["SAMPLE ID"])
+
+    df = wide[wide.index.isin(sample_ids)].reset_index()
 
     columns_to_rename = {
         "Total input reads": "TOTAL_READS",
@@ -202,63 +973,38 @@ def save_mgi_metrics(
         "Capture Input (ng)",
     ] + list(columns_to_rename.values())
 
-    df = df[[c for c in cols if c in df.columns]]
-    df.to_excel(
-        f"{outdir}/{filename_prefix}_MGI_QC.xlsx",
-        index=False,
-        sheet_name="MGI QC metrics",
-        engine="openpyxl",
-    )
+    return df[[c for c in cols if c in df.columns]]
 
 
-def save_all_metrics(all_qc_dataframes: list[pd.DataFrame], filename_prefix: str, outdir: str) -> None:
+def build_all_metrics(wide: pd.DataFrame, mgi_worksheet: pd.DataFrame) -> pd.DataFrame:
     """
-    Save all QC metrics.
+    Build the table of all QC metrics.
 
     Args:
-        all_qc_dataframes: List of QC metric DataFrames.
-        filename_prefix: Prefix for output filenames.
-        outdir: Output directory to save file.
-    """
-
-    def merge_dfs(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
-        """Merge two DataFrames on the SAMPLE ID column.
-
-        Args:
-            left: First DataFrame to merge.
-            right: Second DataFrame to merge.
-
-        Returns:
-            Merged DataFrame.
-        """
-        return pd.merge(left, right, on="SAMPLE ID", how="outer") if not right.empty else left
+        wide: Joined table from build_wide_table.
+        mgi_worksheet: QC metrics sheet, used to keep SAMPLE ID in its worksheet position.
 
-    all_qc_metrics = reduce(
-        merge_dfs,
-        all_qc_dataframes,
-    )
-    all_qc_metrics.to_excel(
-        f"{outdir}/{filename_prefix}_QC.xlsx",
-        index=False,
-        sheet_name="QC metrics",
-        engine="openpyxl",
-    )
+    Returns:
+        DataFrame of all QC metrics.
+    """
+    cols = list(mgi_worksheet.columns) + [c for c in wide.columns if c not in mgi_worksheet.columns]
+    return wide.reset_index()[cols]
 
 
-def save_genoox_metrics(
-    mgi_worksheet: pd.DataFrame,
-    mapping_metrics: pd.DataFrame,
-    filename_prefix: str,
-    outdir: str,
-) -> None:
+def build_genoox_metrics(
+    wide: pd.DataFrame, mgi_worksheet: pd.DataFrame, mapping_metrics: pd.DataFrame
+) -> pd.DataFrame:
     """
-    Create Excel workbook that contains the following sheets: QC Metrics - qPCR.
+    Build the 'QC Metrics - qPCR' table for Genoox samples.
 
     Args:
+        wide: Joined table from build_wide_table.
         mgi_worksheet: QC metrics sheet from the MGI worksheet input.
         mapping_metrics: Metrics pulled from '*.mapping_metrics.csv' files - ONLY SAMPLE_ID column is used.
-        filename_prefix: Prefix for output filenames.
-        outdir: Output directory to save file.
+            Used for the sample list when the worksheet has no samples.
+
+    Returns:
+        DataFrame of Genoox QC metrics. Empty if there are no Genoox samples.
     """
     required_columns = [
         "ACCESSION NUMBER",
@@ -268,51 +1014,203 @@ def save_genoox_metrics(
         "260/280",
         "Library Input (ng)",
     ]
-    cleaned_mgi_worksheet = mgi_worksheet[[c for c in required_columns if c in mgi_worksheet.columns]].copy()
+    sample_ids = mgi_worksheet.loc[sample_id_mask(mgi_worksheet), "SAMPLE ID"]
+    if sample_ids.empty:
+        sample_ids = mapping_metrics["SAMPLE ID"]
 
-    if cleaned_mgi_worksheet["SAMPLE ID"].isnull().all() or cleaned_mgi_worksheet.empty:
-        cleaned_mgi_worksheet = cleaned_mgi_worksheet.merge(mapping_metrics, on="SAMPLE ID", how="right")
-        cleaned_mgi_worksheet = cleaned_mgi_worksheet[required_columns]
+    cleaned_mgi_worksheet = wide.reindex(index=pd.Index(sample_ids, name="SAMPLE ID")).reset_index()
+    cleaned_mgi_worksheet = cleaned_mgi_worksheet.reindex(columns=required_columns)
 
     # Filter for SAMPLE ID values that are strings and start with 'G' or contain 'WCN-'
     is_genoox_sample = cleaned_mgi_worksheet["SAMPLE ID"].str.startswith("G", na=False) | cleaned_mgi_worksheet[
         "SAMPLE ID"
     ].str.contains("WCN-", na=False)
-    cleaned_mgi_worksheet = cleaned_mgi_worksheet[is_genoox_sample]
 
-    if cleaned_mgi_worksheet.empty:
-        return
+    return cleaned_mgi_worksheet[is_genoox_sample]
 
-    cleaned_mgi_worksheet.to_excel(
-        f"{outdir}/{filename_prefix}_Genoox.xlsx",
-        sheet_name="QC Metrics - qPCR",
-        index=False,
-        engine="openpyxl",
-    )
+
+def write_xlsx(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    """
+    Write a DataFrame to an Excel workbook row by row with xlsxwriter in constant-memory mode.
+
+    Args:
+        df: DataFrame to write.
+        path: Output workbook path.
+        sheet_name: Name of the worksheet.
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        sys.exit("Error: 'xlsxwriter' is required to write Excel files. Please install it.")
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "nan_inf_to_errors": True})
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+
+    worksheet.write_row(0, 0, [str(c) for c in df.columns], header_format)
+    for row_idx, row in enumerate(df.astype(object).where(df.notna(), None).itertuples(index=False), start=1):
+        worksheet.write_row(row_idx, 0, row)
+
+    workbook.close()
+
+
+def write_parquet(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    """
+    Write a DataFrame to a Parquet file.
+
+    Args:
+        df: DataFrame to write.
+        path: Output file path.
+        sheet_name: Unused, accepted for a common writer signature.
+    """
+    try:
+        df.to_parquet(path, index=False)
+    except ImportError:
+        sys.exit("Error: 'pyarrow' is required to write Parquet files. Please install it.")
+
+
+def write_arrow(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    """
+    Write a DataFrame to an Arrow IPC (Feather v2) file.
+
+    Args:
+        df: DataFrame to write.
+        path: Output file path.
+        sheet_name: Unused, accepted for a common writer signature.
+    """
+    try:
+        df.reset_index(drop=True).to_feather(path)
+    except ImportError:
+        sys.exit("Error: 'pyarrow' is required to write Arrow IPC files. Please install it.")
+
+
+def write_csv_gz(df: pd.DataFrame, path: str, sheet_name: str) -> None:
+    """
+    Write a DataFrame to a gzip-compressed CSV file.
+
+    Args:
+        df: DataFrame to write.
+        path: Output file path.
+        sheet_name: Unused, accepted for a common writer signature.
+    """
+    df.to_csv(path, index=False, compression="gzip")
+
+
+# Output format -> (file extension, writer)
+OUTPUT_WRITERS: dict[str, tuple[str, Callable[[pd.DataFrame, str, str], None]]] = {
+    "xlsx": (".xlsx", write_xlsx),
+    "parquet": (".parquet", write_parquet),
+    "arrow": (".arrow", write_arrow),
+    "csv.gz": (".csv.gz", write_csv_gz),
+}
+
+
+def _write_table_task(task: tuple[str, str, str, pd.DataFrame]) -> str:
+    """
+    Write one table in one format, atomically. Defined at module level so it can be sent to a process pool.
+
+    Args:
+        task: Tuple of output format, output path, sheet name and DataFrame.
+
+    Returns:
+        Output path.
+    """
+    output_format, path, sheet_name, df = task
+
+    # Write to a hidden file next to the output and rename it, so readers never see a partial file
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    try:
+        OUTPUT_WRITERS[output_format][1](df, tmp_path, sheet_name)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+
+def write_outputs(
+    tables: list[tuple[str, str, pd.DataFrame]],
+    outdir: str,
+    output_formats: list[str],
+    workers: int = 1,
+    backend: str = "thread",
+) -> None:
+    """
+    Write every summary table in every requested format, concurrently when more than one worker is available.
+
+    Args:
+        tables: List of (filename without extension, sheet name, DataFrame) tuples.
+        outdir: Output directory to save files.
+        output_formats: Keys of OUTPUT_WRITERS.
+        workers: Number of workers. Values <= 1 write the files one after another.
+        backend: Either 'thread' or 'process'.
+    """
+    tasks = [
+        (output_format, f"{outdir}/{filename}{OUTPUT_WRITERS[output_format][0]}", sheet_name, df)
+        for filename, sheet_name, df in tables
+        for output_format in output_formats
+    ]
+
+    if workers > 1 and len(tasks) > 1:
+        with make_pool(min(workers, len(tasks)), backend) as pool:
+            written = list(pool.map(_write_table_task, tasks))
+    else:
+        written = [_write_table_task(task) for task in tasks]
+
+    logger.info("Saved %s", ", ".join(os.path.basename(path) for path in written))
+
+
+def store_in_warehouse(warehouse: str, df: pd.DataFrame, batch_id: str, batch_date: str) -> None:
+    """
+    Append the merged QC table of a batch to the QC warehouse, replacing earlier loads of the same batch.
+
+    Args:
+        warehouse: Path to QC warehouse SQLite file.
+        df: Merged QC metrics DataFrame.
+        batch_id: Identifier of the batch.
+        batch_date: Date of the batch (YYYY-MM-DD).
+    """
+    from qc_warehouse import open_warehouse, store_batch
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(warehouse)), exist_ok=True)
+        conn = open_warehouse(warehouse, create=True)
+        try:
+            store_batch(conn, df, batch_id, batch_date, WAREHOUSE_COLUMN_TYPES)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Unable to store batch %s in QC warehouse %s: %s", batch_id, warehouse, e)
 
 
 def read_file_to_dataframe(file: Optional[str]) -> pd.DataFrame:
     """
     Read input file to DataFrame.
 
+    Only the MGI worksheet columns used for QC are read from the file.
+
     Args:
         file: Input file to read.
 
     Returns:
         DataFrame containing data from input file.
     """
+    cols = [
+        "ACCESSION NUMBER",
+        "RUN ID",
+        "SAMPLE ID",
+        "Total DNA yield (ng)",
+        "260/280",
+        "Library Input (ng)",
+    ]
+
     if not file:
         df = pd.DataFrame()
     else:
+        sheet_name = "QC Metrics" if file.endswith(".xlsx") else None
         try:
-            if file.endswith(".tsv"):
-                df = pd.read_csv(file, sep="\t")
-            elif file.endswith(".csv"):
-                df = pd.read_csv(file, sep=",")
-            elif file.endswith(".xlsx"):
-                df = pd.read_excel(file, sheet_name="QC Metrics")
-            else:
-                df = pd.DataFrame()
+            df = read_spreadsheet(file, columns=cols + ["Content_Desc"], sheet_name=sheet_name)
         except (ValueError, FileNotFoundError):
             df = pd.DataFrame()
 
@@ -322,15 +1220,6 @@ def read_file_to_dataframe(file: Optional[str]) -> pd.DataFrame:
         elif df["SAMPLE ID"].fillna("").eq("").all():
             df["SAMPLE ID"] = df["Content_Desc"]
 
-    cols = [
-        "ACCESSION NUMBER",
-        "RUN ID",
-        "SAMPLE ID",
-        "Total DNA yield (ng)",
-        "260/280",
-        "Library Input (ng)",
-    ]
-
     df = df.reindex(columns=cols)
 
     obj_cols = df.select_dtypes(include=["object"]).columns
@@ -340,17 +1229,130 @@ def read_file_to_dataframe(file: Optional[str]) -> pd.DataFrame:
     return df
 
 
+def read_mgi_worksheets(files: Optional[list[str]], workers: int = 1) -> pd.DataFrame:
+    """
+    Read and concatenate MGI worksheets, in parallel processes when more than one worker is available.
+
+    Args:
+        files: MGI worksheet files.
+        workers: Number of workers. Values <= 1 read the files one after another.
+
+    Returns:
+        DataFrame containing the rows of every worksheet.
+    """
+    if not files:
+        return read_file_to_dataframe(None)
+
+    if workers > 1 and len(files) > 1:
+        with make_pool(min(workers, len(files)), "process") as pool:
+            dfs = list(pool.map(read_file_to_dataframe, files))
+    else:
+        dfs = [read_file_to_dataframe(file) for file in files]
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+def build_summary_tables(
+    mgi_worksheet: pd.DataFrame, qc_dfs: dict[str, pd.DataFrame], filename_prefix: str
+) -> list[tuple[str, str, pd.DataFrame]]:
+    """
+    Build the summary tables from the MGI worksheet and parsed QC DataFrames.
+
+    Args:
+        mgi_worksheet: QC metrics sheet from the MGI worksheet input.
+        qc_dfs: Dictionary containing parsed QC DataFrames.
+        filename_prefix: Filename prefix of the output files.
+
+    Returns:
+        List of (filename without extension, sheet name, DataFrame) tuples. The all metrics table is last.
+    """
+    mapping_df = qc_dfs["mapping"]
+    if "Total bases" in mapping_df.columns:
+        mapping_df.insert(3, "Total giga bases", (mapping_df["Total bases"] / 1e9).round(2))
+
+    wide = build_wide_table(mgi_worksheet, qc_dfs)
+
+    ## MGI metrics
+    tables = [(f"{filename_prefix}_MGI_QC", "MGI QC metrics", build_mgi_metrics(wide, mgi_worksheet, qc_dfs))]
+
+    ## Genoox metrics
+    genoox_metrics = build_genoox_metrics(wide, mgi_worksheet, qc_dfs["mapping"])
+    if not genoox_metrics.empty:
+        tables.append((f"{filename_prefix}_Genoox", "QC Metrics - qPCR", genoox_metrics))
+
+    ## All metrics
+    tables.append((f"{filename_prefix}_All_QC", "QC metrics", build_all_metrics(wide, mgi_worksheet)))
+
+    return tables
+
+
+def watch_metrics(
+    args: argparse.Namespace,
+    mgi_worksheet: pd.DataFrame,
+    inputdirs: list[str],
+    outdir: str,
+    filename_prefix: str,
+    cache: Optional[sqlite3.Connection],
+) -> None:
+    """
+    Poll the input directories and rewrite the summary tables whenever metrics files are added or changed.
+
+    Tables are rewritten once no files have changed for '--debounce' seconds, so samples finishing close
+    together and files still being copied cause a single update. Only new or changed files are parsed.
+
+    Args:
+        args: Parsed command line arguments.
+        mgi_worksheet: QC metrics sheet from the MGI worksheet input.
+        inputdirs: Directories to search for QC metric files, highest precedence first.
+        outdir: Output directory to save files.
+        filename_prefix: Filename prefix of the output files.
+        cache: Open parse cache, or None.
+    """
+    parsed_files: dict[tuple[str, str], tuple[tuple[int, int], list[Optional[str]]]] = {}
+    snapshot: Optional[dict[str, Optional[tuple[int, int]]]] = None
+    written: Optional[dict[str, Optional[tuple[int, int]]]] = None
+    last_change = time.monotonic()
+
+    logger.info("Watching %s every %ss", ", ".join(inputdirs), args.poll_interval)
+    while True:
+        files_by_type = discover_metric_files(inputdirs)
+        current = {file: file_signature(file) for files in files_by_type.values() for file in files}
+
+        now = time.monotonic()
+        if current != snapshot:
+            snapshot = current
+            last_change = now
+
+        if current != written and now - last_change >= args.debounce:
+            qc_dfs = parse_metrics(
+                files_by_type,
+                args.workers,
+                args.backend,
+                cache=cache,
+                cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                parsed_files=parsed_files,
+            )
+            tables = build_summary_tables(mgi_worksheet, qc_dfs, filename_prefix)
+            write_outputs(tables, outdir, args.output_formats, args.workers, args.backend)
+            if args.warehouse:
+                store_in_warehouse(args.warehouse, tables[-1][2], filename_prefix, args.batch_date)
+            written = current
+
+        if args.idle_exit is not None and current == written and now - last_change >= args.idle_exit:
+            logger.info("No metrics files changed for %ss, stopping", args.idle_exit)
+            return
+
+        time.sleep(args.poll_interval)
+
+
 def main() -> None:
     """
     Parse QC metrics for all files and save to Excel workbooks.
     """
     args = parseArgs()
 
-    inputdir = os.path.abspath(args.inputdir)
-    if args.mgi_worksheet:
-        mgi_worksheet = pd.concat([read_file_to_dataframe(f) for f in args.mgi_worksheet], ignore_index=True)
-    else:
-        mgi_worksheet = read_file_to_dataframe(None)
+    inputdirs = [os.path.abspath(d) for d in args.inputdir]
+    mgi_worksheet = read_mgi_worksheets(args.mgi_worksheet, args.workers)
 
     outdir = os.path.abspath(args.outdir) if args.outdir else os.getcwd()
     os.makedirs(outdir, exist_ok=True)
@@ -361,38 +1363,32 @@ def main() -> None:
         timestamp = dt.date.today().strftime("%Y%m%d")
         filename_prefix = f"{timestamp}_CGS"
 
-    metric_files = [f.strip() for f in glob.glob(f"{inputdir}/**/*metrics.csv", recursive=True)]
-
-    files_by_type = {k: [] for k in METRIC_CONFIGS}
-
-    for f in metric_files:
-        for key, config in METRIC_CONFIGS.items():
-            if f.endswith(config["suffix"]):
-                files_by_type[key].append(f)
-                break
+    cache = open_parse_cache(args.cache) if args.cache and not args.no_cache else None
+    try:
+        if args.watch:
+            try:
+                watch_metrics(args, mgi_worksheet, inputdirs, outdir, filename_prefix, cache)
+            except KeyboardInterrupt:
+                logger.info("Stopped watching")
+            return
 
-    qc_dfs = {}
-    for key, config in METRIC_CONFIGS.items():
-        df = parse_metrics(files_by_type[key], config["metrics"], config["header"])
-        if key == "mapping" and "Total bases" in df.columns:
-            df.insert(3, "Total giga bases", round(df["Total bases"].astype(float) / 1e9, 2))
-        qc_dfs[key] = df
+        qc_dfs = parse_metrics(
+            discover_metric_files(inputdirs),
+            args.workers,
+            args.backend,
+            cache=cache,
+            cache_max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+    finally:
+        if cache is not None:
+            cache.close()
 
     # Create output files
-    ## MGI metrics
-    save_mgi_metrics(mgi_worksheet, qc_dfs, filename_prefix, outdir)
-
-    ## Genoox metrics
-    save_genoox_metrics(
-        mgi_worksheet,
-        qc_dfs["mapping"],
-        filename_prefix,
-        outdir,
-    )
+    tables = build_summary_tables(mgi_worksheet, qc_dfs, filename_prefix)
+    write_outputs(tables, outdir, args.output_formats, args.workers, args.backend)
 
-    ## All metrics
-    all_qc_dataframes = [mgi_worksheet] + [qc_dfs[k] for k in ["mapping", "wgs", "qc_region", "vc", "cnv"]]
-    save_all_metrics(all_qc_dataframes, f"{filename_prefix}_All", outdir)
+    if args.warehouse:
+        store_in_warehouse(args.warehouse, tables[-1][2], filename_prefix, args.batch_date)
 
 
 if __name__ == "__main__":
@@ -1,24 +1,70 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import argparse
 import csv
+import itertools
+import re
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+from lazy_import import lazy_import
 
-import pandas as pd
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
 
 __version__ = "1.0.0"
 
 TRANS_TABLE = str.maketrans("ATCG", "TAGC")
 
+# Columns of the [BCLConvert_Data] section
+DEMUX_COLUMNS = ["Lane", "Sample_ID", "Index", "Index2"]
+
+# csv samplesheets up to this many rows are prepared with the csv module instead of pandas
+FAST_PATH_MAX_ROWS = 1000
+
+# Lanes with more samples than this compare their indexes with NumPy instead of pure Python
+NUMPY_MIN_LANE_SAMPLES = 96
+
+# RunParameters.xml elements read by parse_run_info; all other top-level elements are dropped while parsing
+RUN_PARAMETERS_TAGS = {
+    "RunId",
+    "PlannedReads",
+    "FlowCellType",
+    "InstrumentType",
+    "InstrumentSerialNumber",
+    "Side",
+    "ConsumableInfo",
+    "Read1NumberOfCycles",
+    "Read2NumberOfCycles",
+    "IndexRead1NumberOfCycles",
+    "IndexRead2NumberOfCycles",
+    "FlowCellSerialBarcode",
+}
+
 
 def parse_args() -> argparse.Namespace:
     """Get command-line arguments."""
     parser = argparse.ArgumentParser()
-    parser.add_argument("-r", "--rundir", required=True, type=Path, help="Path to the Illumina run folder")
-    parser.add_argument("-s", "--samplesheet", required=True, type=Path, help="Path to the samplesheet")
+    parser.add_argument("-r", "--rundir", type=Path, help="Path to the Illumina run folder")
+    parser.add_argument("-s", "--samplesheet", type=Path, help="Path to the samplesheet")
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        type=Path,
+        help="CSV file with 'rundir' and 'samplesheet' columns to prepare many flowcells in one go, "
+        "instead of '--rundir' and '--samplesheet'. Relative paths are relative to the manifest.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of flowcells to prepare in parallel with '--manifest'. Default: 1.",
+    )
     parser.add_argument(
         "-c",
         "--checkindexes",
@@ -36,9 +82,39 @@ def parse_args() -> argparse.Namespace:
         default="AGATCGGAAGAGCGTCGTGTAGGGA",
         help="Adapter sequence for Read 2.",
     )
+    parser.add_argument(
+        "--max_barcode_mismatches",
+        type=int,
+        choices=[0, 1, 2],
+        default=1,
+        help="Largest BarcodeMismatchesIndex1/2 value to allow when the indexes are far enough apart.",
+    )
+    parser.add_argument(
+        "--split_lanes",
+        nargs="*",
+        metavar="LANES",
+        help="Write one samplesheet per lane so lanes can be demultiplexed in parallel. Optionally give groups of "
+        "comma-separated lanes to write one samplesheet per group instead, e.g. '1,2 3,4'.",
+    )
     parser.add_argument("-v", "--version", action="version", version="%(prog)s: " + __version__)
     args = parser.parse_args()
 
+    if args.split_lanes is not None:
+        try:
+            args.split_lanes = [[int(lane) for lane in group.split(",")] for group in args.split_lanes]
+        except ValueError:
+            parser.error("Lane groups must be comma-separated lane numbers, e.g. '1,2 3,4'.")
+
+    if args.manifest:
+        if args.rundir or args.samplesheet:
+            parser.error("Use either '--manifest' or '--rundir' and '--samplesheet'.")
+        if not args.manifest.exists():
+            parser.error(f"The file {args.manifest} does not exist.")
+        return args
+
+    if not args.rundir or not args.samplesheet:
+        parser.error("Either '--manifest' or both '--rundir' and '--samplesheet' are required.")
+
     if not args.rundir.exists():
         parser.error(f"The directory {args.rundir} does not exist.")
 
@@ -61,6 +137,33 @@ def get_text_from_xml(element: ET.Element, tag: str) -> str:
     return found.text.strip()
 
 
+def iterparse_xml(path: Path, tags: Set[str], stop_after: Optional[str] = None) -> ET.Element:
+    """
+    Incrementally parse an XML file, keeping only the top-level elements that are or contain one of tags.
+
+    Parsing stops at the end of the first stop_after element, so the rest of the file is never read.
+    """
+    root: Optional[ET.Element] = None
+    depth = 0
+    with open(path, "rb") as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+
+            depth -= 1
+            if elem.tag == stop_after:
+                break
+            if depth == 1 and not any(el.tag in tags for el in elem.iter()):
+                cast(ET.Element, root).remove(elem)
+
+    if root is None:
+        raise ValueError(f"{path} is empty.")
+    return root
+
+
 def _parse_novaseq_x_plus(root: ET.Element, run_dir: Path, run_info: Dict[str, Any]) -> None:
     """Parse NovaSeq X Plus specific parameters."""
     planned_reads = root.find(".//PlannedReads")
@@ -93,8 +196,8 @@ def _parse_novaseq_x_plus(root: ET.Element, run_dir: Path, run_info: Dict[str, A
     if not run_info_path.exists():
         raise ValueError("RunInfo.xml file not found in the specified directory")
 
-    tree = ET.parse(run_info_path)
-    ri_root = tree.getroot()
+    # The reads are listed before the (large) flowcell tile layout
+    ri_root = iterparse_xml(run_info_path, {"Read"}, stop_after="Reads")
     run_info_reads = ri_root.findall(".//Read")
 
     run_info["Index1Reverse"] = "N"
@@ -128,8 +231,7 @@ def parse_run_info(run_dir: Path) -> Dict[str, Any]:
     if not run_params_path.exists():
         raise ValueError("RunParameters.xml file not found in the specified directory")
 
-    tree = ET.parse(run_params_path)
-    root = tree.getroot()
+    root = iterparse_xml(run_params_path, RUN_PARAMETERS_TAGS)
     run_info: Dict[str, Any] = {}
     run_info["RunID"] = get_text_from_xml(root, "RunId")
 
@@ -142,19 +244,52 @@ def parse_run_info(run_dir: Path) -> Dict[str, Any]:
     return run_info
 
 
+def read_samplesheet_rows(file_path: Path) -> Optional[List[Dict[str, str]]]:
+    """Read a small csv samplesheet with the csv module, or return None if it needs pandas."""
+    if file_path.suffix != ".csv":
+        return None
+
+    # utf-8-sig drops the byte order mark Excel writes, as pandas does
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        rows = list(itertools.islice(csv.DictReader(f), FAST_PATH_MAX_ROWS + 1))
+
+    return rows if len(rows) <= FAST_PATH_MAX_ROWS else None
+
+
+def prepare_demux_rows(rows: List[Dict[str, str]], run_info: Dict[str, Any], check_indexes: bool) -> List[tuple]:
+    """Split, orient and sort the indexes of each sample and lane like process_samplesheet and prepare_demux_sheet."""
+    demux_rows = []
+    for row in rows:
+        # Cells missing from short rows are None, where pandas reads them as empty strings
+        sample_id = (row["Content_Desc"] if "Content_Desc" in row else row["Sample_ID"]) or ""
+        index, _, index2 = (row["Index"] or "").partition("-")
+
+        if check_indexes:
+            if run_info["Index1Reverse"] == "Y":
+                index = reverse_complement(index)
+            if run_info["Index2Reverse"] == "Y":
+                index2 = reverse_complement(index2)
+
+        for lane in (row["Lane"] or "").split(","):
+            demux_rows.append((int(lane), sample_id, index, index2))
+
+    return sorted(demux_rows)
+
+
 def read_samplesheet(file_path: Path) -> pd.DataFrame:
-    """Read samplesheet from either xlsx or csv file."""
+    """Read samplesheet from either xlsx or csv file, as text like read_samplesheet_rows."""
     if file_path.suffix == ".xlsx":
         try:
-            return pd.read_excel(file_path, header=0)
+            return pd.read_excel(file_path, header=0, dtype=str, keep_default_na=False)
         except ImportError:
             sys.exit("Error: 'openpyxl' is required to read Excel files. Please install it.")
-    return pd.read_csv(file_path, header=0)
+    return pd.read_csv(file_path, header=0, dtype=str, keep_default_na=False)
 
 
 def process_samplesheet(df: pd.DataFrame, run_info: Dict[str, Any], check_indexes: bool) -> pd.DataFrame:
     """Process the samplesheet DataFrame."""
-    df.rename(columns={"Content_Desc": "Sample_ID"}, inplace=True)
+    if "Content_Desc" in df:
+        df = df.drop(columns="Sample_ID", errors="ignore").rename(columns={"Content_Desc": "Sample_ID"})
 
     split_df = df["Index"].astype(str).str.split("-", n=1, expand=True)
     df["Index"] = split_df[0]
@@ -175,8 +310,7 @@ def process_samplesheet(df: pd.DataFrame, run_info: Dict[str, Any], check_indexe
 def generate_cycle_string(run_info: Dict[str, Any]) -> str:
     """Generate the OverrideCycles string for BCLConvert."""
     if run_info["Index1Cycles"] < 19:
-        print(f"Number of cycles needs to be >=19, but is {run_info['Index1Cycles']}", file=sys.stderr)
-        sys.exit(1)
+        raise ValueError(f"Number of cycles needs to be >=19, but is {run_info['Index1Cycles']}")
 
     cycle_str = f"Y{run_info['Read1Cycles']};I10U9"
     if run_info["Index1Cycles"] > 19:
@@ -195,28 +329,187 @@ def prepare_demux_sheet(df: pd.DataFrame) -> pd.DataFrame:
     df = df.assign(Lane=df["Lane"].astype(str).str.split(",")).explode("Lane")
     df["Lane"] = df["Lane"].astype(int)
 
-    output_cols = ["Lane", "Sample_ID", "Index", "Index2"]
-    df_output = df[output_cols].copy()
+    df_output = df[DEMUX_COLUMNS].copy()
 
     if not df_output.empty:
-        df_output = df_output.sort_values(by=output_cols)
+        df_output = df_output.sort_values(by=DEMUX_COLUMNS)
 
     return cast(pd.DataFrame, df_output)
 
 
-def write_demux_sheet(df: pd.DataFrame, run_info: Dict[str, Any], cycle_str: str, adapter1: str, adapter2: str) -> None:
-    """Write the BCLConvert demux samplesheet."""
-    output_filename = f"{run_info['RunID']}.demux_samplesheet.csv"
+def index_lengths(cycle_str: str) -> List[int]:
+    """Get the number of index cycles used for demultiplexing from the OverrideCycles string."""
+    return [int(m.group(1)) for m in re.finditer(r"(?:^|;)I(\d+)", cycle_str)]
+
+
+def encode_indexes(indexes: List[str], length: int) -> np.ndarray:
+    """One-hot encode index sequences, 4 bits per base and 16 bases per uint64 word."""
+    # One-hot bit of each base; any other character (e.g. N) matches nothing
+    base_bits = np.zeros(256, dtype=np.uint64)
+    for bit, base in enumerate("ACGT"):
+        base_bits[ord(base)] = 1 << bit
+
+    n_words = max(1, -(-length // 16))
+    padded = "".join(index.upper()[:length].ljust(n_words * 16, "N") for index in indexes)
+    codes = np.frombuffer(padded.encode("ascii"), dtype=np.uint8).reshape(len(indexes), n_words, 16)
+
+    shifts = (np.arange(16, dtype=np.uint64) * np.uint64(4)).reshape(1, 1, 16)
+    return np.bitwise_or.reduce(base_bits[codes] << shifts, axis=2)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count the set bits of each uint64 word."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    popcount_table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return popcount_table[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+
+def hamming_distances(indexes: List[str], length: int) -> np.ndarray:
+    """Compute the pairwise Hamming distances between index sequences over their first length bases."""
+    length = min(length, max(len(index) for index in indexes))
+    if length <= 0:
+        return np.zeros((len(indexes), len(indexes)), dtype=np.int64)
+
+    encoded = encode_indexes(indexes, length)
+    matches = popcount(encoded[:, None, :] & encoded[None, :, :]).sum(axis=-1, dtype=np.int64)
+    return length - matches
+
+
+def index_distance(index1: str, index2: str, length: int) -> int:
+    """Compute the Hamming distance between two index sequences over their first length bases."""
+    matches = sum(1 for a, b in zip(index1.upper()[:length], index2.upper()[:length]) if a == b and a in "ACGT")
+    return length - matches
+
+
+def close_index_pairs(
+    indexes: List[str], indexes2: Optional[List[str]], length1: int, length2: int, max_distance: int
+) -> List[Tuple[int, int, int, int]]:
+    """Find the (i, j, Index distance, Index2 distance) of sample pairs with both distances <= max_distance."""
+    if len(indexes) > NUMPY_MIN_LANE_SAMPLES:
+        dist1 = hamming_distances(indexes, length1)
+        dist2 = hamming_distances(indexes2, length2) if indexes2 is not None else np.zeros_like(dist1)
+        upper = np.triu(np.ones_like(dist1, dtype=bool), k=1)
+        rows, cols = np.nonzero(upper & (dist1 <= max_distance) & (dist2 <= max_distance))
+        return list(zip(rows.tolist(), cols.tolist(), dist1[rows, cols].tolist(), dist2[rows, cols].tolist()))
+
+    length1 = max(0, min(length1, max(len(index) for index in indexes)))
+    length2 = max(0, min(length2, max(len(index) for index in indexes2))) if indexes2 is not None else 0
+
+    pairs = []
+    for i, j in itertools.combinations(range(len(indexes)), 2):
+        distance1 = index_distance(indexes[i], indexes[j], length1)
+        if distance1 > max_distance:
+            continue
+        distance2 = index_distance(indexes2[i], indexes2[j], length2) if indexes2 is not None else 0
+        if distance2 <= max_distance:
+            pairs.append((i, j, distance1, distance2))
+
+    return pairs
+
+
+def check_index_collisions(
+    rows: List[tuple], cycle_str: str, max_mismatches: int = 1
+) -> Tuple[Dict[str, int], List[Tuple[int, str, str]]]:
+    """
+    Find the largest barcode mismatch settings that keep the index pairs of every lane apart.
+
+    Two samples in a lane collide for settings (m1, m2) when their Index and Index2 are both within mismatch
+    range of each other, i.e. distance(Index) <= 2 * m1 and distance(Index2) <= 2 * m2.
+    """
+    lengths = index_lengths(cycle_str) + [0, 0]
+    length1, length2 = lengths[0], lengths[1]
+    has_index2 = bool(length2) and any(str(row[3]) for row in rows)
+
+    candidates = sorted(
+        {(m1, m2 if has_index2 else 0) for m1 in range(max_mismatches + 1) for m2 in range(max_mismatches + 1)},
+        key=lambda m: (-sum(m), -min(m), -m[0]),
+    )
+    safe = set(candidates)
+    collisions: List[Tuple[int, str, str]] = []
+
+    lanes: Dict[int, List[tuple]] = {}
+    for row in rows:
+        lanes.setdefault(int(row[0]), []).append(row)
+
+    for lane, lane_rows in sorted(lanes.items()):
+        if len(lane_rows) < 2:
+            continue
+
+        indexes = [str(row[2]) for row in lane_rows]
+        indexes2 = [str(row[3]) for row in lane_rows] if has_index2 else None
+        for i, j, distance1, distance2 in close_index_pairs(indexes, indexes2, length1, length2, 2 * max_mismatches):
+            safe = {(m1, m2) for m1, m2 in safe if distance1 > 2 * m1 or distance2 > 2 * m2}
+            if distance1 == 0 and distance2 == 0:
+                collisions.append((lane, str(lane_rows[i][1]), str(lane_rows[j][1])))
+
+    best = next((m for m in candidates if m in safe), (0, 0))
+    settings = {"BarcodeMismatchesIndex1": best[0]}
+    if has_index2:
+        settings["BarcodeMismatchesIndex2"] = best[1]
+
+    return settings, collisions
+
+
+def group_lanes(rows: List[tuple], split_lanes: Optional[List[List[int]]] = None) -> List[List[int]]:
+    """Group the lanes of the samplesheet: all lanes together, one lane per group or the given lane groups."""
+    lanes = sorted({int(row[0]) for row in rows})
+    if split_lanes is None:
+        return [lanes]
+    if not split_lanes:
+        return [[lane] for lane in lanes]
+
+    grouped = [lane for group in split_lanes for lane in group]
+    repeated = sorted({lane for lane in grouped if grouped.count(lane) > 1})
+    if repeated:
+        raise ValueError(f"Lanes are in more than one lane group: {', '.join(map(str, repeated))}")
+    ungrouped = [lane for lane in lanes if lane not in grouped]
+    if ungrouped:
+        raise ValueError(f"Lanes in samplesheet are not in any lane group: {', '.join(map(str, ungrouped))}")
+
+    # Lane groups without samples have nothing to demultiplex
+    groups = [sorted(lane for lane in group if lane in lanes) for group in split_lanes]
+    return [group for group in groups if group]
+
+
+def write_demux_sheet(
+    rows: List[tuple],
+    run_info: Dict[str, Any],
+    cycle_str: str,
+    adapter1: str,
+    adapter2: str,
+    barcode_mismatches: Optional[Dict[str, int]] = None,
+    lanes: Optional[List[int]] = None,
+) -> str:
+    """Write the BCLConvert demux samplesheet, of only the given lanes if any, and return its filename."""
+    lane_suffix = f".L{'_'.join(map(str, lanes))}" if lanes else ""
+    output_filename = f"{run_info['RunID']}{lane_suffix}.demux_samplesheet.csv"
     with open(output_filename, "w") as outfile:
         outfile.write("[Header]\nFileFormatVersion,2\n\n")
         outfile.write(
             f"[BCLConvert_Settings]\nAdapterBehavior,trim\n"
             f"AdapterRead1,{adapter1}\n"
             f"AdapterRead2,{adapter2}\n"
-            f"OverrideCycles,{cycle_str}\n\n"
+            f"OverrideCycles,{cycle_str}\n"
         )
+        for key, value in (barcode_mismatches or {}).items():
+            outfile.write(f"{key},{value}\n")
+        outfile.write("\n")
         outfile.write("[BCLConvert_Data]\n")
-        df.to_csv(outfile, mode="a", header=True, index=False)
+        writer = csv.writer(outfile, lineterminator="\n")
+        writer.writerow(DEMUX_COLUMNS)
+        writer.writerows(rows)
+
+    return output_filename
+
+
+def write_lane_manifest(run_info: Dict[str, Any], samplesheets: List[Tuple[List[int], str, int]]) -> None:
+    """Write the lanes, samplesheet and number of samples of each demux samplesheet to a CSV file."""
+    with open(f"{run_info['RunID']}.demux_lanes.csv", "w", newline="") as cfile:
+        writer = csv.writer(cfile, lineterminator="\n")
+        writer.writerow(["lanes", "samplesheet", "samples"])
+        for lanes, samplesheet, samples in samplesheets:
+            writer.writerow([",".join(map(str, lanes)), samplesheet, samples])
 
 
 def write_run_info(run_info: Dict[str, Any]) -> None:
@@ -230,21 +523,151 @@ def write_run_info(run_info: Dict[str, Any]) -> None:
         writer.writerow([run_info[key] for key in keys])
 
 
-def main():
-    """Main entry point for the script."""
-    args = parse_args()
-    run_info = parse_run_info(args.rundir)
-
-    df = read_samplesheet(args.samplesheet)
-    df = process_samplesheet(df, run_info, args.checkindexes)
+def prepare_flowcell(
+    rundir: Path,
+    samplesheet: Path,
+    check_indexes: bool,
+    adapter1: str,
+    adapter2: str,
+    max_barcode_mismatches: int = 1,
+    split_lanes: Optional[List[List[int]]] = None,
+) -> str:
+    """Write the demux samplesheets, lane manifest and runinfo of one flowcell and return its run ID."""
+    run_info = parse_run_info(rundir)
+
+    # Small csv samplesheets skip importing pandas altogether
+    samplesheet_rows = read_samplesheet_rows(samplesheet)
+    if samplesheet_rows is not None:
+        rows = prepare_demux_rows(samplesheet_rows, run_info, check_indexes)
+    else:
+        df = read_samplesheet(samplesheet)
+        df = process_samplesheet(df, run_info, check_indexes)
+        rows = list(prepare_demux_sheet(df).itertuples(index=False, name=None))
 
     cycle_str = generate_cycle_string(run_info)
 
-    df_output = prepare_demux_sheet(df)
+    # Barcode mismatches are set per samplesheet, so lanes with distant indexes can allow more mismatches
+    lane_sheets = []
+    collisions = []
+    for lanes in group_lanes(rows, split_lanes):
+        lane_rows = [row for row in rows if int(row[0]) in lanes]
+        barcode_mismatches, lane_collisions = check_index_collisions(lane_rows, cycle_str, max_barcode_mismatches)
+        lane_sheets.append((lanes, lane_rows, barcode_mismatches))
+        collisions.extend(lane_collisions)
+
+    if collisions:
+        details = "\n".join(
+            f"  Lane {lane}: {sample1} and {sample2} have identical indexes" for lane, sample1, sample2 in collisions
+        )
+        raise ValueError(f"Index collisions found in samplesheet:\n{details}")
+
+    samplesheets = []
+    for lanes, lane_rows, barcode_mismatches in lane_sheets:
+        output_filename = write_demux_sheet(
+            lane_rows,
+            run_info,
+            cycle_str,
+            adapter1,
+            adapter2,
+            barcode_mismatches,
+            lanes if split_lanes is not None else None,
+        )
+        samplesheets.append((lanes, output_filename, len({row[1] for row in lane_rows})))
 
-    write_demux_sheet(df_output, run_info, cycle_str, args.adapter_read1, args.adapter_read2)
+    write_lane_manifest(run_info, samplesheets)
     write_run_info(run_info)
 
+    return run_info["RunID"]
+
+
+def read_manifest(manifest: Path) -> List[Tuple[Path, Path]]:
+    """Read the (rundir, samplesheet) pairs of a batch manifest."""
+    with open(manifest, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"rundir", "samplesheet"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Manifest {manifest} is missing columns: {', '.join(sorted(missing))}")
+        pairs = [
+            (manifest.parent / row["rundir"].strip(), manifest.parent / row["samplesheet"].strip()) for row in reader
+        ]
+
+    for rundir, samplesheet in pairs:
+        if not rundir.exists():
+            raise ValueError(f"The directory {rundir} does not exist.")
+        if not samplesheet.exists():
+            raise ValueError(f"The file {samplesheet} does not exist.")
+
+    return pairs
+
+
+def describe_error(error: Exception) -> str:
+    """Describe why a flowcell failed, naming unexpected errors such as a KeyError for a missing column."""
+    if isinstance(error, (OSError, ValueError, ET.ParseError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def prepare_batch(pairs: List[Tuple[Path, Path]], args: argparse.Namespace) -> List[str]:
+    """Prepare every flowcell of a manifest, in parallel with args.workers processes, and return the errors.
+
+    A failing flowcell does not stop the others; its error is returned with those of the rest.
+    """
+    options = (
+        args.checkindexes,
+        args.adapter_read1,
+        args.adapter_read2,
+        args.max_barcode_mismatches,
+        args.split_lanes,
+    )
+    errors = []
+
+    if args.workers > 1 and len(pairs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(pairs))) as pool:
+            futures = [pool.submit(prepare_flowcell, rundir, samplesheet, *options) for rundir, samplesheet in pairs]
+            for (rundir, _), future in zip(pairs, futures):
+                try:
+                    print(f"Prepared {future.result()}", file=sys.stderr)
+                except Exception as e:
+                    errors.append(f"{rundir}: {describe_error(e)}")
+    else:
+        for rundir, samplesheet in pairs:
+            try:
+                print(f"Prepared {prepare_flowcell(rundir, samplesheet, *options)}", file=sys.stderr)
+            except Exception as e:
+                errors.append(f"{rundir}: {describe_error(e)}")
+
+    return errors
+
+
+def main():
+    """Main entry point for the script."""
+    args = parse_args()
+
+    if args.manifest:
+        try:
+            pairs = read_manifest(args.manifest)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        errors = prepare_batch(pairs, args)
+        if errors:
+            sys.exit(f"Error: {len(errors)} of {len(pairs)} flowcells failed:\n" + "\n".join(errors))
+        return
+
+    try:
+        prepare_flowcell(
+            args.rundir,
+            args.samplesheet,
+            args.checkindexes,
+            args.adapter_read1,
+            args.adapter_read2,
+            args.max_barcode_mismatches,
+            args.split_lanes,
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Dict, List
+
+from lazy_import import lazy_import
+from parse_qc_metrics import (
+    METRIC_CONFIGS,
+    build_wide_table,
+    discover_metric_files,
+    parse_metrics,
+    read_file_to_dataframe,
+)
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+KNOWN_METRICS = {name for config in METRIC_CONFIGS.values() for name in config["metrics"]}
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Check DRAGEN QC metrics of each sample against QC thresholds.")
+    parser.add_argument(
+        "-i",
+        "--inputdir",
+        nargs="+",
+        required=True,
+        help="Directories to search for QC metric files, highest precedence first.",
+    )
+    parser.add_argument("-t", "--thresholds", required=True, help="JSON file with QC thresholds per sample class.")
+    parser.add_argument("-o", "--output", default="qc_gate.csv", help="Output manifest. Default: qc_gate.csv.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of workers used to parse metric files.")
+
+    return parser.parse_args()
+
+
+def load_thresholds(path: str) -> List[Dict[str, Any]]:
+    """
+    Load and validate QC thresholds.
+
+    The file holds a list of sample classes. Each class has a name, a regular expression matched against
+    SAMPLE ID (the first matching class is used) and rules with a metric and a 'min' and/or 'max' value.
+    'missing' sets whether a sample without a value for the metric passes or fails the rule (default: fail).
+
+    Args:
+        path: JSON thresholds file.
+
+    Returns:
+        Sample classes with compiled patterns.
+
+    Raises:
+        ValueError: If the thresholds are not valid.
+    """
+    with open(path) as f:
+        config = json.load(f)
+
+    classes = config.get("sample_classes")
+    if not classes:
+        raise ValueError(f"No sample_classes defined in {path}")
+
+    for sample_class in classes:
+        if "name" not in sample_class or "pattern" not in sample_class:
+            raise ValueError(f"Sample class is missing 'name' or 'pattern': {sample_class}")
+        sample_class["regex"] = re.compile(sample_class["pattern"])
+
+        for rule in sample_class.get("rules", []):
+            if rule.get("metric") not in KNOWN_METRICS:
+                raise ValueError(f"Unknown metric in QC thresholds for '{sample_class['name']}': {rule.get('metric')}")
+            if "min" not in rule and "max" not in rule:
+                raise ValueError(f"QC threshold for '{rule['metric']}' needs a 'min' or 'max' value")
+            if rule.get("missing", "fail") not in ("pass", "fail"):
+                raise ValueError(f"'missing' must be 'pass' or 'fail' for '{rule['metric']}'")
+
+    return classes
+
+
+def rule_label(rule: Dict[str, Any]) -> str:
+    """
+    Describe a rule, e.g. 'Average autosomal coverage over genome >= 30'.
+
+    Args:
+        rule: Rule from the thresholds file.
+
+    Returns:
+        Rule description.
+    """
+    bounds = []
+    if "min" in rule:
+        bounds.append(f">= {rule['min']}")
+    if "max" in rule:
+        bounds.append(f"<= {rule['max']}")
+    return f"{rule['metric']} {' and '.join(bounds)}"
+
+
+def evaluate_thresholds(metrics: pd.DataFrame, classes: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Evaluate every QC threshold against every sample at once.
+
+    Each rule is a single vectorized comparison over the samples of its class.
+
+    Args:
+        metrics: Table with a SAMPLE ID column and one column per metric.
+        classes: Sample classes from load_thresholds.
+
+    Returns:
+        Manifest with SAMPLE ID, SAMPLE CLASS, QC STATUS ('PASS' or 'FAIL') and the FAILED RULES of each sample.
+    """
+    sample_ids = metrics["SAMPLE ID"].astype(str)
+
+    sample_class = pd.Series("", index=metrics.index, dtype=object)
+    for cls in classes:
+        unassigned = sample_class.eq("")
+        sample_class[unassigned & sample_ids.str.contains(cls["regex"], regex=True)] = cls["name"]
+
+    unclassified = sample_class.eq("")
+    if unclassified.any():
+        logger.warning(
+            "No QC threshold class matches %d samples, they pass without checks: %s",
+            unclassified.sum(),
+            ", ".join(sample_ids[unclassified]),
+        )
+
+    failed: Dict[str, np.ndarray] = {}
+    for cls in classes:
+        in_class = sample_class.eq(cls["name"]).to_numpy()
+        for rule in cls.get("rules", []):
+            if rule["metric"] in metrics.columns:
+                values = pd.to_numeric(metrics[rule["metric"]], errors="coerce").to_numpy(
+                    dtype="float64", na_value=np.nan
+                )
+            else:
+                values = np.full(len(metrics), np.nan)
+
+            fails = np.isnan(values) if rule.get("missing", "fail") == "fail" else np.zeros(len(metrics), dtype=bool)
+            if "min" in rule:
+                fails |= values < rule["min"]
+            if "max" in rule:
+                fails |= values > rule["max"]
+
+            label = rule_label(rule)
+            failed[label] = failed.get(label, np.zeros(len(metrics), dtype=bool)) | (fails & in_class)
+
+    failed_df = pd.DataFrame(failed, index=metrics.index, dtype=bool)
+
+    # Join the labels of the failed rules of each sample without a Python loop over samples
+    if failed_df.empty:
+        failed_rules = pd.Series("", index=metrics.index)
+    else:
+        labels = pd.Series([f"{label}; " for label in failed_df.columns], index=failed_df.columns)
+        failed_rules = failed_df.astype(object).dot(labels).str.rstrip("; ")
+
+    return pd.DataFrame(
+        {
+            "SAMPLE ID": metrics["SAMPLE ID"],
+            "SAMPLE CLASS": sample_class,
+            "QC STATUS": np.where(failed_df.any(axis=1), "FAIL", "PASS"),
+            "FAILED RULES": failed_rules,
+        }
+    )
+
+
+def main() -> None:
+    """
+    Parse QC metrics of each sample and write a pass/fail manifest.
+    """
+    args = parse_args()
+
+    try:
+        classes = load_thresholds(args.thresholds)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: Unable to load QC thresholds: {e}")
+
+    files_by_type = discover_metric_files([os.path.abspath(d) for d in args.inputdir])
+    qc_dfs = parse_metrics(files_by_type, args.workers)
+    metrics = build_wide_table(read_file_to_dataframe(None), qc_dfs).reset_index()
+
+    manifest = evaluate_thresholds(metrics, classes)
+    manifest.to_csv(args.output, index=False)
+
+    failed = manifest[manifest["QC STATUS"] == "FAIL"]
+    logger.info("%d of %d samples failed QC thresholds", len(failed), len(manifest))
+    for sample_id, rules in zip(failed["SAMPLE ID"], failed["FAILED RULES"]):
+        logger.warning("%s failed QC: %s", sample_id, rules)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import datetime as dt
+import logging
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Optional
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+TABLE = "qc_metrics"
+
+# Columns every batch has, in front of the metric columns
+BATCH_COLUMNS = {"batch_id": "TEXT NOT NULL", "batch_date": "TEXT NOT NULL", "loaded_at": "TEXT NOT NULL"}
+
+# Columns that get an index for lookups
+INDEXED_COLUMNS = ["SAMPLE ID", "RUN ID", "ACCESSION NUMBER", "batch_id", "batch_date"]
+
+# Aggregate group -> column to group by
+GROUP_COLUMNS = {"run": "RUN ID", "date": "batch_date", "sample": "SAMPLE ID", "batch": "batch_id"}
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Query QC metrics stored across batches by parse_qc_metrics.py.")
+    parser.add_argument("-d", "--database", required=True, help="Path to QC warehouse SQLite file.")
+    parser.add_argument("-o", "--output", help="Write results to this CSV file. Default: stdout.")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, column in [("sample", "SAMPLE ID"), ("run", "RUN ID"), ("accession", "ACCESSION NUMBER")]:
+        lookup = subparsers.add_parser(command, help=f"Look up QC metrics by {column}.")
+        lookup.add_argument("values", nargs="+", help=f"{column} values to look up.")
+        lookup.add_argument("-c", "--columns", nargs="+", help="Columns to return. Default: all columns.")
+        lookup.add_argument(
+            "--all-batches",
+            action="store_true",
+            help="Return every batch a sample was loaded in instead of only its latest batch.",
+        )
+
+    aggregate = subparsers.add_parser("aggregate", help="Summarize QC metrics by run, date, sample or batch.")
+    aggregate.add_argument(
+        "-b", "--by", choices=list(GROUP_COLUMNS), default="run", help="Group rows by. Default: run."
+    )
+    aggregate.add_argument("-m", "--metrics", nargs="+", help="Numeric metrics to summarize. Default: all of them.")
+    aggregate.add_argument(
+        "-s", "--stat", choices=["avg", "min", "max"], default="avg", help="Statistic to compute. Default: avg."
+    )
+    aggregate.add_argument("--since", help="Only include batches on or after this date (YYYY-MM-DD).")
+    aggregate.add_argument("--until", help="Only include batches on or before this date (YYYY-MM-DD).")
+
+    subparsers.add_parser("batches", help="List loaded batches.")
+
+    return parser.parse_args()
+
+
+def quote(name: str) -> str:
+    """
+    Quote a column name for use as an SQLite identifier.
+
+    Args:
+        name: Column name, e.g. 'PCT of genome with coverage [  20x: inf)'.
+
+    Returns:
+        Quoted identifier.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sqlite_type(dtype: Any) -> str:
+    """
+    Map a pandas dtype to an SQLite column type.
+
+    Args:
+        dtype: pandas dtype of a column.
+
+    Returns:
+        'INTEGER', 'REAL' or 'TEXT'.
+    """
+    kind = getattr(dtype, "kind", "O")
+    if kind in "iub":
+        return "INTEGER"
+    if kind == "f":
+        return "REAL"
+    return "TEXT"
+
+
+def open_warehouse(path: str, create: bool = False) -> sqlite3.Connection:
+    """
+    Open the QC warehouse.
+
+    Args:
+        path: Path to SQLite file.
+        create: Create the warehouse if it does not exist yet, as when storing a batch.
+
+    Returns:
+        Open connection.
+
+    Raises:
+        ValueError: If create is not set and the file does not exist or is not a QC warehouse.
+    """
+    if not create and not os.path.isfile(path):
+        raise ValueError(f"QC warehouse {path} does not exist.")
+
+    conn = sqlite3.connect(path, timeout=60)
+    # WAL needs shared memory that network filesystems such as NFS and GPFS do not provide, so use the default
+    # rollback journal. Set it explicitly to switch back warehouses that were created in WAL mode.
+    conn.execute("PRAGMA journal_mode = DELETE")
+    if not create:
+        if not table_columns(conn):
+            conn.close()
+            raise ValueError(f"{path} is not a QC warehouse.")
+        return conn
+
+    columns = ", ".join(f"{quote(name)} {decl}" for name, decl in BATCH_COLUMNS.items())
+    identifiers = ", ".join(f"{quote(name)} TEXT" for name in INDEXED_COLUMNS if name not in BATCH_COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns}, {identifiers})")
+    for name in INDEXED_COLUMNS:
+        index = f"{TABLE}_{name.lower().replace(' ', '_')}"
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {TABLE} ({quote(name)})")
+    conn.commit()
+
+    return conn
+
+
+def table_columns(conn: sqlite3.Connection) -> dict[str, str]:
+    """
+    Get the columns of the warehouse table.
+
+    Args:
+        conn: Open warehouse connection.
+
+    Returns:
+        Dictionary that maps column name to its declared type, in table order.
+    """
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({TABLE})")}
+
+
+def store_batch(
+    conn: sqlite3.Connection,
+    df: Any,
+    batch_id: str,
+    batch_date: Optional[str] = None,
+    column_types: Optional[dict[str, str]] = None,
+) -> int:
+    """
+    Replace the rows of a batch with a merged QC table.
+
+    Metric columns that are new to the warehouse are added, so batches with different metric sets can be stored
+    side by side. Reloading a batch replaces its previous rows. Values of INTEGER and REAL columns that were read
+    as text, e.g. from a worksheet with empty cells, are stored as numbers, and blank or non-numeric ones as NULL.
+
+    Args:
+        conn: Open warehouse connection.
+        df: Merged QC metrics DataFrame with a SAMPLE ID column.
+        batch_id: Identifier of the batch, e.g. the output filename prefix.
+        batch_date: Date of the batch (YYYY-MM-DD). Default: today.
+        column_types: SQLite type of known columns, used when they are added instead of their dtype in this batch.
+
+    Returns:
+        Number of rows stored.
+    """
+    import pandas as pd
+
+    batch_date = batch_date or dt.date.today().isoformat()
+    loaded_at = dt.datetime.now().isoformat(timespec="seconds")
+    df = df[df["SAMPLE ID"].notna() & df["SAMPLE ID"].astype(str).str.strip().ne("")]
+    column_types = column_types or {}
+
+    with conn:
+        existing = table_columns(conn)
+        for name in df.columns:
+            if name not in existing:
+                existing[name] = column_types.get(name) or sqlite_type(df[name].dtype)
+                conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {quote(name)} {existing[name]}")
+
+        numbers = {}
+        for name in df.columns:
+            if existing[name] in ("INTEGER", "REAL") and getattr(df[name].dtype, "kind", "O") not in "iufb":
+                numbers[name] = pd.to_numeric(df[name], errors="coerce")
+                dropped = int((numbers[name].isna() & df[name].notna() & df[name].astype(str).str.strip().ne("")).sum())
+                if dropped:
+                    logger.warning("Stored %d non-numeric values of %s in QC warehouse as NULL", dropped, name)
+        df = df.assign(**numbers)
+
+        columns = list(BATCH_COLUMNS) + list(df.columns)
+        rows = (
+            (batch_id, batch_date, loaded_at, *row)
+            for row in df.astype(object).where(df.notna(), None).itertuples(index=False)
+        )
+        conn.execute(f"DELETE FROM {TABLE} WHERE batch_id = ?", (batch_id,))
+        conn.executemany(
+            f"INSERT INTO {TABLE} ({', '.join(quote(c) for c in columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows,
+        )
+
+    logger.info("Stored %d samples of batch %s in QC warehouse", len(df), batch_id)
+
+    return len(df)
+
+
+def lookup(
+    conn: sqlite3.Connection,
+    column: str,
+    values: list[str],
+    columns: Optional[list[str]] = None,
+    all_batches: bool = False,
+) -> tuple[list[str], list[tuple]]:
+    """
+    Look up stored QC metrics through an indexed identifier column.
+
+    Args:
+        conn: Open warehouse connection.
+        column: SAMPLE ID, RUN ID or ACCESSION NUMBER.
+        values: Values of column to look up.
+        columns: Columns to return. Default: all columns.
+        all_batches: Return every batch of a sample instead of only the latest one by batch date.
+
+    Returns:
+        Tuple of column names and result rows.
+
+    Raises:
+        ValueError: If a requested column is not in the warehouse.
+    """
+    existing = table_columns(conn)
+    columns = columns or list(existing)
+    missing = [c for c in columns if c not in existing]
+    if missing:
+        raise ValueError(f"Columns not in QC warehouse: {', '.join(missing)}")
+
+    select = ", ".join(quote(c) for c in columns)
+    where = f"{quote(column)} IN ({', '.join('?' * len(values))})"
+    if all_batches:
+        query = f"SELECT {select} FROM {TABLE} WHERE {where} ORDER BY batch_date, loaded_at"
+    else:
+        # Samples can be resequenced and loaded again in later batches; keep the latest row of each
+        query = (
+            f"SELECT {select} FROM ("
+            f"SELECT *, ROW_NUMBER() OVER (PARTITION BY {quote('SAMPLE ID')} ORDER BY batch_date DESC, loaded_at DESC) "
+            f"AS rn FROM {TABLE} WHERE {where}) WHERE rn = 1 ORDER BY batch_date, loaded_at"
+        )
+
+    return columns, conn.execute(query, values).fetchall()
+
+
+def aggregate(
+    conn: sqlite3.Connection,
+    by: str,
+    metrics: Optional[list[str]] = None,
+    stat: str = "avg",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+) -> tuple[list[str], list[tuple]]:
+    """
+    Summarize numeric QC metrics per run, date, sample or batch.
+
+    Args:
+        conn: Open warehouse connection.
+        by: Key of GROUP_COLUMNS.
+        metrics: Numeric columns to summarize. Default: every INTEGER and REAL column.
+        stat: 'avg', 'min' or 'max'.
+        since: Only include batches on or after this date.
+        until: Only include batches on or before this date.
+
+    Returns:
+        Tuple of column names and result rows.
+
+    Raises:
+        ValueError: If a requested metric is not a numeric column in the warehouse.
+    """
+    numeric = [name for name, decl in table_columns(conn).items() if decl in ("INTEGER", "REAL")]
+    metrics = metrics or numeric
+    missing = [m for m in metrics if m not in numeric]
+    if missing:
+        raise ValueError(f"Numeric metrics not in QC warehouse: {', '.join(missing)}")
+
+    group = quote(GROUP_COLUMNS[by])
+    conditions, params = [], []
+    if since:
+        conditions.append("batch_date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("batch_date <= ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    select = ", ".join(f"{stat.upper()}({quote(m)})" for m in metrics)
+    query = f"SELECT {group}, COUNT(*), {select} FROM {TABLE} {where} GROUP BY {group} ORDER BY {group}"
+
+    return [GROUP_COLUMNS[by], "samples"] + [f"{stat}({m})" for m in metrics], conn.execute(query, params).fetchall()
+
+
+def list_batches(conn: sqlite3.Connection) -> tuple[list[str], list[tuple]]:
+    """
+    List loaded batches.
+
+    Args:
+        conn: Open warehouse connection.
+
+    Returns:
+        Tuple of column names and result rows.
+    """
+    query = (
+        f"SELECT batch_id, batch_date, loaded_at, COUNT(*) FROM {TABLE} "
+        "GROUP BY batch_id, batch_date, loaded_at ORDER BY batch_date, loaded_at"
+    )
+    return ["batch_id", "batch_date", "loaded_at", "samples"], conn.execute(query).fetchall()
+
+
+def main() -> None:
+    """
+    Run a lookup or aggregate query against the QC warehouse and write the result as CSV.
+    """
+    args = parse_args()
+
+    start = time.perf_counter()
+    try:
+        conn = open_warehouse(args.database)
+    except (sqlite3.Error, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    try:
+        if args.command == "aggregate":
+            header, rows = aggregate(conn, args.by, args.metrics, args.stat, args.since, args.until)
+        elif args.command == "batches":
+            header, rows = list_batches(conn)
+        else:
+            column = {"sample": "SAMPLE ID", "run": "RUN ID", "accession": "ACCESSION NUMBER"}[args.command]
+            header, rows = lookup(conn, column, args.values, args.columns, args.all_batches)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        conn.close()
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(header)
+        writer.writerows(rows)
+    finally:
+        if args.output:
+            out.close()
+
+    logger.info("Returned %d rows in %.3fs", len(rows), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,39 @@
 
 import argparse
 import csv
+import gzip
+import json
 import logging
 import os
+import shutil
+import sqlite3
 import sys
-from typing import Any, List, Optional, Tuple
-
-import pyodbc
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, closing, contextmanager
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# SQL Server accepts at most 2100 parameters per statement
+MAX_QUERY_PARAMETERS = 2100
+
+# Connection strings of the SQLite backend are this prefix followed by the database file
+SQLITE_PREFIX = "sqlite:///"
+
+# SQLite accepts at most 999 parameters per statement in older versions
+MAX_CACHE_PARAMETERS = 999
+
+# Keys of a batch manifest query, named after the command-line options they replace
+MANIFEST_KEYS = ["output", "name", "table", "columns", "filter_col", "filter_values", "where", "output_format"]
+
+# Open connection of each worker thread
+_local = threading.local()
+
 
 def parse_args() -> argparse.Namespace:
     """Parses command-line arguments for database connection and query parameters.
@@ -23,6 +46,13 @@ def parse_args() -> argparse.Namespace:
     env = os.environ.get
 
     db_group = parser.add_argument_group("Database Connection")
+    db_group.add_argument(
+        "-b",
+        "--backend",
+        choices=list(BACKENDS),
+        default=env("COPATHBI_BACKEND", "mssql"),
+        help="Database backend. 'sqlite' reads the file given as --database. Default: mssql.",
+    )
     db_group.add_argument("-s", "--server", default=env("COPATHBI_SERVER"))
     db_group.add_argument("-d", "--database", default=env("COPATHBI_DATABASE"))
     db_group.add_argument("-u", "--username", default=env("COPATHBI_USER"))
@@ -35,37 +65,182 @@ def parse_args() -> argparse.Namespace:
     query_group.add_argument("-v", "--filter-values", nargs="+", help="Values for the filter column.")
     query_group.add_argument("-w", "--where", help="Additional custom WHERE clause.")
     query_group.add_argument("-lc", "--list-columns", action="store_true", help="List table columns and exit.")
-    query_group.add_argument("-o", "--output", default="query_results.csv", help="CSV output path.")
+    query_group.add_argument("-o", "--output", default="query_results.csv", help="Output path.")
+    query_group.add_argument(
+        "-of",
+        "--output-format",
+        choices=["csv", "csv.gz", "parquet"],
+        help="Output format. Default: from the output extension, otherwise csv.",
+    )
+    query_group.add_argument(
+        "-cs", "--chunk-size", type=int, default=1000, help="Filter values per query. Default: 1000."
+    )
+    query_group.add_argument(
+        "-n", "--connections", type=int, default=4, help="Database connections to run chunks on. Default: 4."
+    )
+    query_group.add_argument(
+        "-a", "--arraysize", type=int, default=5000, help="Rows fetched per round trip. Default: 5000."
+    )
+
+    batch_group = parser.add_argument_group("Batch mode")
+    batch_group.add_argument(
+        "-m",
+        "--manifest",
+        help="JSON (or YAML) list of queries, each with an 'output' and any of "
+        + ", ".join(MANIFEST_KEYS[1:])
+        + ". Missing keys take the command-line value. The queries share --connections connections.",
+    )
+
+    export_group = parser.add_argument_group("Resumable export")
+    export_group.add_argument(
+        "--page-by",
+        metavar="KEY",
+        help="Export the table page by page in order of this unique column, e.g. the primary key.",
+    )
+    export_group.add_argument("--page-size", type=int, default=50000, help="Rows per page. Default: 50000.")
+    export_group.add_argument(
+        "--partitions",
+        type=int,
+        default=1,
+        help="Key ranges exported in parallel on separate connections. Default: 1.",
+    )
+    export_group.add_argument(
+        "--checkpoint", help="Checkpoint file to resume an interrupted export from. Default: <output>.checkpoint.json."
+    )
+
+    cache_group = parser.add_argument_group("Cache")
+    cache_group.add_argument(
+        "--cache",
+        default=env("COPATHBI_CACHE"),
+        help="SQLite file caching query results per filter value, not used for Parquet output. "
+        "Default: $COPATHBI_CACHE.",
+    )
+    cache_group.add_argument(
+        "--cache-ttl",
+        nargs="+",
+        default=["24"],
+        metavar="[TABLE=]HOURS",
+        help="Hours cached results stay valid, optionally per table, e.g. '24 FranklinOrder=168'. Default: 24.",
+    )
+    cache_group.add_argument(
+        "--offline", action="store_true", help="Answer from the cache only, however old, without the database."
+    )
 
     return parser.parse_args()
 
 
+def _mssql_connection_string(
+    server: Optional[str], database: Optional[str], username: Optional[str], password: Optional[str], driver: str
+) -> str:
+    """Constructs a pyodbc connection string for SQL Server."""
+    if all([server, database, username, password]):
+        return (
+            f"DRIVER={driver};SERVER={server};DATABASE={database};"
+            f"UID={username};PWD={password};TrustServerCertificate=yes;"
+        )
+    else:
+        raise ValueError("All connection parameters (server, db, user, pass) must be provided.")
+
+
+def _sqlite_connection_string(
+    server: Optional[str], database: Optional[str], username: Optional[str], password: Optional[str], driver: str
+) -> str:
+    """Constructs a connection string for a SQLite file, given as the database."""
+    if not database:
+        raise ValueError("The SQLite database file (--database) must be provided.")
+    return f"{SQLITE_PREFIX}{database}"
+
+
+def _connect_mssql(conn_string: str) -> Any:
+    """Opens a SQL Server connection, importing pyodbc only when a query is run.
+
+    Raises:
+        ImportError: If pyodbc is not installed.
+    """
+    try:
+        import pyodbc
+    except ImportError:
+        raise ImportError("'pyodbc' is required to query the database. Please install it.") from None
+
+    return pyodbc.connect(conn_string)
+
+
+def _connect_sqlite(conn_string: str) -> Any:
+    """Opens a SQLite file read-only. The connection may be closed by another thread than the one using it."""
+    uri = Path(conn_string[len(SQLITE_PREFIX) :]).absolute().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _limit_top(query: str, rows: int) -> str:
+    """Limits the rows of a SELECT query with TOP."""
+    return query.replace("SELECT ", f"SELECT TOP {int(rows)} ", 1)
+
+
+def _limit_clause(query: str, rows: int) -> str:
+    """Limits the rows of a SELECT query with LIMIT."""
+    return f"{query} LIMIT {int(rows)}"
+
+
+# Backend -> (connection string builder, connect, row limit of a SELECT query)
+BACKENDS: Dict[
+    str,
+    Tuple[
+        Callable[[Optional[str], Optional[str], Optional[str], Optional[str], str], str],
+        Callable[[str], Any],
+        Callable[[str, int], str],
+    ],
+] = {
+    "mssql": (_mssql_connection_string, _connect_mssql, _limit_top),
+    "sqlite": (_sqlite_connection_string, _connect_sqlite, _limit_clause),
+}
+
+
 def build_connection_string(
     server: Optional[str] = None,
     database: Optional[str] = None,
     username: Optional[str] = None,
     password: Optional[str] = None,
     driver: str = "{ODBC Driver 18 for SQL Server}",
+    backend: str = "mssql",
 ) -> str:
-    """Constructs a pyodbc connection string from individual parameters.
+    """Constructs a connection string from individual parameters.
 
     Args:
         server: SQL Server host name.
-        database: Database name.
+        database: Database name, or file for SQLite.
         username: Username.
         password: Password.
         driver: ODBC driver name.
+        backend: Key of BACKENDS.
 
     Returns:
         Connection string.
     """
-    if all([server, database, username, password]):
-        return (
-            f"DRIVER={driver};SERVER={server};DATABASE={database};"
-            f"UID={username};PWD={password};TrustServerCertificate=yes;"
-        )
-    else:
-        raise ValueError("All connection parameters (server, db, user, pass) must be provided.")
+    return BACKENDS[backend][0](server, database, username, password, driver)
+
+
+def backend_of(conn_string: str) -> str:
+    """Finds the backend a connection string was built for.
+
+    Args:
+        conn_string: Database connection string.
+
+    Returns:
+        Key of BACKENDS.
+    """
+    return "sqlite" if conn_string.startswith(SQLITE_PREFIX) else "mssql"
+
+
+def connect(conn_string: str) -> Any:
+    """Opens a database connection with the backend of the connection string.
+
+    Args:
+        conn_string: Database connection string.
+
+    Returns:
+        Open DB-API connection.
+    """
+    return BACKENDS[backend_of(conn_string)][1](conn_string)
 
 
 def get_table_columns(conn_string: str, table_name: str) -> List[str]:
@@ -78,64 +253,587 @@ def get_table_columns(conn_string: str, table_name: str) -> List[str]:
     Returns:
         List of column names.
     """
-    query = "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ?"
-    with pyodbc.connect(conn_string) as conn, conn.cursor() as cursor:
-        cursor.execute(query, table_name)
-        return [row[0] for row in cursor.fetchall()]
+    with closing(connect(conn_string)) as conn, closing(conn.cursor()) as cursor:
+        cursor.execute(f"SELECT * FROM [{table_name}] WHERE 1 = 0")
+        return [col[0] for col in cursor.description]
 
 
-def execute_and_stream_to_csv(
-    conn_string: str, query: str, output_path: str, params: Optional[List[Any]] = None
-) -> int:
-    """Executes a query and streams results directly to CSV to save memory.
+def chunk_values(values: Sequence[Any], chunk_size: int) -> List[List[Any]]:
+    """Splits filter values into chunks, dropping duplicates so no row is returned twice.
+
+    Args:
+        values: Filter values.
+        chunk_size: Maximum number of values per chunk.
+
+    Returns:
+        Chunks of unique values in their original order.
+
+    Raises:
+        ValueError: If chunk_size is not between 1 and the SQL Server parameter limit.
+    """
+    if not 0 < chunk_size < MAX_QUERY_PARAMETERS:
+        raise ValueError(f"Chunk size must be between 1 and {MAX_QUERY_PARAMETERS - 1}, got {chunk_size}.")
+
+    unique = list(dict.fromkeys(values))
+    return [unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)]
+
+
+def _open_thread_connection(conn_string: str, connections: List[Any], lock: threading.Lock) -> None:
+    """Opens the connection reused by every query of the current worker thread.
 
     Args:
         conn_string: Database connection string.
+        connections: Open connections, closed once all queries are done.
+        lock: Lock guarding connections.
+    """
+    _local.conn = connect(conn_string)
+    with lock:
+        connections.append(_local.conn)
+
+
+def fetch_batches(cursor: Any, arraysize: int) -> Iterator[List[Any]]:
+    """Fetches the rows of an executed query in batches.
+
+    Args:
+        cursor: Cursor of an executed query.
+        arraysize: Rows per batch.
+
+    Yields:
+        Batches of up to arraysize rows.
+    """
+    cursor.arraysize = arraysize
+    while True:
+        rows = cursor.fetchmany(arraysize)
+        if not rows:
+            return
+        yield rows
+
+
+def _fetch_query(query: str, params: List[Any], arraysize: int) -> Tuple[List[str], List[List[Any]]]:
+    """Runs a query on the connection of the current worker thread.
+
+    Args:
         query: SQL query.
-        output_path: Path to output CSV file.
         params: Query parameters.
+        arraysize: Rows fetched per round trip.
 
     Returns:
-        Number of rows written to the output file.
+        Column names (empty if the query returns no result set) and result rows in batches.
     """
-    logger.debug("Executing query: %s", query)
-    row_count = 0
-    with pyodbc.connect(conn_string) as conn, conn.cursor() as cursor:
-        cursor.execute(query, params or [])
+    logger.debug("Executing query with %d parameters: %s", len(params), query)
+    with closing(_local.conn.cursor()) as cursor:
+        cursor.execute(query, params)
         if not cursor.description:
-            return 0
-
-        columns = [col[0] for col in cursor.description]
-        with open(output_path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            for row in cursor:
-                writer.writerow(row)
-                row_count += 1
-    return row_count
+            return [], []
+        return [col[0] for col in cursor.description], list(fetch_batches(cursor, arraysize))
+
+
+def _stream_query(
+    conn_string: str, query: str, params: List[Any], arraysize: int
+) -> Iterator[Tuple[List[str], Iterator[List[Any]]]]:
+    """Runs a single query and streams its rows, so results of any size are never held in memory.
+
+    Args:
+        conn_string: Database connection string.
+        query: SQL query.
+        params: Query parameters.
+        arraysize: Rows fetched per round trip.
+
+    Yields:
+        Column names and the result rows in batches, if the query returns a result set.
+    """
+    logger.debug("Executing query with %d parameters: %s", len(params), query)
+    with closing(connect(conn_string)) as conn, closing(conn.cursor()) as cursor:
+        cursor.execute(query, params)
+        if cursor.description:
+            yield [col[0] for col in cursor.description], fetch_batches(cursor, arraysize)
+
+
+def _stream_on_thread_connection(
+    queries: List[Tuple[str, List[Any]]], arraysize: int
+) -> Iterator[Tuple[List[str], Iterable[List[Any]]]]:
+    """Runs queries one after another on the connection of the current worker thread and streams their rows.
+
+    Args:
+        queries: SQL queries and their parameters.
+        arraysize: Rows fetched per round trip.
+
+    Yields:
+        Column names (empty if the query returns no result set) and result rows in batches of each query.
+    """
+    for query, params in queries:
+        logger.debug("Executing query with %d parameters: %s", len(params), query)
+        with closing(_local.conn.cursor()) as cursor:
+            cursor.execute(query, params)
+            if not cursor.description:
+                yield [], []
+                continue
+            yield [col[0] for col in cursor.description], fetch_batches(cursor, arraysize)
+
+
+def fetch_results(
+    conn_string: str, queries: List[Tuple[str, List[Any]]], connections: int = 4, arraysize: int = 5000
+) -> Iterator[Tuple[List[str], Iterable[List[Any]]]]:
+    """Executes queries and yields their results in the order of the queries.
+
+    A single query streams its rows from one connection. Several queries run concurrently: each worker thread
+    opens one connection and reuses it for all of its queries, and at most two queries per connection are in
+    flight, so only their results are held in memory.
+
+    Args:
+        conn_string: Database connection string.
+        queries: SQL queries and their parameters.
+        connections: Maximum number of connections.
+        arraysize: Rows fetched per round trip.
+
+    Yields:
+        Column names (empty if the query returns no result set) and result rows in batches of each query.
+        The batches of a result must be consumed before the next result is requested.
+    """
+    if len(queries) == 1:
+        yield from _stream_query(conn_string, *queries[0], arraysize)
+        return
+
+    workers = max(1, min(connections, len(queries)))
+    opened: List[Any] = []
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            initializer=_open_thread_connection,
+            initargs=(conn_string, opened, threading.Lock()),
+        ) as pool:
+            pending = deque(pool.submit(_fetch_query, *q, arraysize) for q in queries[: 2 * workers])
+            remaining = iter(queries[2 * workers :])
+            while pending:
+                result = pending.popleft().result()
+                next_query = next(remaining, None)
+                if next_query:
+                    pending.append(pool.submit(_fetch_query, *next_query, arraysize))
+                yield result
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+@contextmanager
+def _open_csv(path: str, columns: List[str]) -> Iterator[Callable[[List[Any]], None]]:
+    """Opens a CSV output and yields a function that writes a batch of rows to it."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        yield writer.writerows
+
+
+@contextmanager
+def _open_csv_gz(path: str, columns: List[str]) -> Iterator[Callable[[List[Any]], None]]:
+    """Opens a gzip compressed CSV output and yields a function that writes a batch of rows to it."""
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        yield writer.writerows
+
+
+@contextmanager
+def _open_parquet(path: str, columns: List[str]) -> Iterator[Callable[[List[Any]], None]]:
+    """Opens a Parquet output and yields a function that writes a batch of rows to it as a row group.
+
+    Column types are taken from the first batch. Columns that are empty in the first batch are written as text.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("'pyarrow' is required to write Parquet files. Please install it.") from None
+
+    writer = None
+    schema = None
+    text_columns: List[int] = []
+
+    def write(rows: List[Any]) -> None:
+        nonlocal writer, schema
+        values = [[row[i] for row in rows] for i in range(len(columns))]
+        for i in text_columns:
+            values[i] = [None if v is None else str(v) for v in values[i]]
+        if writer is None:
+            arrays = [pa.array(v) for v in values]
+            for i, array in enumerate(arrays):
+                if pa.types.is_null(array.type):
+                    text_columns.append(i)
+                    arrays[i] = array.cast(pa.string())
+            table = pa.Table.from_arrays(arrays, names=columns)
+            schema = table.schema
+            writer = pq.ParquetWriter(path, schema)
+        else:
+            table = pa.Table.from_arrays([pa.array(v, type=f.type) for v, f in zip(values, schema)], schema=schema)
+        writer.write_table(table)
+
+    try:
+        yield write
+    finally:
+        if writer is None:
+            pq.write_table(pa.Table.from_arrays([pa.array([], pa.string()) for _ in columns], names=columns), path)
+        else:
+            writer.close()
+
+
+# Output format -> (file extension, writer)
+OUTPUT_WRITERS: Dict[str, Tuple[str, Callable[[str, List[str]], ContextManager[Callable[[List[Any]], None]]]]] = {
+    "csv": (".csv", _open_csv),
+    "csv.gz": (".csv.gz", _open_csv_gz),
+    "parquet": (".parquet", _open_parquet),
+}
+
+
+def output_format_of(output_path: str) -> str:
+    """Guesses the output format from the file extension.
+
+    Args:
+        output_path: Path to output file.
+
+    Returns:
+        Key of OUTPUT_WRITERS; csv if the extension is not known.
+    """
+    for output_format, (extension, _) in OUTPUT_WRITERS.items():
+        if output_path.lower().endswith(extension):
+            return output_format
+    return "csv"
+
+
+def write_results(
+    results: Iterable[Tuple[List[str], Iterable[List[Any]]]],
+    output_path: str,
+    output_format: str = "csv",
+    filter_col: Optional[str] = None,
+    empty_columns: Optional[List[str]] = None,
+) -> Tuple[int, Optional[Set[str]]]:
+    """Streams query results to one output file.
+
+    The output is created with the columns of the first result set, or with empty_columns if none arrives. Rows are
+    written a batch at a time, in the column order of the first result set. The values of the filter
+    column are collected while writing, so missing filter values can be found without reading the output again.
+
+    Args:
+        results: Column names and batches of rows of each query.
+        output_path: Path to output file.
+        output_format: Key of OUTPUT_WRITERS.
+        filter_col: Column whose values are collected.
+        empty_columns: If given, the output is created with these columns when no result set arrives.
+
+    Returns:
+        Number of rows written, and the values seen in the filter column (None if it is not in the results).
+
+    Raises:
+        ValueError: If a result set has different columns than the first one.
+    """
+    row_count = 0
+    seen: Optional[Set[str]] = set() if filter_col else None
+    index = None
+    header = None
+    write = None
+    with ExitStack() as stack:
+        # Results that stop early, e.g. when writing fails, still close their cursor on this thread
+        if hasattr(results, "close"):
+            stack.callback(results.close)
+        for columns, batches in results:
+            if not columns:
+                continue
+            if write is None:
+                header = list(columns)
+                write = stack.enter_context(OUTPUT_WRITERS[output_format][1](output_path, header))
+                if filter_col:
+                    index = next((i for i, c in enumerate(columns) if c.lower() == filter_col.lower()), None)
+                    if index is None:
+                        seen = None
+
+            # Result sets with the same columns in another order, e.g. from the cache, are put in header order
+            order = None
+            if list(columns) != header:
+                if sorted(columns) != sorted(header):
+                    raise ValueError(f"Query results have columns {', '.join(columns)}, expected {', '.join(header)}.")
+                order = [list(columns).index(c) for c in header]
+
+            for rows in batches:
+                if order is not None:
+                    rows = [[row[i] for i in order] for row in rows]
+                write(rows)
+                row_count += len(rows)
+                if seen is not None:
+                    seen.update(str(row[index]) for row in rows)
+
+        if write is None and empty_columns is not None:
+            stack.enter_context(OUTPUT_WRITERS[output_format][1](output_path, empty_columns))
+
+    return row_count, seen
+
+
+def execute_and_stream_to_csv(
+    conn_string: str,
+    queries: List[Tuple[str, List[Any]]],
+    output_path: str,
+    connections: int = 4,
+    arraysize: int = 5000,
+    output_format: str = "csv",
+    filter_col: Optional[str] = None,
+) -> Tuple[int, Optional[Set[str]]]:
+    """Executes queries and streams their results to one output file in the order of the queries.
+
+    Args:
+        conn_string: Database connection string.
+        queries: SQL queries and their parameters.
+        output_path: Path to output file.
+        connections: Maximum number of connections.
+        arraysize: Rows fetched per round trip.
+        output_format: Key of OUTPUT_WRITERS.
+        filter_col: Column whose values are collected.
+
+    Returns:
+        Number of rows written, and the values seen in the filter column (None if it is not in the results).
+    """
+    results = fetch_results(conn_string, queries, connections, arraysize)
+    return write_results(results, output_path, output_format, filter_col)
+
+
+def parse_cache_ttl(values: List[str], table: str) -> float:
+    """Finds the cache lifetime of a table.
+
+    Args:
+        values: Default lifetime in hours and/or TABLE=HOURS entries.
+        table: Table name.
+
+    Returns:
+        Lifetime in seconds.
+
+    Raises:
+        ValueError: If an entry is not a number of hours.
+    """
+    ttl = {}
+    for value in values:
+        name, _, hours = value.rpartition("=")
+        try:
+            ttl[name.lower()] = float(hours) * 3600
+        except ValueError:
+            raise ValueError(f"Invalid cache TTL '{value}', expected HOURS or TABLE=HOURS.") from None
+
+    return ttl.get(table.lower(), ttl.get("", 24 * 3600))
+
+
+def open_metadata_cache(cache_path: str) -> Optional[sqlite3.Connection]:
+    """Opens (and creates if needed) the on-disk cache of query results.
+
+    Args:
+        cache_path: Path to SQLite cache file.
+
+    Returns:
+        Open cache connection, or None if the cache could not be opened.
+    """
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        conn = sqlite3.connect(cache_path, timeout=60)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_cache (
+                table_name TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched REAL NOT NULL,
+                PRIMARY KEY (table_name, query, value)
+            )
+            """)
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Unable to open cache %s, querying without it: %s", cache_path, e)
+        return None
+
+    return conn
+
+
+def cache_query_key(args: argparse.Namespace) -> str:
+    """Describes everything besides the table and filter value that changes the rows of a query.
+
+    The database is identified by its backend, server and name (the absolute file for SQLite). The username and
+    password are left out, so offline runs without credentials find the rows cached by online runs.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Cache key of the query.
+    """
+    backend = args.backend or "mssql"
+    server = (args.server or "").lower() if backend != "sqlite" else ""
+    database = args.database or ""
+    if backend == "sqlite" and database:
+        database = os.path.abspath(database)
+    columns = list(args.columns) if args.columns else ["*"]
+    return json.dumps(
+        {
+            "backend": backend,
+            "server": server,
+            "database": database,
+            "columns": columns,
+            "filter_col": args.filter_col,
+            "where": args.where,
+        },
+        sort_keys=True,
+    )
+
 
+def lookup_cached_rows(
+    conn: sqlite3.Connection, table: str, query: str, values: List[str], max_age: Optional[float]
+) -> Tuple[Dict[str, Tuple[List[str], List[Any]]], List[str]]:
+    """Finds the cached rows of filter values.
 
-def build_query(args: argparse.Namespace) -> Tuple[str, List[Any]]:
+    Args:
+        conn: Open cache connection.
+        table: Table name.
+        query: Cache key of the query.
+        values: Unique filter values.
+        max_age: Maximum age of cached rows in seconds. None accepts rows of any age.
+
+    Returns:
+        Column names and rows of each cached value, and the values that are not cached or have expired.
+    """
+    oldest = time.time() - max_age if max_age is not None else float("-inf")
+    hits: Dict[str, Tuple[List[str], List[Any]]] = {}
+    for chunk in chunk_values(values, MAX_CACHE_PARAMETERS - 2):
+        placeholders = ",".join("?" * len(chunk))
+        for value, data, fetched in conn.execute(
+            "SELECT value, data, fetched FROM query_cache "
+            f"WHERE table_name = ? AND query = ? AND value IN ({placeholders})",
+            [table.lower(), query, *chunk],
+        ):
+            if fetched >= oldest:
+                cached = json.loads(data)
+                hits[value] = (cached["columns"], cached["rows"])
+
+    return hits, [value for value in values if value not in hits]
+
+
+def store_cached_rows(
+    conn: sqlite3.Connection, table: str, query: str, filter_col: str, columns: List[str], rows: List[Any]
+) -> None:
+    """Adds or replaces the cached rows of each filter value in a result.
+
+    Values without rows are not cached, so records added later are found on the next query.
+
+    Args:
+        conn: Open cache connection.
+        table: Table name.
+        query: Cache key of the query.
+        filter_col: Column for IN filter.
+        columns: Column names of the result.
+        rows: Result rows.
+    """
+    index = next((i for i, c in enumerate(columns) if c.lower() == filter_col.lower()), None)
+    if index is None:
+        logger.warning("Filter column %s is not in the results, which are not cached.", filter_col)
+        return
+
+    by_value: Dict[str, List[Any]] = {}
+    for row in rows:
+        by_value.setdefault(str(row[index]), []).append(list(row))
+
+    now = time.time()
+    conn.executemany(
+        "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?, ?, ?)",
+        [
+            (table.lower(), query, value, json.dumps({"columns": columns, "rows": value_rows}, default=str), now)
+            for value, value_rows in by_value.items()
+        ],
+    )
+    conn.commit()
+
+
+def cached_results(
+    fetch: Callable[[List[Tuple[str, List[Any]]]], Iterable[Tuple[List[str], Iterable[List[Any]]]]],
+    args: argparse.Namespace,
+    cache: sqlite3.Connection,
+) -> Iterator[Tuple[List[str], List[Any]]]:
+    """Yields the cached rows of the filter values, then queries the database for the rest and caches them.
+
+    Args:
+        fetch: Runs queries and yields their column names and batches of rows. Unused when offline.
+        args: Command-line arguments.
+        cache: Open cache connection.
+
+    Yields:
+        Column names and rows of the cached values, then of each database query, as a single batch.
+    """
+    query = cache_query_key(args)
+    values = list(dict.fromkeys(args.filter_values))
+    max_age = None if args.offline else parse_cache_ttl(args.cache_ttl, args.table)
+    hits, misses = lookup_cached_rows(cache, args.table, query, values, max_age)
+    logger.info("Found %d of %d filter values in the cache", len(hits), len(values))
+
+    for columns, rows in hits.values():
+        yield columns, [rows]
+
+    if not misses or args.offline:
+        return
+
+    chunks = chunk_values(misses, args.chunk_size)
+    queries = [build_query(args, chunk) for chunk in chunks]
+    logger.info("Querying %d filter values in %d chunks", len(misses), len(chunks))
+    for columns, batches in fetch(queries):
+        rows = [row for batch in batches for row in batch]
+        if columns:
+            store_cached_rows(cache, args.table, query, args.filter_col, columns, rows)
+        yield columns, [rows]
+
+
+def selected_columns(args: argparse.Namespace, key_col: str) -> List[str]:
+    """Lists the selected columns, making sure a key column is part of them.
+
+    Args:
+        args: Command-line arguments.
+        key_col: Column that must be selected.
+
+    Returns:
+        Column names in SELECT order, or ['*'].
+    """
+    cols = list(args.columns) if args.columns else ["*"]
+    if "*" not in cols and key_col not in cols:
+        cols.insert(0, key_col)
+
+    return cols
+
+
+def select_list(args: argparse.Namespace, key_col: str) -> str:
+    """Constructs the SELECT list, making sure a key column is part of it.
+
+    Args:
+        args: Command-line arguments.
+        key_col: Column that must be selected.
+
+    Returns:
+        Bracketed, comma-separated column names, or '*'.
+    """
+    return ", ".join(f"[{c}]" if c != "*" else c for c in selected_columns(args, key_col))
+
+
+def build_query(args: argparse.Namespace, filter_values: Optional[List[Any]] = None) -> Tuple[str, List[Any]]:
     """Constructs the SQL query and parameter list from arguments.
 
     Args:
         args: Command-line arguments.
+        filter_values: Values for the filter column. Default: args.filter_values.
 
     Returns:
         Tuple containing the SQL query string and a list of parameters.
     """
-    cols = list(args.columns) if args.columns else ["*"]
-    if "*" not in cols and args.filter_col not in cols:
-        cols.insert(0, args.filter_col)
+    if filter_values is None:
+        filter_values = args.filter_values
 
-    select_list = ", ".join(f"[{c}]" if c != "*" else c for c in cols)
-    query = f"SELECT {select_list} FROM [{args.table}]"
+    query = f"SELECT {select_list(args, args.filter_col)} FROM [{args.table}]"
     clauses, params = [], []
 
-    if args.filter_values:
-        placeholders = ",".join("?" * len(args.filter_values))
+    if filter_values:
+        placeholders = ",".join("?" * len(filter_values))
         clauses.append(f"[{args.filter_col}] IN ({placeholders})")
-        params.extend(args.filter_values)
+        params.extend(filter_values)
 
     if args.where:
         clauses.append(f"({args.where})")
@@ -146,42 +844,454 @@ def build_query(args: argparse.Namespace) -> Tuple[str, List[Any]]:
     return query, params
 
 
+def build_page_query(
+    args: argparse.Namespace, lower: Any = None, upper: Any = None, after: Any = None
+) -> Tuple[str, List[Any]]:
+    """Constructs the query of the next page of a key range, using keyset pagination.
+
+    Args:
+        args: Command-line arguments.
+        lower: Smallest key of the range. None for no lower bound.
+        upper: Key after the range. None for no upper bound.
+        after: Last key of the previous page. None for the first page.
+
+    Returns:
+        Tuple containing the SQL query string and a list of parameters.
+    """
+    key = f"[{args.page_by}]"
+    query = f"SELECT {select_list(args, args.page_by)} FROM [{args.table}]"
+    clauses, params = [], []
+
+    if after is not None:
+        clauses.append(f"{key} > ?")
+        params.append(after)
+    elif lower is not None:
+        clauses.append(f"{key} >= ?")
+        params.append(lower)
+
+    if upper is not None:
+        clauses.append(f"{key} < ?")
+        params.append(upper)
+
+    if args.where:
+        clauses.append(f"({args.where})")
+
+    if clauses:
+        query += f" WHERE {' AND '.join(clauses)}"
+
+    return BACKENDS[args.backend][2](f"{query} ORDER BY {key}", args.page_size), params
+
+
+def partition_bounds(conn_string: str, args: argparse.Namespace) -> List[Any]:
+    """Splits the keys of the table into ranges of about the same number of rows.
+
+    Args:
+        conn_string: Database connection string.
+        args: Command-line arguments.
+
+    Returns:
+        Smallest key of each range, in order.
+    """
+    where = f" WHERE ({args.where})" if args.where else ""
+    query = (
+        f"SELECT MIN([{args.page_by}]) FROM ("
+        f"SELECT [{args.page_by}], NTILE(?) OVER (ORDER BY [{args.page_by}]) AS [partition] FROM [{args.table}]{where}"
+        f") AS [keys] GROUP BY [partition] ORDER BY MIN([{args.page_by}])"
+    )
+    with closing(connect(conn_string)) as conn, closing(conn.cursor()) as cursor:
+        cursor.execute(query, [args.partitions])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def export_key(args: argparse.Namespace) -> Dict[str, Any]:
+    """Describes the export a checkpoint belongs to.
+
+    Args:
+        args: Command-line arguments.
+
+    Returns:
+        Everything that changes which rows are exported and how.
+    """
+    return {
+        "table": args.table,
+        "columns": args.columns,
+        "where": args.where,
+        "page_by": args.page_by,
+        "partitions": args.partitions,
+        "output_format": output_format_of(args.output) if args.output_format is None else args.output_format,
+    }
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Writes the export state atomically, so an interrupted write never leaves a broken checkpoint.
+
+    Args:
+        path: Checkpoint file.
+        state: Export state.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _export_partition(
+    conn_string: str, args: argparse.Namespace, state: Dict[str, Any], index: int, checkpoint: str, lock: threading.Lock
+) -> None:
+    """Exports the remaining pages of one key range to its part file, saving the checkpoint after each page.
+
+    Rows written after the last checkpoint, e.g. by an interrupted run, are discarded before resuming.
+
+    Args:
+        conn_string: Database connection string.
+        args: Command-line arguments.
+        state: Export state; the entry of this range is updated in place.
+        index: Index of the range.
+        checkpoint: Checkpoint file.
+        lock: Lock guarding state and the checkpoint file.
+    """
+    part = state["parts"][index]
+    part_path = f"{args.output}.part{index}"
+    if part["offset"] and (not os.path.exists(part_path) or os.path.getsize(part_path) < part["offset"]):
+        raise ValueError(f"Part file {part_path} lacks rows recorded in the checkpoint. Remove it to start over.")
+    if os.path.exists(part_path):
+        os.truncate(part_path, part["offset"])
+
+    with closing(connect(conn_string)) as conn, open(part_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        while not part["done"]:
+            query, params = build_page_query(args, part["lower"], part["upper"], part["after"])
+            with closing(conn.cursor()) as cursor:
+                cursor.execute(query, params)
+                columns = [col[0] for col in cursor.description]
+                rows = cursor.fetchall()
+
+            key = next(i for i, c in enumerate(columns) if c.lower() == args.page_by.lower())
+            if index == 0 and part["offset"] == 0:
+                writer.writerow(columns)
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+            with lock:
+                part["offset"] = os.fstat(f.fileno()).st_size
+                part["rows"] += len(rows)
+                part["done"] = len(rows) < args.page_size
+                if rows:
+                    part["after"] = rows[-1][key]
+                save_checkpoint(checkpoint, state)
+            logger.debug("Exported %d rows of key range %d", part["rows"], index)
+
+
+def export_table(conn_string: str, args: argparse.Namespace) -> int:
+    """Exports a table page by page, resuming from the checkpoint of an interrupted export.
+
+    Each key range is written to its own part file, and the parts are joined into the output once all are done.
+
+    Args:
+        conn_string: Database connection string.
+        args: Command-line arguments.
+
+    Returns:
+        Number of rows written to the output file.
+
+    Raises:
+        ValueError: If the options cannot be exported page by page, or the checkpoint belongs to another export.
+    """
+    if args.filter_values:
+        raise ValueError("--page-by cannot be combined with --filter-values.")
+    if args.page_size < 1 or args.partitions < 1:
+        raise ValueError("--page-size and --partitions must be at least 1.")
+
+    key = export_key(args)
+    if key["output_format"] not in ("csv", "csv.gz"):
+        raise ValueError("Resumable exports can only be written as csv or csv.gz.")
+
+    checkpoint = args.checkpoint or f"{args.output}.checkpoint.json"
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            state = json.load(f)
+        if state["export"] != key:
+            raise ValueError(f"Checkpoint {checkpoint} belongs to another export. Remove it to start over.")
+        done = sum(part["rows"] for part in state["parts"])
+        logger.info("Resuming export of %s from %s after %d rows", args.table, checkpoint, done)
+    else:
+        bounds = partition_bounds(conn_string, args) if args.partitions > 1 else []
+        # The first range has no lower bound and the last none upper bound, so no key is left out
+        lowers = [None, *bounds[1:]]
+        uppers = [*bounds[1:], None]
+        parts = [
+            {"lower": lower, "upper": upper, "after": None, "rows": 0, "offset": 0, "done": False}
+            for lower, upper in zip(lowers, uppers)
+        ]
+        state = {"export": key, "parts": parts}
+        save_checkpoint(checkpoint, state)
+        logger.info("Exporting %s in %d key ranges of pages of %d rows", args.table, len(parts), args.page_size)
+
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=len(state["parts"])) as pool:
+        futures = [
+            pool.submit(_export_partition, conn_string, args, state, i, checkpoint, lock)
+            for i in range(len(state["parts"]))
+        ]
+        for future in futures:
+            future.result()
+
+    part_paths = [f"{args.output}.part{i}" for i in range(len(state["parts"]))]
+    if key["output_format"] == "csv.gz":
+        with gzip.open(args.output, "wb") as out:
+            for part_path in part_paths:
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+    else:
+        with open(part_paths[0], "ab") as out:
+            for part_path in part_paths[1:]:
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(part_paths[0], args.output)
+
+    for path in [checkpoint, *part_paths]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    return sum(part["rows"] for part in state["parts"])
+
+
+def run_query(
+    conn_string: Optional[str],
+    args: argparse.Namespace,
+    fetch: Optional[Callable[[List[Tuple[str, List[Any]]]], Iterable[Tuple[List[str], Iterable[List[Any]]]]]] = None,
+) -> int:
+    """Runs a query, through the cache if one is set, writes its results and checks for missing filter values.
+
+    Args:
+        conn_string: Database connection string. None when offline.
+        args: Command-line arguments, or the arguments of one manifest query.
+        fetch: Runs queries and yields their column names and batches of rows. Default: fetch_results on
+            --connections new connections.
+
+    Returns:
+        Number of rows written to the output file.
+
+    Raises:
+        ValueError: If offline without filter values or a readable cache, or offline with Parquet output.
+    """
+    if fetch is None:
+
+        def fetch(queries: List[Tuple[str, List[Any]]]) -> Iterator[Tuple[List[str], Iterable[List[Any]]]]:
+            return fetch_results(conn_string, queries, args.connections, args.arraysize)
+
+    # Cached rows are stored as JSON text, which keeps the values of CSV output but not the column types of Parquet
+    output_format = args.output_format or output_format_of(args.output)
+    if args.offline and output_format == "parquet":
+        raise ValueError("Offline mode cannot write Parquet output, as cached rows do not keep column types.")
+    use_cache = args.cache and args.filter_values
+    if use_cache and output_format == "parquet":
+        logger.info("The cache is not used for Parquet output, as cached rows do not keep column types.")
+        use_cache = False
+
+    cache = open_metadata_cache(args.cache) if use_cache else None
+    if args.offline and cache is None:
+        raise ValueError("Offline mode requires filter values and a readable cache.")
+
+    # An output with only a header is still written when nothing is found, e.g. offline without cache hits
+    filter_col = args.filter_col if args.filter_values else None
+    empty_columns = [c for c in selected_columns(args, args.filter_col) if c != "*"] or [args.filter_col]
+    if cache is not None:
+        try:
+            results = cached_results(fetch, args, cache)
+            row_count, seen = write_results(results, args.output, output_format, filter_col, empty_columns)
+        finally:
+            cache.close()
+    else:
+        if args.filter_values:
+            chunks = chunk_values(args.filter_values, args.chunk_size)
+            queries = [build_query(args, chunk) for chunk in chunks]
+            logger.info("Querying %d filter values in %d chunks", sum(map(len, chunks)), len(chunks))
+        else:
+            queries = [build_query(args)]
+        row_count, seen = write_results(fetch(queries), args.output, output_format, filter_col, empty_columns)
+
+    # Integrity check: if filter-values were provided, check for missing values
+    if args.filter_values:
+        if seen is None:
+            logger.warning("Integrity check failed: filter column %s is not in the results", args.filter_col)
+        else:
+            missing = [value for value in dict.fromkeys(args.filter_values) if value not in seen]
+            if missing:
+                logger.warning("The following filter values were not found: %s", ", ".join(missing))
+
+    if row_count == 0:
+        logger.info("No results found.")
+    else:
+        logger.info("Successfully saved %d rows to %s", row_count, args.output)
+
+    return row_count
+
+
+def read_query_manifest(path: str, args: argparse.Namespace) -> List[argparse.Namespace]:
+    """Reads a batch manifest into the arguments of each query.
+
+    Args:
+        path: JSON manifest, or YAML if it ends in .yaml or .yml. Either a list of queries or a mapping with a
+            'queries' list.
+        args: Command-line arguments, used for keys a query leaves out.
+
+    Returns:
+        Arguments of each query.
+
+    Raises:
+        ValueError: If the manifest is malformed, or two queries write the same output.
+        ImportError: If the manifest is YAML and pyyaml is not installed.
+    """
+    with open(path) as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("'pyyaml' is required to read YAML manifests. Please install it.") from None
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if isinstance(manifest, dict):
+        manifest = manifest.get("queries")
+    if not isinstance(manifest, list) or not manifest:
+        raise ValueError(f"Manifest {path} must contain a list of queries.")
+
+    queries = []
+    for i, entry in enumerate(manifest, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Query {i} of {path} is not a mapping.")
+        entry = {key.replace("-", "_"): value for key, value in entry.items()}
+        unknown = sorted(set(entry) - set(MANIFEST_KEYS))
+        if unknown:
+            raise ValueError(f"Query {i} of {path} has unknown keys: {', '.join(unknown)}")
+        if not entry.get("output"):
+            raise ValueError(f"Query {i} of {path} has no output.")
+        for key in ("columns", "filter_values"):
+            if isinstance(entry.get(key), str):
+                entry[key] = [entry[key]]
+        if entry.get("filter_values"):
+            entry["filter_values"] = [str(value) for value in entry["filter_values"]]
+
+        query_args = argparse.Namespace(**{**vars(args), "name": entry["output"], **entry})
+        query_args.output = str(query_args.output)
+        queries.append(query_args)
+
+    outputs = [query_args.output for query_args in queries]
+    duplicates = sorted({output for output in outputs if outputs.count(output) > 1})
+    if duplicates:
+        raise ValueError(f"Several queries of {path} write to: {', '.join(duplicates)}")
+
+    return queries
+
+
+def _run_manifest_query(conn_string: Optional[str], args: argparse.Namespace) -> Tuple[int, float]:
+    """Runs one manifest query on the connection of the current worker thread.
+
+    Args:
+        conn_string: Database connection string. None when offline.
+        args: Arguments of the query.
+
+    Returns:
+        Number of rows written and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    row_count = run_query(conn_string, args, lambda queries: _stream_on_thread_connection(queries, args.arraysize))
+    return row_count, time.perf_counter() - start
+
+
+def run_manifest(conn_string: Optional[str], args: argparse.Namespace) -> int:
+    """Runs all queries of a batch manifest on a shared pool of connections and prints their timings.
+
+    Each worker thread opens one connection and runs whole queries on it, one after another, so the connections
+    are only logged into once for the whole batch. A failing query does not stop the others.
+
+    Args:
+        conn_string: Database connection string. None when offline.
+        args: Command-line arguments.
+
+    Returns:
+        Number of failed queries.
+    """
+    queries = read_query_manifest(args.manifest, args)
+    for query_args in queries:
+        if query_args.page_by:
+            raise ValueError("Resumable exports (--page-by) cannot be run from a manifest.")
+
+    workers = max(1, min(args.connections, len(queries)))
+    logger.info("Running %d queries of %s on %d connections", len(queries), args.manifest, workers)
+    opened: List[Any] = []
+    summary = []
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            initializer=_open_thread_connection if conn_string else None,
+            initargs=(conn_string, opened, threading.Lock()) if conn_string else (),
+        ) as pool:
+            futures = [pool.submit(_run_manifest_query, conn_string, query_args) for query_args in queries]
+            for query_args, future in zip(queries, futures):
+                try:
+                    row_count, seconds = future.result()
+                    summary.append((query_args.name, str(row_count), f"{seconds:.2f}", query_args.output))
+                except Exception as e:
+                    logger.error("Query %s failed: %s", query_args.name, e)
+                    summary.append((query_args.name, "failed", "-", str(e)))
+    finally:
+        for conn in opened:
+            conn.close()
+
+    widths = [max(len(row[i]) for row in [("query", "rows", "seconds", "output"), *summary]) for i in range(3)]
+    for row in [("query", "rows", "seconds", "output"), *summary]:
+        print(f"{row[0]:<{widths[0]}}  {row[1]:>{widths[1]}}  {row[2]:>{widths[2]}}  {row[3]}")
+    print(f"Total {time.perf_counter() - start:.2f}s")
+
+    return sum(row[1] == "failed" for row in summary)
+
+
 def main() -> None:
     """Main function to parse arguments, build query, execute it, and handle results."""
     args = parse_args()
     try:
-        conn_string = build_connection_string(
-            server=args.server,
-            database=args.database,
-            username=args.username,
-            password=args.password,
-        )
-        logger.debug("Database connection string built.")
+        if args.offline and not args.cache:
+            raise ValueError("Offline mode requires a cache (--cache or $COPATHBI_CACHE).")
+
+        conn_string = None
+        if not args.offline:
+            conn_string = build_connection_string(
+                server=args.server,
+                database=args.database,
+                username=args.username,
+                password=args.password,
+                backend=args.backend,
+            )
+            logger.debug("Database connection string built.")
 
         if args.list_columns:
+            if conn_string is None:
+                raise ValueError("Listing columns requires the database.")
             columns = get_table_columns(conn_string, args.table)
             print("\n".join(columns))
             return
 
-        query, params = build_query(args)
-        row_count = execute_and_stream_to_csv(conn_string, query, args.output, params)
+        if args.manifest:
+            failed = run_manifest(conn_string, args)
+            if failed:
+                raise ValueError(f"{failed} queries of {args.manifest} failed.")
+            return
 
-        # Integrity check: if filter-values were provided, check for missing values
-        if args.filter_values:
-            try:
-                with open(args.output, newline="", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    found = set(row[args.filter_col] for row in reader)
-                missing = set(args.filter_values) - found
-                if missing:
-                    logger.warning("The following filter values were not found: %s", ", ".join(missing))
-            except Exception as e:
-                logger.warning("Integrity check failed: %s", e)
-
-        if row_count == 0:
-            logger.info("No results found.")
-        else:
-            logger.info("Successfully saved %d rows to %s", row_count, args.output)
+        if args.page_by:
+            if conn_string is None:
+                raise ValueError("Exporting a table requires the database.")
+            row_count = export_table(conn_string, args)
+            logger.info("Successfully exported %d rows to %s", row_count, args.output)
+            return
+
+        run_query(conn_string, args)
 
     except Exception as e:
         logger.error("Error: %s", e)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+from lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Convert an xlsx, csv or tsv spreadsheet to csv.")
+    parser.add_argument("-i", "--input", required=True, help="Spreadsheet to convert.")
+    parser.add_argument("-o", "--output", required=True, help="Output csv file.")
+    parser.add_argument("-s", "--sheet", help="Worksheet to read from an xlsx file. Default: first worksheet.")
+    parser.add_argument("-c", "--columns", nargs="+", help="Only keep these columns. Default: all columns.")
+    parser.add_argument(
+        "-t",
+        "--title-prefix",
+        help="Treat the first row as a title and read the header from the second row when its first cell starts "
+        "with this text, e.g. 'Run'.",
+    )
+
+    return parser.parse_args()
+
+
+def header_names(row: tuple) -> List[str]:
+    """
+    Name header cells the way pandas does: blank cells become 'Unnamed: <index>' and repeated names get a
+    '.<count>' suffix.
+
+    Args:
+        row: Header row values.
+
+    Returns:
+        Column names.
+    """
+    names: List[str] = []
+    counts: Dict[str, int] = {}
+    for idx, value in enumerate(row):
+        name = f"Unnamed: {idx}" if value is None or str(value).strip() == "" else str(value)
+        if name in counts:
+            counts[name] += 1
+            name = f"{name}.{counts[name]}"
+        else:
+            counts[name] = 0
+        names.append(name)
+
+    return names
+
+
+def iter_xlsx_rows(path: str, sheet_name: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Stream the cell values of a worksheet row by row without loading styles or the whole sheet.
+
+    Args:
+        path: xlsx file.
+        sheet_name: Worksheet to read. Default: first worksheet.
+
+    Yields:
+        Tuple of cell values for each row.
+
+    Raises:
+        ValueError: If the worksheet does not exist.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        sys.exit("Error: 'openpyxl' is required to read Excel files. Please install it.")
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            worksheet = workbook.worksheets[0]
+        elif sheet_name in workbook.sheetnames:
+            worksheet = workbook[sheet_name]
+        else:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found in {path}")
+
+        yield from worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_xlsx(
+    path: str,
+    columns: Optional[List[str]] = None,
+    sheet_name: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read a worksheet in a single streaming pass, keeping only the requested columns.
+
+    Args:
+        path: xlsx file.
+        columns: Columns to keep. Default: all columns.
+        sheet_name: Worksheet to read. Default: first worksheet.
+        title_prefix: Read the header from the second row if the first cell of the first row starts with this text.
+
+    Returns:
+        DataFrame of the worksheet.
+    """
+    rows = iter_xlsx_rows(path, sheet_name)
+
+    header = next(rows, None)
+    if header is not None and title_prefix and str(header[0] or "").startswith(title_prefix):
+        header = next(rows, None)
+    if header is None:
+        return pd.DataFrame(columns=columns)
+
+    names = header_names(header)
+    keep = [idx for idx, name in enumerate(names) if columns is None or name in columns]
+    data: List[List[Any]] = [[] for _ in keep]
+
+    # Blank rows are buffered so that trailing blank rows are dropped like pandas does
+    blank_rows = 0
+    for row in rows:
+        if all(value is None for value in row):
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            for values in data:
+                values.append(None)
+        blank_rows = 0
+        for values, idx in zip(data, keep):
+            values.append(row[idx] if idx < len(row) else None)
+
+    df = pd.DataFrame({names[idx]: values for idx, values in zip(keep, data)})
+
+    # Match pandas' parsing of cell values: numbers with blanks become float columns and empty columns are NaN
+    for name in df.columns:
+        if df[name].isna().all():
+            df[name] = df[name].astype("float64")
+        elif df[name].dtype == object:
+            df[name] = df[name].infer_objects()
+
+    return df
+
+
+def read_spreadsheet(
+    path: str,
+    columns: Optional[List[str]] = None,
+    sheet_name: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read an xlsx, csv or tsv spreadsheet, only materializing the requested columns.
+
+    Args:
+        path: Spreadsheet file.
+        columns: Columns to keep. Default: all columns.
+        sheet_name: Worksheet to read from an xlsx file. Default: first worksheet.
+        title_prefix: Read the header from the second row if the first cell of the first row starts with this text.
+
+    Returns:
+        DataFrame of the spreadsheet.
+
+    Raises:
+        ValueError: If the file extension is not supported or the worksheet does not exist.
+    """
+    if path.endswith(".xlsx"):
+        return read_xlsx(path, columns, sheet_name, title_prefix)
+
+    if path.endswith(".tsv"):
+        sep = "\t"
+    elif path.endswith(".csv"):
+        sep = ","
+    else:
+        raise ValueError(f"Unsupported spreadsheet format: {path}")
+
+    usecols = None if columns is None else lambda name: name in columns
+    if title_prefix:
+        first_line = pd.read_csv(path, sep=sep, header=None, nrows=1)
+        if str(first_line.iloc[0, 0]).startswith(title_prefix):
+            return pd.read_csv(path, sep=sep, skiprows=1, usecols=usecols)
+
+    return pd.read_csv(path, sep=sep, usecols=usecols)
+
+
+def main() -> None:
+    """
+    Convert a spreadsheet to csv.
+    """
+    args = parse_args()
+
+    try:
+        df = read_spreadsheet(args.input, args.columns, args.sheet, args.title_prefix)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    df.to_csv(args.output, index=False)
+    logger.info("Saved %d rows of %s to %s", len(df), os.path.basename(args.input), args.output)
+
+
+if __name__ == "__main__":
+    main()
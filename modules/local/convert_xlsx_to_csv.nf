@@ -17,52 +17,30 @@ process CONVERT_XLSX_TO_CSV {
     script:
     def prefix = task.ext.prefix
     """
-    #!/usr/bin/env python3
-
-    import platform
-    import subprocess
-    import pandas as pd
-
-    batch = pd.read_excel(
-        "${spreadsheet}".replace("\\\\", ""),
-        engine="openpyxl",
-        skiprows=1
-        if pd.read_excel("${spreadsheet}", nrows=1, engine="openpyxl")
-        .columns[0]
-        .startswith("Run")
-        else 0,
-    )
-    batch.to_csv("${prefix.id}.csv", index=False)
-
-    # Output version information
-    with open("versions.yml", "w") as f:
-        f.write(f'"{subprocess.getoutput("echo ${task.process}")}":\\n')
-        f.write(f"    python: {platform.python_version()}\\n")
+    # Skip the 'Run' title row above the header when present
+    read_spreadsheet.py \\
+        --input "${spreadsheet}" \\
+        --output ${prefix.id}.csv \\
+        --title-prefix Run
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
     """
 
     stub:
     def prefix = task.ext.prefix
     """
-    #!/usr/bin/env python3
-
-    import platform
-    import subprocess
-    import pandas as pd
-
-    batch = pd.read_excel(
-        "${spreadsheet}".replace("\\\\", ""),
-        engine="openpyxl",
-        skiprows=1
-        if pd.read_excel("${spreadsheet}", nrows=1, engine="openpyxl")
-        .columns[0]
-        .startswith("Run")
-        else 0,
-    )
-    batch.to_csv("${prefix.id}.csv", index=False)
-
-    # Output version information
-    with open("versions.yml", "w") as f:
-        f.write(f'"{subprocess.getoutput("echo ${task.process}")}":\\n')
-        f.write(f"    python: {platform.python_version()}\\n")
+    # Skip the 'Run' title row above the header when present
+    read_spreadsheet.py \\
+        --input "${spreadsheet}" \\
+        --output ${prefix.id}.csv \\
+        --title-prefix Run
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
     """
 }
@@ -9,6 +9,7 @@ process CREATE_DEMULTIPLEX_SAMPLESHEET {
 
     output:
     tuple val(flowcell), path("*demux_samplesheet.csv"), emit: samplesheet
+    tuple val(flowcell), path("*demux_lanes.csv")      , emit: lanes
     path("*runinfo.csv")                               , emit: runinfo
     path("versions.yml")                               , emit: versions
 
@@ -16,10 +17,12 @@ process CREATE_DEMULTIPLEX_SAMPLESHEET {
     task.ext.when == null || task.ext.when
 
     script:
+    def split_lanes = params.demux_split_lanes ? "--split_lanes ${params.demux_lane_groups ?: ''}" : ""
     """
     prepare_dragen_demux.py \\
         -r ${illumina_run_dir} \\
-        -s ${samplesheet}
+        -s ${samplesheet} \\
+        ${split_lanes}
 
     cat <<-END_VERSIONS > versions.yml
     "${task.process}":
@@ -32,6 +35,8 @@ process CREATE_DEMULTIPLEX_SAMPLESHEET {
     touch ${flowcell}.runinfo.csv \\
         ${flowcell}.demux_samplesheet.csv
 
+    printf "lanes,samplesheet,samples\\n,${flowcell}.demux_samplesheet.csv,0\\n" > ${flowcell}.demux_lanes.csv
+
     cat <<-END_VERSIONS > versions.yml
     "${task.process}":
         python: \$(python --version 2>&1 | awk '{print \$2}')
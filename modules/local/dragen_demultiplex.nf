@@ -1,5 +1,5 @@
 process DRAGEN_DEMULTIPLEX {
-    tag "${task.ext.prefix.id}"
+    tag "${task.ext.prefix.id}${meta.lanes ? " lanes ${meta.lanes}" : ''}"
     label 'dragen'
 
     container "${ ['awsbatch'].any{ workflow.profile.contains(it) }
@@ -10,9 +10,9 @@ process DRAGEN_DEMULTIPLEX {
     tuple val(meta), path(samplesheet), path(illumina_run_dir)
 
     output:
-    path("fastq_list.scratch.csv") , emit: fastq_list
-    path("${task.ext.prefix.id}/*"), emit: demux_files
-    path("versions.yml")           , emit: versions
+    tuple val(meta), path("fastq_list.scratch.csv"), emit: fastq_list
+    path("${task.ext.prefix.id}/*")                , emit: demux_files
+    path("versions.yml")                           , emit: versions
 
     when:
     task.ext.when == null || task.ext.when
@@ -21,16 +21,45 @@ process DRAGEN_DEMULTIPLEX {
     def prefix     = task.ext.prefix
     def exe_path   = ['awsbatch'].any{ workflow.profile.contains(it) } ? "/opt/edico"             : "/opt/dragen/4.3.6"
     def first_tile = params.bcl_first_tile                             ? "--first-tile-only true" : ""
+    def lanes      = meta.lanes ? meta.lanes.tokenize(',') : []
+    def only_lane  = lanes.size() == 1                                 ? "--bcl-only-lane ${lanes[0]}" : ""
     """
     # Perform demultiplexing of samples
-    ${exe_path}/bin/dragen \\
-        --bcl-conversion-only true \\
-        --bcl-only-matched-reads true \\
-        ${first_tile} \\
-        --strict-mode true \\
-        --sample-sheet ${samplesheet} \\
-        --bcl-input-directory ${illumina_run_dir} \\
-        --output-directory "${prefix.id}"
+    if [[ ${lanes.size()} -gt 1 ]]; then
+        # '--bcl-only-lane' takes a single lane, so convert each lane of the group on its own
+        mkdir "${prefix.id}" "${prefix.id}/Reports"
+        for lane in ${lanes.join(' ')}; do
+            ${exe_path}/bin/dragen \\
+                --bcl-conversion-only true \\
+                --bcl-only-matched-reads true \\
+                ${first_tile} \\
+                --bcl-only-lane \${lane} \\
+                --strict-mode true \\
+                --sample-sheet ${samplesheet} \\
+                --bcl-input-directory ${illumina_run_dir} \\
+                --output-directory "lane_\${lane}"
+
+            # Gather the FastQ files of all lanes, and keep the logs and reports of each lane apart
+            find "lane_\${lane}" -maxdepth 1 -name "*.fastq.gz" -exec mv -t "${prefix.id}/" {} +
+            sed \\
+                -i "s|lane_\${lane}/|${prefix.id}/|g" \\
+                "lane_\${lane}/Reports/fastq_list.csv"
+            mv "lane_\${lane}" "${prefix.id}/L\${lane}"
+        done
+
+        awk 'FNR > 1 || NR == 1' ${lanes.collect{ "\"${prefix.id}/L${it}/Reports/fastq_list.csv\"" }.join(' ')} \\
+            > "${prefix.id}/Reports/fastq_list.csv"
+    else
+        ${exe_path}/bin/dragen \\
+            --bcl-conversion-only true \\
+            --bcl-only-matched-reads true \\
+            ${first_tile} \\
+            ${only_lane} \\
+            --strict-mode true \\
+            --sample-sheet ${samplesheet} \\
+            --bcl-input-directory ${illumina_run_dir} \\
+            --output-directory "${prefix.id}"
+    fi
 
     # Update fastq_list.csv with new paths
     sed \\
@@ -60,19 +89,36 @@ process DRAGEN_DEMULTIPLEX {
     def prefix     = task.ext.prefix
     def exe_path   = ['awsbatch'].any{ workflow.profile.contains(it) } ? "/opt/edico"             : "/opt/dragen/4.3.6"
     def first_tile = params.bcl_first_tile                             ? "--first-tile-only true" : ""
+    def lanes      = meta.lanes ? meta.lanes.tokenize(',') : []
+    def only_lane  = lanes.size() == 1                                 ? "--bcl-only-lane ${lanes[0]}" : ""
     """
     cp -r ${projectDir}/assets/stub/demux_fastq "${prefix.id}"
     cp "${prefix.id}/Reports/fastq_list.csv" fastq_list.scratch.csv
 
     cat <<-END_CMDS > "${prefix.id}_cmds.txt"
-    ${exe_path}/bin/dragen \\
-        --bcl-conversion-only true \\
-        --bcl-only-matched-reads true \\
-        ${first_tile} \\
-        --strict-mode true \\
-        --sample-sheet ${samplesheet} \\
-        --bcl-input-directory ${illumina_run_dir} \\
-        --output-directory "${prefix.id}"
+    if [[ ${lanes.size()} -gt 1 ]]; then
+        for lane in ${lanes.join(' ')}; do
+            ${exe_path}/bin/dragen \\
+                --bcl-conversion-only true \\
+                --bcl-only-matched-reads true \\
+                ${first_tile} \\
+                --bcl-only-lane \\\${lane} \\
+                --strict-mode true \\
+                --sample-sheet ${samplesheet} \\
+                --bcl-input-directory ${illumina_run_dir} \\
+                --output-directory "lane_\\\${lane}"
+        done
+    else
+        ${exe_path}/bin/dragen \\
+            --bcl-conversion-only true \\
+            --bcl-only-matched-reads true \\
+            ${first_tile} \\
+            ${only_lane} \\
+            --strict-mode true \\
+            --sample-sheet ${samplesheet} \\
+            --bcl-input-directory ${illumina_run_dir} \\
+            --output-directory "${prefix.id}"
+    fi
     END_CMDS
 
     cat <<-END_VERSIONS > versions.yml
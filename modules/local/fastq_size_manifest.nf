@@ -0,0 +1,45 @@
+process FASTQ_SIZE_MANIFEST {
+    label 'process_low'
+
+    container "ghcr.io/dhslab/docker-python3:231224"
+
+    input:
+    path(fastq_list)
+
+    output:
+    path("fastq_sizes.csv"), emit: manifest
+    path("versions.yml")   , emit: versions
+
+    when:
+    task.ext.when == null || task.ext.when
+
+    script:
+    def min_size = params.validation_samples ? 0 : params.min_fastq_size
+    """
+    # Check the minimum size of every FastQ file and total them per sample
+    fastq_size_manifest.py \\
+        --fastq-list ${fastq_list} \\
+        --output fastq_sizes.csv \\
+        --min-size ${min_size}
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
+    """
+
+    stub:
+    def min_size = params.validation_samples ? 0 : params.min_fastq_size
+    """
+    # Check the minimum size of every FastQ file and total them per sample
+    fastq_size_manifest.py \\
+        --fastq-list ${fastq_list} \\
+        --output fastq_sizes.csv \\
+        --min-size ${min_size}
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
+    """
+}
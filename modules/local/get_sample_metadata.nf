@@ -18,12 +18,16 @@ process GET_SAMPLE_METADATA {
     script:
     def prefix  = task.ext.prefix
     def samples = "--filter-values ${sample_names.collect{ "'${it}'" }.join(' ')}"
+    def cache   = params.metadata_cache ? "--cache ${params.metadata_cache}" : ""
+    def offline = params.metadata_offline ? "--offline" : ""
     """
     query_database.py \
         --columns Sex \
         --filter-col SpcNum \
         --output "${prefix.id}.csv" \
         --table FranklinOrder \
+        ${cache} \
+        ${offline} \
         ${samples}
 
     cat <<-END_VERSIONS > versions.yml
@@ -20,25 +20,18 @@ process PARSE_QC_METRICS {
     script:
     def prefix        = task.ext.prefix
     def mgi_worksheet = samplesheet ? "--mgi_worksheet ${samplesheet.join(' ')}" : ""
+    def cache         = params.qc_metrics_cache ? "--cache ${params.qc_metrics_cache}" : "--no-cache"
+    def warehouse     = params.qc_warehouse ? "--warehouse ${params.qc_warehouse}" : ""
     """
-    # Remove single sample metrics if joint called metrics
-    if [[ -d joint_sample_metrics ]]; then
-        find -L joint_sample_metrics \\
-            -type f \\
-            -exec basename "{}" \\; \\
-            | while read file; do
-                if [[ -f "single_sample_metrics/\${file}" ]]; then
-                    rm "single_sample_metrics/\${file}"
-                fi
-            done
-    fi
-
-    # Create metric summary files
+    # Create metric summary files, joint called metrics take precedence over single sample metrics
     parse_qc_metrics.py \\
         ${mgi_worksheet} \\
-        --inputdir \$PWD \\
+        --inputdir joint_sample_metrics single_sample_metrics \\
         --outdir \$PWD \\
-        --prefix ${prefix.id}
+        --prefix ${prefix.id} \\
+        --workers ${task.cpus} \\
+        ${cache} \\
+        ${warehouse}
 
     cat <<-END_VERSIONS > versions.yml
     "${task.process}":
@@ -49,25 +42,18 @@ process PARSE_QC_METRICS {
     stub:
     def prefix        = task.ext.prefix
     def mgi_worksheet = samplesheet ? "--mgi_worksheet ${samplesheet.join(' ')}" : ""
+    def cache         = params.qc_metrics_cache ? "--cache ${params.qc_metrics_cache}" : "--no-cache"
+    def warehouse     = params.qc_warehouse ? "--warehouse ${params.qc_warehouse}" : ""
     """
-    # Remove single sample metrics if joint called metrics
-    if [[ -d joint_sample_metrics ]]; then
-        find -L joint_sample_metrics \\
-            -type f \\
-            -exec basename "{}" \\; \\
-            | while read file; do
-                if [[ -f "single_sample_metrics/\${file}" ]]; then
-                    rm "single_sample_metrics/\${file}"
-                fi
-            done
-    fi
-
-    # Create metric summary files
+    # Create metric summary files, joint called metrics take precedence over single sample metrics
     parse_qc_metrics.py \\
         ${mgi_worksheet} \\
-        --inputdir \$PWD \\
+        --inputdir joint_sample_metrics single_sample_metrics \\
         --outdir \$PWD \\
-        --prefix ${prefix.id}
+        --prefix ${prefix.id} \\
+        --workers ${task.cpus} \\
+        ${cache} \\
+        ${warehouse}
 
     cat <<-END_VERSIONS > versions.yml
     "${task.process}":
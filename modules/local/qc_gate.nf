@@ -0,0 +1,49 @@
+process QC_GATE {
+    tag "${task.ext.prefix.id}"
+    label 'process_low'
+
+    container 'dockerreg01.accounts.ad.wustl.edu/cgl/pandas-excel@sha256:1958093220d5785115b73f69e0894b366f75fac646131e5394972ae68d9e4202'
+
+    input:
+    path(single_sample_metrics), stageAs: "single_sample_metrics/"
+    path(qc_thresholds)
+
+    output:
+    path("*_QC_gate.csv"), emit: manifest
+    path("versions.yml") , emit: versions
+
+    when:
+    task.ext.when == null || task.ext.when
+
+    script:
+    def prefix = task.ext.prefix
+    """
+    # Check QC metrics of each sample against the QC thresholds
+    qc_gate.py \\
+        --inputdir single_sample_metrics \\
+        --thresholds ${qc_thresholds} \\
+        --output ${prefix.id}_QC_gate.csv \\
+        --workers ${task.cpus}
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
+    """
+
+    stub:
+    def prefix = task.ext.prefix
+    """
+    # Check QC metrics of each sample against the QC thresholds
+    qc_gate.py \\
+        --inputdir single_sample_metrics \\
+        --thresholds ${qc_thresholds} \\
+        --output ${prefix.id}_QC_gate.csv \\
+        --workers ${task.cpus}
+
+    cat <<-END_VERSIONS > versions.yml
+    "${task.process}":
+        python: \$(python3 --version 2>&1 | awk '{print \$2}')
+    END_VERSIONS
+    """
+}
@@ -139,26 +139,52 @@ workflow DEMULTIPLEX {
                                     .unique()
                                     .count()
 
+    // Scatter each flowcell over the samplesheets in its lane manifest:
+    // [ val(flowcell), val(lanes), path(samplesheet), val(number of samplesheets of the flowcell) ]
+    ch_demux_samplesheets = CREATE_DEMULTIPLEX_SAMPLESHEET.out.samplesheet
+                                .join(CREATE_DEMULTIPLEX_SAMPLESHEET.out.lanes, by: 0)
+                                .flatMap{
+                                    flowcell, samplesheets, lanes ->
+                                        def samplesheet_by_name = [ samplesheets ].flatten().collectEntries{ [ it.name, it ] }
+                                        def rows = lanes.splitCsv(header: true, quote: '"')
+                                        rows.collect{ row ->
+                                            [ flowcell, params.demux_split_lanes ? row.lanes : '', samplesheet_by_name[row.samplesheet], rows.size() ]
+                                        }
+                                }
+
     //
     // MODULE: Demultiplex samples
     //
     DRAGEN_DEMULTIPLEX (
-        CREATE_DEMULTIPLEX_SAMPLESHEET.out.samplesheet
-            .join(ch_demux_data.map{ flowcell, samplesheet, rundir -> [ flowcell, rundir ] }, by: 0)
+        ch_demux_samplesheets
+            .combine(ch_demux_data.map{ flowcell, samplesheet, rundir -> [ flowcell, rundir ] }, by: 0)
             .combine(ch_demux_flowcell_count)
-            .map{ flowcell, samplesheet, illumina_run_dir, flowcell_count ->
-                def meta = [ 'flowcell': flowcell_count > 1 ? flowcell : '' ]
+            .map{ flowcell, lanes, samplesheet, sheet_count, illumina_run_dir, flowcell_count ->
+                def meta = [ 'flowcell': flowcell_count > 1 ? flowcell : '', 'lanes': lanes, 'sheet_count': sheet_count ]
                 [ meta, samplesheet, illumina_run_dir ]
             }
     )
     ch_versions = ch_versions.mix(DRAGEN_DEMULTIPLEX.out.versions)
 
+    // Gather the FastQ lists of the lanes of each flowcell as soon as all of its samplesheets are demultiplexed
+    ch_demux_fastq_list = DRAGEN_DEMULTIPLEX.out.fastq_list
+                            .map{ meta, fastq_list -> [ groupKey(meta.flowcell, meta.sheet_count), [ meta.lanes, fastq_list ] ] }
+                            .groupTuple()
+                            .map{
+                                flowcell, lane_fastq_lists ->
+                                    def fastq_lists = lane_fastq_lists.sort{ it[0] }.collect{ it[1] }
+                                    def fastq_list = file("${workDir}/${[ flowcell.toString(), 'fastq_list.csv' ].findAll().join('_')}")
+                                    fastq_list.text = fastq_lists[0].readLines().first() + '\n' +
+                                        fastq_lists.collectMany{ it.readLines().drop(1) }.collect{ it + '\n' }.join('')
+                                    fastq_list
+                            }
+
     //
     // SUBWORKFLOW: Verify fastq_list.csv
     //
     VERIFY_FASTQ_LIST (
         [],
-        DRAGEN_DEMULTIPLEX.out.fastq_list,
+        ch_demux_fastq_list,
         Channel.empty()
     )
     ch_versions = ch_versions.mix(VERIFY_FASTQ_LIST.out.versions)
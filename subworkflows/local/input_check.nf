@@ -5,6 +5,7 @@
 */
 
 include { CONVERT_XLSX_TO_CSV } from '../../modules/local/convert_xlsx_to_csv'
+include { FASTQ_SIZE_MANIFEST } from '../../modules/local/fastq_size_manifest'
 include { UPDATE_SAMPLE_NAME  } from '../../modules/local/update_sample_name'
 
 /*
@@ -77,8 +78,8 @@ workflow INPUT_CHECK {
     ================================================================================
     */
 
-    ch_samples = ch_samples.mix(
-                    ch_fastq_list
+    // Resolve the FastQ files of every row once, here where remote and relative paths resolve
+    ch_fastq_rows = ch_fastq_list
                         .filter{ it != [] }
                         .flatMap{
                             def data = parseInputList(it)
@@ -88,30 +89,46 @@ workflow INPUT_CHECK {
                                     error("Missing required columns in input FastQ list!")
                                 }
 
-                                    def R1 = file(it['Read1File'], checkIfExists: true)
-                                    def R2 = file(it['Read2File'], checkIfExists: true)
+                                [ it, file(it['Read1File'], checkIfExists: true), file(it['Read2File'], checkIfExists: true) ]
+                            }
+                        }
 
-                                if (!params.validation_samples) {
-                                    def MIN_FASTQ_SIZE_BYTES = params.min_fastq_size * 1024 * 1024
-                                    if (R1.size() < MIN_FASTQ_SIZE_BYTES) {
-                                        error("FastQ file '${R1.name}' is ${R1.size()} bytes, less than ${params.min_fastq_size}MB minimum!")
-                                    }
-                                    if (R2.size() < MIN_FASTQ_SIZE_BYTES) {
-                                        error("FastQ file '${R2.name}' is ${R2.size()} bytes, less than ${params.min_fastq_size}MB minimum!")
-                                    }
-                                }
+    // The sizes are looked up here too, so the size manifest also works for remote FastQ files
+    ch_fastq_size_list = ch_fastq_rows
+                            .map{
+                                row, R1, R2 ->
+                                    [ row.RGID, row.RGSM, row.RGLB, row.Lane, R1.toUriString(), R2.toUriString(), R1.size(), R2.size() ].join(',')
+                            }
+                            .collectFile(
+                                name   : 'fastq_list.sizes.csv',
+                                seed   : 'RGID,RGSM,RGLB,Lane,Read1File,Read2File,Read1Size,Read2Size\n',
+                                newLine: true,
+                                sort   : 'index'
+                            )
+
+    // Check the minimum size of all FastQ files in one task and total them per sample
+    FASTQ_SIZE_MANIFEST (
+        ch_fastq_size_list
+    )
+    ch_versions = ch_versions.mix(FASTQ_SIZE_MANIFEST.out.versions)
+
+    ch_fastq_sizes = FASTQ_SIZE_MANIFEST.out.manifest
+                        .map{ [ it.splitCsv(header: true).collectEntries{ row -> [ row.RGSM, row ] } ] }
 
+    ch_samples = ch_samples.mix(
+                    ch_fastq_rows
+                        .map{
+                            row, R1, R2 ->
                                 def regexPattern = /\w\d{2}-\d+|\d*WCN-\d*CN\d*/
-                                def matcher = it.RGSM =~ regexPattern
-                                def acc = matcher.find() ? matcher.group(0) : it.RGSM
+                                def matcher = row.RGSM =~ regexPattern
+                                def acc = matcher.find() ? matcher.group(0) : row.RGSM
                                 def meta = [
-                                    'id'  : it.RGSM,
+                                    'id'  : row.RGSM,
                                     'acc' : acc,
-                                    'RGSM': it.RGSM
+                                    'RGSM': row.RGSM
                                 ]
 
                                 [ meta.acc, meta, [ R1, R2 ] ]
-                            }
                         }
                         .groupTuple()
                         .combine(
@@ -143,7 +160,15 @@ workflow INPUT_CHECK {
                                     name    : "updated_fastq_list.csv",
                                 )
                         )
-                        .map{ id, meta, reads, fastq_list -> [ meta[0], reads.flatten(), fastq_list, [] ] }
+                        .combine(ch_fastq_sizes)
+                        .map{
+                            id, meta, reads, fastq_list, sizes ->
+                                // Total FastQ size is used to start the largest samples first
+                                def meta_new = meta[0].clone()
+                                meta_new['fastq_bytes'] = (sizes[meta_new.RGSM]?.fastq_bytes ?: 0) as Long
+
+                                [ meta_new, reads.flatten(), fastq_list, [] ]
+                        }
                 )
 
     /*
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bin"))
+
+import prepare_dragen_demux as pdd  # noqa: E402
+
+# Samplesheet lines, written as csv files by the tests
+SAMPLESHEETS = {
+    "content_desc": [
+        "Lane,Content_Desc,Index",
+        "1,G01-1001,ACGTACGTAC-TTGGCCAATT",
+        "2,G01-1002,CATGCATGCA-AACCGGTTAA",
+        '"1,2",G01-1003,GGCCTTAAGG-CAGTCAGTCA',
+    ],
+    "sample_id": [
+        "Lane,Sample_ID,Index",
+        "1,G01-1001,ACGTACGTAC-TTGGCCAATT",
+        '"1,2",G01-1002,CATGCATGCA-AACCGGTTAA',
+    ],
+    "both_columns": [
+        "Lane,Sample_ID,Content_Desc,Index",
+        "1,,G01-1001,ACGTACGTAC-TTGGCCAATT",
+        "1,LIB2,G01-1002,CATGCATGCA-AACCGGTTAA",
+    ],
+    "single_index": [
+        "Lane,Content_Desc,Index",
+        "1,G01-1001,ACGTACGTAC",
+        "1,G01-1002,CATGCATGCA-",
+    ],
+    "numeric_ids": [
+        "Lane,Content_Desc,Index",
+        "1,007,ACGTACGTAC-TTGGCCAATT",
+        "1,1001,CATGCATGCA-AACCGGTTAA",
+    ],
+    "empty_cells": [
+        "Lane,Content_Desc,Index,Notes",
+        "1,,ACGTACGTAC-TTGGCCAATT,",
+        "1,G01-1002,,rerun",
+        "2,G01-1003",
+        "2,G01-1004,-AACCGGTTAA,",
+    ],
+    # Saved as "CSV UTF-8" by Excel, which starts the file with a byte order mark
+    "byte_order_mark": [
+        "\ufeffLane,Content_Desc,Index",
+        "1,G01-1001,ACGTACGTAC-TTGGCCAATT",
+        '"1,2",G01-1002,CATGCATGCA-AACCGGTTAA',
+    ],
+}
+
+RUN_INFOS = {
+    "forward": {"Index1Reverse": "N", "Index2Reverse": "N"},
+    "reverse_index2": {"Index1Reverse": "N", "Index2Reverse": "Y"},
+    "reverse_both": {"Index1Reverse": "Y", "Index2Reverse": "Y"},
+}
+
+
+def write_samplesheet(tmp_path: Path, sheet: str) -> Path:
+    """Write one of SAMPLESHEETS to a csv file."""
+    path = tmp_path / f"{sheet}.csv"
+    path.write_text("\n".join(SAMPLESHEETS[sheet]) + "\n", encoding="utf-8")
+    return path
+
+
+def pandas_rows(path: Path, run_info: Dict[str, Any], check_indexes: bool) -> List[tuple]:
+    """Prepare the demux rows of a samplesheet with the pandas path of prepare_flowcell."""
+    df = pdd.process_samplesheet(pdd.read_samplesheet(path), run_info, check_indexes)
+    return list(pdd.prepare_demux_sheet(df).itertuples(index=False, name=None))
+
+
+def fast_rows(path: Path, run_info: Dict[str, Any], check_indexes: bool) -> List[tuple]:
+    """Prepare the demux rows of a samplesheet with the csv module path of prepare_flowcell."""
+    rows = pdd.read_samplesheet_rows(path)
+    assert rows is not None
+    return pdd.prepare_demux_rows(rows, run_info, check_indexes)
+
+
+@pytest.mark.parametrize("check_indexes", [False, True])
+@pytest.mark.parametrize("run_info", RUN_INFOS.values(), ids=RUN_INFOS.keys())
+@pytest.mark.parametrize("sheet", SAMPLESHEETS.keys())
+def test_fast_path_matches_pandas_path(tmp_path: Path, sheet: str, run_info: Dict[str, Any], check_indexes: bool):
+    path = write_samplesheet(tmp_path, sheet)
+
+    assert fast_rows(path, run_info, check_indexes) == pandas_rows(path, run_info, check_indexes)
+
+
+@pytest.mark.parametrize("sheet", SAMPLESHEETS.keys())
+def test_fast_path_matches_xlsx(tmp_path: Path, sheet: str):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+
+    path = write_samplesheet(tmp_path, sheet)
+    xlsx_path = tmp_path / f"{sheet}.xlsx"
+    pd.read_csv(path, dtype=str, keep_default_na=False).to_excel(xlsx_path, index=False)
+
+    run_info = RUN_INFOS["reverse_index2"]
+    assert fast_rows(path, run_info, True) == pandas_rows(xlsx_path, run_info, True)
+
+
+def test_sample_id_column(tmp_path: Path):
+    path = write_samplesheet(tmp_path, "sample_id")
+
+    assert fast_rows(path, RUN_INFOS["forward"], False) == [
+        (1, "G01-1001", "ACGTACGTAC", "TTGGCCAATT"),
+        (1, "G01-1002", "CATGCATGCA", "AACCGGTTAA"),
+        (2, "G01-1002", "CATGCATGCA", "AACCGGTTAA"),
+    ]
+
+
+def test_byte_order_mark(tmp_path: Path):
+    path = write_samplesheet(tmp_path, "byte_order_mark")
+
+    assert fast_rows(path, RUN_INFOS["forward"], False) == [
+        (1, "G01-1001", "ACGTACGTAC", "TTGGCCAATT"),
+        (1, "G01-1002", "CATGCATGCA", "AACCGGTTAA"),
+        (2, "G01-1002", "CATGCATGCA", "AACCGGTTAA"),
+    ]
+
+
+def test_empty_cells(tmp_path: Path):
+    path = write_samplesheet(tmp_path, "empty_cells")
+
+    assert fast_rows(path, RUN_INFOS["forward"], False) == [
+        (1, "", "ACGTACGTAC", "TTGGCCAATT"),
+        (1, "G01-1002", "", ""),
+        (2, "G01-1003", "", ""),
+        (2, "G01-1004", "", "AACCGGTTAA"),
+    ]
+
+
+def test_batch_reports_every_failed_flowcell(monkeypatch: pytest.MonkeyPatch):
+    def prepare_flowcell(rundir: Path, samplesheet: Path, *options: Any) -> str:
+        if rundir.name == "missing_column":
+            raise KeyError("Index")
+        if rundir.name == "bad_sheet":
+            raise ValueError("bad samplesheet")
+        return rundir.name
+
+    monkeypatch.setattr(pdd, "prepare_flowcell", prepare_flowcell)
+    pairs = [(Path(name), Path("sheet.csv")) for name in ("missing_column", "bad_sheet", "good")]
+    args = pdd.argparse.Namespace(
+        checkindexes=False,
+        adapter_read1=None,
+        adapter_read2=None,
+        max_barcode_mismatches=None,
+        split_lanes=None,
+        workers=1,
+    )
+
+    assert pdd.prepare_batch(pairs, args) == ["missing_column: KeyError: 'Index'", "bad_sheet: bad samplesheet"]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import csv
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bin"))
+
+import query_database as qd  # noqa: E402
+
+
+def create_database(path: Path, rows: List[tuple]) -> Path:
+    """Create a SQLite database with a FranklinOrder table."""
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE FranklinOrder (Id TEXT, SpcNum TEXT, Sex TEXT)")
+        conn.executemany("INSERT INTO FranklinOrder VALUES (?, ?, ?)", rows)
+    conn.close()
+    return path
+
+
+def run(monkeypatch: pytest.MonkeyPatch, *argv: str) -> None:
+    """Run query_database.py with the given command-line arguments."""
+    monkeypatch.setattr(sys, "argv", ["query_database.py", "-b", "sqlite", *argv])
+    qd.main()
+
+
+def read_output(path: Path) -> List[dict]:
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def databases(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> List[Path]:
+    for name in ("COPATHBI_BACKEND", "COPATHBI_SERVER", "COPATHBI_DATABASE", "COPATHBI_CACHE"):
+        monkeypatch.delenv(name, raising=False)
+    return [
+        create_database(tmp_path / "first.sqlite", [("1", "G1", "F"), ("2", "G2", "M")]),
+        create_database(tmp_path / "second.sqlite", [("1", "G1", "M"), ("2", "G2", "F")]),
+    ]
+
+
+def test_cache_is_kept_per_database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, databases: List[Path]):
+    cache = tmp_path / "cache.sqlite"
+    output = tmp_path / "out.csv"
+    query = ["-c", "SpcNum", "Sex", "-v", "G1", "G2", "--cache", str(cache), "-o", str(output)]
+
+    for database, sexes in zip(databases, (["F", "M"], ["M", "F"])):
+        run(monkeypatch, "-d", str(database), *query)
+        assert [row["Sex"] for row in read_output(output)] == sexes
+
+    run(monkeypatch, "-d", str(databases[0]), "--offline", *query)
+    assert [row["Sex"] for row in read_output(output)] == ["F", "M"]
+
+
+def test_offline_without_cache_hits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, databases: List[Path]):
+    cache = tmp_path / "cache.sqlite"
+    output = tmp_path / "out.csv"
+    query = ["-c", "SpcNum", "Sex", "-v", "G1", "--cache", str(cache), "-o", str(output)]
+
+    run(monkeypatch, "-d", str(databases[0]), *query)
+    run(monkeypatch, "-d", str(databases[1]), "--offline", *query)
+
+    assert output.read_text().splitlines() == ["SpcNum,Sex"]
+
+
+def test_cache_key_leaves_out_credentials():
+    args = qd.argparse.Namespace(
+        backend="mssql", server="DB1", database="CoPathBI", columns=None, filter_col="SpcNum", where=None
+    )
+    online = qd.cache_query_key(qd.argparse.Namespace(**vars(args), username="user", password="secret"))
+
+    assert online == qd.cache_query_key(args)
+    assert "secret" not in online
+    assert online != qd.cache_query_key(qd.argparse.Namespace(**{**vars(args), "database": "CoPathBI_Test"}))
+
+
+def test_manifest_query_without_pyarrow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, databases: List[Path]):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            [
+                {"output": str(tmp_path / "out.parquet"), "filter_values": ["G1"]},
+                {"output": str(tmp_path / "out.csv"), "filter_values": ["G1"], "columns": ["SpcNum", "Sex"]},
+            ]
+        )
+    )
+
+    with pytest.raises(SystemExit):
+        run(monkeypatch, "-d", str(databases[0]), "-m", str(manifest))
+
+    assert read_output(tmp_path / "out.csv") == [{"SpcNum": "G1", "Sex": "F"}]
@@ -10,6 +10,7 @@ include { DRAGEN_ALIGN                         } from '../modules/local/dragen_a
 include { DRAGEN_ALIGN as DRAGEN_ALIGN_CONTROL } from '../modules/local/dragen_align'
 include { JOINT_GENOTYPING                     } from '../subworkflows/local/joint_genotyping'
 include { PARSE_QC_METRICS                     } from '../modules/local/parse_qc_metrics'
+include { QC_GATE                              } from '../modules/local/qc_gate'
 include { TRANSFER_DATA_AWS                    } from '../modules/local/transfer_data_aws'
 
 /*
@@ -85,6 +86,13 @@ if (params.qc_cross_contamination?.toString()?.startsWith('resources/')) {
     ch_qc_cross_contamination = [ [], [] ]
 }
 
+// QC thresholds samples must pass before joint genotyping
+if (params.qc_thresholds) {
+    ch_qc_thresholds = Channel.fromPath(params.qc_thresholds, checkIfExists: true).collect()
+} else {
+    ch_qc_thresholds = []
+}
+
 /*
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     RUN MAIN WORKFLOW
@@ -181,11 +189,25 @@ workflow DRAGEN_CGS {
     //
     // MODULE: DRAGEN alignment for clinical samples
     //
+    ch_align_samples = ch_samples
+                        .filter{
+                            meta, reads, fastq_list, alignment_file ->
+                                params.validation_samples || isClinicalAcc(meta?.acc)
+                        }
+                        .branch{
+                            meta, reads, fastq_list, alignment_file ->
+                                sized: meta.fastq_bytes != null
+                                other: true
+                        }
+
+    // Samples with a FastQ size are submitted largest first, so that a single large sample does not finish long after
+    // the rest. This only orders the samples; they are not packed together. Samples without a size, such as BAM/CRAM
+    // input, do not wait for the FastQ sizes.
     DRAGEN_ALIGN (
-        ch_samples.filter{
-            meta, reads, fastq_list, alignment_file ->
-                params.validation_samples || isClinicalAcc(meta?.acc)
-        },
+        ch_align_samples.sized
+            .toSortedList{ a, b -> b[0].fastq_bytes <=> a[0].fastq_bytes }
+            .flatMap()
+            .mix(ch_align_samples.other),
         ch_intermediate_dir,
         ch_qc_cross_contamination,
         ch_adapter1_file,
@@ -199,11 +221,36 @@ workflow DRAGEN_CGS {
     ch_dragen_usage   = ch_dragen_usage.mix(DRAGEN_ALIGN.out.usage)
     ch_dragen_metrics = ch_dragen_metrics.mix(DRAGEN_ALIGN.out.metrics)
 
+    //
+    // MODULE: Check QC metrics against QC thresholds
+    //
+    ch_joint_genotyping_input = DRAGEN_ALIGN.out.dragen_output
+    if (params.qc_thresholds) {
+        QC_GATE (
+            DRAGEN_ALIGN.out.metrics.collect(),
+            ch_qc_thresholds
+        )
+        ch_versions = ch_versions.mix(QC_GATE.out.versions)
+
+        // Only joint genotype samples that passed the QC thresholds
+        ch_joint_genotyping_input = ch_joint_genotyping_input
+                                        .combine(
+                                            QC_GATE.out.manifest
+                                                .splitCsv(header: true)
+                                                .filter{ it['QC STATUS'] == 'PASS' }
+                                                .map{ it['SAMPLE ID'] }
+                                                .toList()
+                                                .map{ [ it ] }
+                                        )
+                                        .filter{ meta, files, passed -> passed.contains(meta.id) }
+                                        .map{ meta, files, passed -> [ meta, files ] }
+    }
+
     //
     // SUBWORKFLOW: Joint genotyping
     //
     JOINT_GENOTYPING (
-        DRAGEN_ALIGN.out.dragen_output.map{ meta, files -> files },
+        ch_joint_genotyping_input.map{ meta, files -> files },
         ch_reference_dir
     )
     ch_versions     = ch_versions.mix(JOINT_GENOTYPING.out.versions)